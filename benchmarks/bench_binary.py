@@ -0,0 +1,51 @@
+"""Compare `dumps_binary` / `loads_binary` with JSON in time and payload size.
+
+Run with ``python benchmarks/bench_binary.py [n ...]``; ``n`` is the number of
+ids or values of the collection rows.
+"""
+import sys
+import timeit
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from tektome import Context, Dates, DateTimes, Resource, Resources
+
+
+def best_ms(fn, repeat=5):
+    number = max(1, int(0.05 / max(timeit.timeit(fn, number=1), 1e-7)))
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e3
+
+
+def cases(n):
+    ids = [uuid.uuid4() for _ in range(n)]
+    tz = timezone(timedelta(hours=9))
+    return {
+        "Resource": Resource(id=ids[0], kind="resource"),
+        "Context": Context(user_api_key="secret", base_url="https://example.com", execution_id=ids[0]),
+        "Resources": Resources(ids=ids, kind="resource[]"),
+        "Resources[compact]": Resources.variant(storage="compact")(ids=ids, kind="resource[]"),
+        "Dates": Dates(values=[date(2000, 1, 1) + timedelta(days=i % 15_000) for i in range(n)], kind="date[]"),
+        "DateTimes": DateTimes(
+            values=[datetime(2000, 1, 1, tzinfo=tz) + timedelta(seconds=i) for i in range(n)], kind="datetime[]"
+        ),
+    }
+
+
+def main(sizes):
+    print(f"{'schema':<20} {'n':>9} {'json B':>10} {'binary B':>10} {'dump ms':>9} {'binary':>9} {'load ms':>9} {'binary':>9}")
+    for n in sizes:
+        for name, instance in cases(n).items():
+            model = type(instance)
+            raw, data = instance.model_dump_json(), instance.dumps_binary()
+            timings = [
+                best_ms(instance.model_dump_json),
+                best_ms(instance.dumps_binary),
+                best_ms(lambda: model.model_validate_json(raw)),
+                best_ms(lambda: model.loads_binary(data)),
+            ]
+            count = n if name not in ("Resource", "Context") else 1
+            print(f"{name:<20} {count:>9} {len(raw):>10} {len(data):>10} " + " ".join(f"{t:>9.3f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 100_000])
@@ -0,0 +1,46 @@
+"""Compare `chunks` with slicing `ids` and validating a collection per batch.
+
+Run with ``python benchmarks/bench_chunks.py [n ...]``; ``n`` is the number of ids,
+split into batches of 100.
+"""
+import sys
+import timeit
+import tracemalloc
+import uuid
+
+from tektome import Resources
+
+BATCH = 100
+
+
+def best_ms(fn, repeat=5):
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1e3
+
+
+def peak_kib(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main(sizes):
+    print(f"{'ids':>10} {'storage':>8} {'path':>12} {'ms':>10} {'peak KiB':>10}")
+    for n in sizes:
+        ids = [uuid.uuid4() for _ in range(n)]
+        for storage in ("list", "compact", "lazy"):
+            model = Resources.variant(storage=storage)
+            resources = model(ids=ids, kind="resource[]")
+            paths = {
+                "validate": lambda: [
+                    len(model(ids=resources.ids[i : i + BATCH], kind="resource[]").ids) for i in range(0, n, BATCH)
+                ],
+                "chunks": lambda: [len(chunk.ids) for chunk in resources.chunks(BATCH)],
+            }
+            for name, fn in paths.items():
+                print(f"{n:>10} {storage:>8} {name:>12} {best_ms(fn):>10.3f} {peak_kib(fn):>10.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
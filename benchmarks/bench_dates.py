@@ -0,0 +1,69 @@
+"""Compare many `DateTime` objects with one `DateTimes` array (and `Date` with `Dates`).
+
+Run with ``python benchmarks/bench_dates.py [n ...]``. Reports validation time
+from JSON and the memory held by the validated values; "DateTimes (no numpy)"
+disables the vectorized ISO-8601 fast path.
+"""
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+
+from pydantic import TypeAdapter
+
+from tektome import Date, Dates, DateTime, DateTimes
+from tektome import temporal
+
+
+def without_numpy(func):
+    def run():
+        np, temporal.np = temporal.np, None
+        try:
+            return func()
+        finally:
+            temporal.np = np
+
+    return run
+
+
+def measure(func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = func()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed * 1e3, held / 2**20
+
+
+def main(sizes):
+    print(f"{'values':>10} {'schema':>20} {'validate ms':>12} {'held MiB':>9}")
+    rng = random.Random(0)
+    tz = timezone(timedelta(hours=9))
+    for n in sizes:
+        days = [date(2020, 1, 1) + timedelta(days=rng.randrange(3650)) for _ in range(n)]
+        stamps = [datetime(2020, 1, 1, tzinfo=tz) + timedelta(seconds=rng.randrange(10**8)) for _ in range(n)]
+        cases = [
+            ("list[Date]", TypeAdapter(list[Date]), [{"value": d.isoformat(), "kind": "date"} for d in days]),
+            ("Dates", TypeAdapter(Dates), {"values": [d.isoformat() for d in days], "kind": "date[]"}),
+            (
+                "list[DateTime]",
+                TypeAdapter(list[DateTime]),
+                [{"value": s.isoformat(), "kind": "datetime"} for s in stamps],
+            ),
+            ("DateTimes", TypeAdapter(DateTimes), {"values": [s.isoformat() for s in stamps], "kind": "datetime[]"}),
+        ]
+        cases.append(("DateTimes (no numpy)", *cases[-1][1:]))
+        for name, adapter, payload in cases:
+            raw = json.dumps(payload)
+            run = lambda: adapter.validate_json(raw)  # noqa: E731
+            elapsed, held = measure(without_numpy(run) if "no numpy" in name else run)
+            print(f"{n:>10} {name:>20} {elapsed:>12.1f} {held:>9.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,39 @@
+"""Compare dedupe variants of `Resources` with ``list(dict.fromkeys(...))`` after validation.
+
+Run with ``python benchmarks/bench_dedupe.py [n ...]``. Payloads hold ``n`` ids
+drawn from ``n // 4`` distinct ones.
+"""
+import json
+import random
+import sys
+import time
+import uuid
+
+from tektome import Resources
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1e3, result
+
+
+def main(sizes):
+    print(f"{'ids':>10} {'approach':>28} {'ms':>9} {'unique':>9}")
+    for n in sizes:
+        rng = random.Random(0)
+        distinct = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(max(1, n // 4))]
+        raw = json.dumps({"ids": [rng.choice(distinct) for _ in range(n)], "kind": "resource[]"})
+
+        elapsed, ids = timed(lambda: list(dict.fromkeys(Resources.model_validate_json(raw).ids)))
+        print(f"{n:>10} {'validate + dict.fromkeys':>28} {elapsed:>9.1f} {len(ids):>9}")
+        for storage in ("list", "compact", "lazy"):
+            for order in ("first", "sorted"):
+                model = Resources.variant(storage=storage, dedupe=order)
+                elapsed, resources = timed(lambda: model.model_validate_json(raw))
+                label = f"{storage} dedupe={order}"
+                print(f"{n:>10} {label:>28} {elapsed:>9.1f} {len(resources.ids):>9}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
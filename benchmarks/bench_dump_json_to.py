@@ -0,0 +1,46 @@
+"""Compare `dump_json_to` with writing `model_dump_json()` for large collections.
+
+Run with ``python benchmarks/bench_dump_json_to.py [n ...]``.
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+from tektome import Resources
+
+
+def measure(fn):
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    # Memory is traced in a separate run: tracemalloc distorts timings.
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(sizes):
+    print(f"{'ids':>10} {'storage':>8} {'path':>16} {'ms':>9} {'peak MiB':>9}")
+    with open(os.devnull, "wb") as fp:
+        for n in sizes:
+            ids = [uuid.uuid4() for _ in range(n)]
+            for storage in ("list", "compact"):
+                model = Resources.variant(storage=storage)(ids=ids, kind="resource[]")
+                paths = {
+                    "model_dump_json": lambda: fp.write(model.model_dump_json().encode()),
+                    "dump_json_to": lambda: model.dump_json_to(fp),
+                }
+                for name, fn in paths.items():
+                    elapsed, peak = measure(fn)
+                    print(f"{n:>10} {storage:>8} {name:>16} {elapsed * 1e3:>9.1f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,43 @@
+"""Compare `to_numpy` / `to_arrow` / `from_arrow` with converting UUID objects by hand.
+
+Run with ``python benchmarks/bench_export.py [n ...]``; needs numpy and pyarrow.
+"""
+import sys
+import timeit
+import uuid
+
+import numpy as np
+import pyarrow as pa
+
+from tektome import Resources
+
+
+def best_ms(fn, repeat=5):
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1e3
+
+
+def main(sizes):
+    Compact = Resources.variant(storage="compact")
+    print(f"{'ids':>10} {'path':>28} {'ms':>10}")
+    for n in sizes:
+        ids = [uuid.uuid4() for _ in range(n)]
+        plain = Resources(ids=ids, kind="resource[]")
+        compact = Compact(ids=ids, kind="resource[]")
+        arrow = compact.to_arrow()
+        paths = {
+            "by hand -> numpy": lambda: np.frombuffer(b"".join(u.bytes for u in plain.ids), np.uint8).reshape(-1, 16),
+            "by hand -> arrow": lambda: pa.array([u.bytes for u in plain.ids], pa.binary(16)),
+            "list to_numpy": plain.to_numpy,
+            "list to_arrow": plain.to_arrow,
+            "compact to_numpy": compact.to_numpy,
+            "compact to_arrow": compact.to_arrow,
+            "by hand <- arrow": lambda: Resources(ids=[uuid.UUID(bytes=b) for b in arrow.to_pylist()], kind="resource[]"),
+            "list from_arrow": lambda: Resources.from_arrow(arrow),
+            "compact from_arrow": lambda: Compact.from_arrow(arrow),
+        }
+        for name, fn in paths.items():
+            print(f"{n:>10} {name:>28} {best_ms(fn):>10.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 1_000_000])
@@ -0,0 +1,78 @@
+"""Measure `Resources.fetch_all` throughput against a local mock server.
+
+The server runs in its own process and answers every request after a fixed
+delay, standing in for API latency. Run with ``python benchmarks/bench_fetch_all.py [requests] [delay_ms]``.
+"""
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tektome import Context, Resources
+from tektome.client import default_pool
+from tektome.fetch import register_endpoint
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    delay = 0.01
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def serve(delay, ports):
+    Handler.delay = delay
+    server = Server(("127.0.0.1", 0), Handler)
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+def main(count, delay_ms):
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(delay_ms / 1000, ports), daemon=True)
+    server.start()
+    ctx = Context(user_api_key="key", base_url=f"http://127.0.0.1:{ports.get()}", execution_id=uuid.uuid4())
+    register_endpoint("resource", "api/resources/{id}")
+    resources = Resources(ids=[uuid.uuid4() for _ in range(count)], kind="resource[]")
+    default_pool.configure(max_connections=64)
+
+    async def run(concurrency):
+        try:
+            start = time.perf_counter()
+            results = await resources.fetch_all(ctx, concurrency=concurrency)
+            elapsed = time.perf_counter() - start
+        finally:
+            await default_pool.aclose()
+        assert all(result.ok for result in results)
+        return elapsed
+
+    print(f"{count} requests, {delay_ms} ms server latency")
+    print(f"{'concurrency':>11} {'seconds':>8} {'req/s':>8}")
+    for concurrency in (1, 2, 4, 8, 16, 32, 64):
+        elapsed = asyncio.run(run(concurrency))
+        print(f"{concurrency:>11} {elapsed:>8.2f} {count / elapsed:>8.0f}")
+    server.terminate()
+
+
+if __name__ == "__main__":
+    args = [float(arg) for arg in sys.argv[1:]]
+    main(int(args[0]) if args else 500, args[1] if len(args) > 1 else 10.0)
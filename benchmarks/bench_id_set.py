@@ -0,0 +1,43 @@
+"""Compare set operations on compact `Resources` with Python sets of `UUID`.
+
+Run with ``python benchmarks/bench_id_set.py [n ...]``. Each collection holds
+``n`` ids, half of them shared with the other one.
+"""
+import sys
+import time
+import uuid
+
+from tektome import Resources
+from tektome import ids as ids_module
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1e3
+
+
+def main(sizes):
+    compact = Resources.variant(storage="compact")
+    backend = "numpy" if ids_module.np is not None else "python"
+    print(f"{'ids':>10} {'operation':>13} {'set ms':>9} {backend + ' ms':>10}")
+    for n in sizes:
+        shared = [uuid.uuid4() for _ in range(n // 2)]
+        a = shared + [uuid.uuid4() for _ in range(n - n // 2)]
+        b = shared + [uuid.uuid4() for _ in range(n - n // 2)]
+        left = compact(ids=a, kind="resource[]")
+        right = compact(ids=b, kind="resource[]")
+        print(f"{n:>10} {'index':>13} {timed(lambda: set(left.ids)):>9.1f} {timed(left.id_set):>10.1f}")
+        right.id_set()
+        for name in ("union", "intersection", "difference"):
+            with_sets = timed(lambda: getattr(set(left.ids), name)(set(right.ids)))
+            with_ids = timed(lambda: getattr(left, name)(right))
+            print(f"{n:>10} {name:>13} {with_sets:>9.1f} {with_ids:>10.1f}")
+        probe = a[: 10_000]
+        with_sets = timed(lambda: [uid in set_a for uid in probe] if (set_a := set(left.ids)) else None)
+        with_ids = timed(lambda: [uid in left for uid in probe])
+        print(f"{n:>10} {'10k lookups':>13} {with_sets:>9.1f} {with_ids:>10.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,34 @@
+"""Compare memory held by list-backed and compact `Resources.ids`.
+
+Run with ``python benchmarks/bench_ids_memory.py [n ...]``.
+"""
+import gc
+import json
+import sys
+import tracemalloc
+import uuid
+
+from tektome import Resources
+
+
+def measure(model, raw):
+    gc.collect()
+    tracemalloc.start()
+    resources = model.model_validate_json(raw)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(resources.ids) > 0
+    return held, peak
+
+
+def main(sizes):
+    print(f"{'ids':>10} {'storage':>8} {'held MiB':>10} {'peak MiB':>10} {'bytes/id':>9}")
+    for n in sizes:
+        raw = json.dumps({"ids": [str(uuid.uuid4()) for _ in range(n)], "kind": "resource[]"})
+        for storage in ("list", "compact"):
+            held, peak = measure(Resources.variant(storage=storage), raw)
+            print(f"{n:>10} {storage:>8} {held / 2**20:>10.2f} {peak / 2**20:>10.2f} {held / n:>9.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
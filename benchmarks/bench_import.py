@@ -0,0 +1,60 @@
+"""Measure the cold-start cost of tektome in fresh interpreters.
+
+Run with ``python benchmarks/bench_import.py [runs]``. Each statement runs in
+fresh interpreters and the fastest wall time it took, imports and model builds
+included, is reported (the minimum is far less noisy than the median on a busy
+machine); ``import pydantic`` is shown as the floor every step pays anyway.
+Exits with status 1 when `COLD_START` costs more than `BUDGET_MS` on top of
+``import pydantic``.
+"""
+import subprocess
+import sys
+
+BUDGET_MS = 110.0
+"""
+Budget for `COLD_START`, excluding the time of ``import pydantic``.
+
+About 70 ms of it are pydantic's model machinery, which ``import pydantic``
+does not load yet; also loading numpy or httpx takes it to about 140 ms.
+"""
+
+COLD_START = (
+    "from tektome import Resource, Context; "
+    "Resource(id='123e4567-e89b-12d3-a456-426614174000', kind='resource')"
+)
+"""What a step runs before its own code: import the models it uses and validate its inputs."""
+
+STATEMENTS = [
+    "import pydantic",
+    "import tektome",
+    "from tektome import Resource, Context",
+    COLD_START,
+    "from tektome import Resources, parse_value",
+]
+
+
+def run_ms(statement):
+    """Return the milliseconds ``statement`` takes in a fresh interpreter."""
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"exec({statement!r})\n"
+        "print(time.perf_counter() - start)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(result.stdout) * 1e3
+
+
+def main(runs):
+    print(f"{'statement':<60} {'ms':>8}")
+    results = {}
+    for statement in STATEMENTS:
+        results[statement] = min(run_ms(statement) for _ in range(runs))
+        print(f"{statement[:60]:<60} {results[statement]:>8.1f}")
+    own = results[COLD_START] - results["import pydantic"]
+    print(f"\ncold start on top of pydantic: {own:.1f} ms (budget {BUDGET_MS:.1f} ms)")
+    return 0 if own <= BUDGET_MS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 15))
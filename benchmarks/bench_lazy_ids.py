@@ -0,0 +1,33 @@
+"""Compare validation and time-to-first-id of list-backed and lazy `Resources.ids`.
+
+Run with ``python benchmarks/bench_lazy_ids.py [n ...]``.
+"""
+import json
+import sys
+import time
+import uuid
+
+from tektome import Resources
+
+
+def main(sizes):
+    print(f"{'ids':>10} {'storage':>8} {'validate ms':>12} {'first id us':>12} {'len us':>8}")
+    for n in sizes:
+        raw = json.dumps({"ids": [str(uuid.uuid4()) for _ in range(n)], "kind": "resource[]"})
+        for storage in ("list", "lazy"):
+            model = Resources.variant(storage=storage)
+            start = time.perf_counter()
+            resources = model.model_validate_json(raw)
+            validated = time.perf_counter()
+            resources.ids[0]
+            first = time.perf_counter()
+            len(resources.ids)
+            counted = time.perf_counter()
+            print(
+                f"{n:>10} {storage:>8} {(validated - start) * 1e3:>12.2f}"
+                f" {(first - validated) * 1e6:>12.1f} {(counted - first) * 1e6:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,66 @@
+"""Compare `load_inputs` and `@step` with `json.loads` + `@validate_call` on large step inputs.
+
+Run with ``python benchmarks/bench_load_inputs.py [n ...]``.
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+
+from pydantic import validate_call
+
+from tektome import Context, Resources, load_inputs, step
+
+
+def main_step(ctx: Context, resources: Resources):
+    return len(resources.ids)
+
+
+validated_step = validate_call(main_step)
+decorated_step = step(main_step)
+
+
+def measure(fn):
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    del result
+    # Memory is traced in a separate run: tracemalloc distorts timings.
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(sizes):
+    print(f"{'ids':>10} {'MiB in':>7} {'path':>14} {'ms':>9} {'peak MiB':>9}")
+    for n in sizes:
+        raw = json.dumps(
+            {
+                "ctx": {
+                    "user_api_key": "key",
+                    "base_url": "https://example.tektome.com",
+                    "execution_id": str(uuid.uuid4()),
+                },
+                "resources": {"ids": [str(uuid.uuid4()) for _ in range(n)], "kind": "resource[]"},
+            }
+        ).encode()
+        paths = {
+            "validate_call": lambda: validated_step(**json.loads(raw)),
+            "load_inputs": lambda: main_step(**load_inputs(raw, main_step)),
+            "step.call_json": lambda: decorated_step.call_json(raw),
+        }
+        load_inputs(raw, main_step)  # build the cached validator
+        for name, fn in paths.items():
+            result, elapsed, peak = measure(fn)
+            assert result == n
+            print(f"{n:>10} {len(raw) / 2**20:>7.1f} {name:>14} {elapsed * 1e3:>9.1f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,47 @@
+"""Scaling of `IdCollection.validate_parallel` with the number of workers.
+
+Run with ``python benchmarks/bench_parallel.py [n ...]``; ``n`` is the number of ids.
+Process pools are created once per worker count and reused, as a service would.
+"""
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from tektome import Resources
+from tektome.parallel import free_threaded
+
+WORKERS = (1, 2, 4, 8)
+
+
+def best_ms(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main(sizes):
+    Compact = Resources.variant(storage="compact")
+    pool_class = ThreadPoolExecutor if free_threaded() else ProcessPoolExecutor
+    print(f"{pool_class.__name__}, {os.cpu_count()} CPUs")
+    print(f"{'ids':>10} {'model':>10} {'workers':>8} {'ms':>10} {'speedup':>8}")
+    for n in sizes:
+        raw = json.dumps({"ids": [str(uuid.uuid4()) for _ in range(n)], "kind": "resource[]"})
+        # With processes, other storages are validated serially (see `validate_parallel`).
+        for model in (Compact, Resources) if free_threaded() else (Compact,):
+            serial = best_ms(lambda: model.model_validate_json(raw))
+            print(f"{n:>10} {model.ids_storage:>10} {'serial':>8} {serial:>10.1f} {1:>8.2f}")
+            for workers in WORKERS:
+                with pool_class(workers) as pool:
+                    pool.submit(int).result()  # start the workers
+                    ms = best_ms(lambda: model.validate_parallel(raw, workers=workers, executor=pool))
+                print(f"{n:>10} {model.ids_storage:>10} {workers:>8} {ms:>10.1f} {serial / ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000_000, 10_000_000])
@@ -0,0 +1,42 @@
+"""Compare the cost of `Context.client` and `Context.cache` with and without a registry.
+
+Run with ``python benchmarks/bench_registry.py [n ...]``; ``n`` is the number of
+tenants cycled through. With default limits the registry keeps clients for 50
+tenants: beyond that, every call opens a new client, and ``clients`` shows the cap.
+"""
+import itertools
+import sys
+import timeit
+import uuid
+
+from tektome import Context
+from tektome import registry
+from tektome.client import default_pool
+
+CALLS = 2_000
+
+
+def best_us(fn, repeat=3):
+    return min(timeit.repeat(fn, number=CALLS, repeat=repeat)) / CALLS * 1e6
+
+
+def main(sizes):
+    print(f"{'tenants':>8} {'registry':>9} {'client us':>10} {'cache us':>9} {'clients':>8}")
+    for n in sizes:
+        contexts = [
+            Context(user_api_key=f"key-{i}", base_url="http://127.0.0.1:9", execution_id=uuid.uuid4())
+            for i in range(n)
+        ]
+        for enabled in (False, True):
+            current = registry.enable() if enabled else None
+            cycle = itertools.cycle(contexts)
+            client_us = best_us(lambda: next(cycle).client())
+            clients = current.stats().clients if current is not None else len(default_pool)
+            cache_us = best_us(lambda: next(cycle).cache())
+            print(f"{n:>8} {'on' if enabled else 'off':>9} {client_us:>10.2f} {cache_us:>9.2f} {clients:>8}")
+            registry.disable()
+            default_pool.close()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 50, 100])
@@ -0,0 +1,65 @@
+"""Compare handing a collection to pool workers by pickling it or through shared memory.
+
+Run with ``python benchmarks/bench_shared.py [n ...]``; ``n`` is the number of ids.
+"""
+import multiprocessing
+import pickle
+import sys
+import time
+import uuid
+from multiprocessing import resource_tracker
+
+from tektome import Resources
+
+WORKERS = 4
+
+
+def count_pickled(resources):
+    return len(resources.ids)
+
+
+def count_shared(name):
+    return len(Resources.attach_shared_memory(name).ids)
+
+
+def best_ms(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main(sizes):
+    Compact = Resources.variant(storage="compact")
+    print(f"{'ids':>10} {'path':>36} {'ms':>10}")
+    resource_tracker.ensure_running()  # shared with the workers, see `SharedIds`
+    with multiprocessing.Pool(WORKERS) as pool:
+        for n in sizes:
+            ids = [uuid.uuid4() for _ in range(n)]
+            plain = Resources(ids=ids, kind="resource[]")
+            compact = Compact(ids=ids, kind="resource[]")
+            uuids = pickle.dumps(ids, 4)
+            paths = {
+                "pickle UUID list, dumps+loads": lambda: pickle.loads(pickle.dumps(ids, 4)),
+                "pickle UUID list, loads": lambda: pickle.loads(uuids),
+                "pickle Resources, dumps+loads": lambda: pickle.loads(pickle.dumps(plain, 5)),
+                "pickle compact, dumps+loads": lambda: pickle.loads(pickle.dumps(compact, 5)),
+                f"pool, pickled list x{WORKERS}": lambda: pool.map(count_pickled, [plain] * WORKERS),
+                f"pool, pickled compact x{WORKERS}": lambda: pool.map(count_pickled, [compact] * WORKERS),
+            }
+            for name, fn in paths.items():
+                print(f"{n:>10} {name:>36} {best_ms(fn):>10.3f}")
+
+            for label, resources in (("list", plain), ("compact", compact)):
+
+                def shared():
+                    with resources.to_shared_memory() as segment:
+                        pool.map(count_shared, [segment.name] * WORKERS)
+
+                print(f"{n:>10} {f'pool, shared {label} x{WORKERS}':>36} {best_ms(shared):>10.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 1_000_000])
@@ -0,0 +1,239 @@
+"""Time and peak memory of construction, validation and dumps for every schema class.
+
+Run with ``python benchmarks/bench_suite.py``. Options:
+
+    --sizes 1 1000 ...       payload sizes (default 1 to 10**6)
+    --schemas Resources ...  only these rows of `CASES`
+    --operations dump ...    only these `OPERATIONS`
+    --output results.json    where to save the results (default bench_suite-<time>.json)
+    --compare baseline.json  print the ratio to a previous run; exits with
+                             status 1 when a time grew beyond --threshold
+
+Collections are measured with ``size`` ids or values in one instance;
+single-value classes with a batch of ``size`` instances, so every row
+handles ``size`` ids. Times are the best of --repeat runs per call,
+peak memory is measured by tracemalloc in a separate run and includes the
+result.
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable
+
+import pydantic
+import pydantic_core
+
+import tektome
+from tektome import (
+    AttributeDefinitions,
+    Context,
+    Date,
+    Dates,
+    DateTime,
+    DateTimes,
+    Project,
+    Projects,
+    Resource,
+    Resources,
+)
+
+SIZES = [1, 10, 100, 1_000, 10_000, 100_000, 1_000_000]
+OPERATIONS = ("construct", "validate", "validate_json", "dump", "dump_json")
+
+
+@dataclass(frozen=True)
+class Case:
+    """
+    One schema class to measure.
+
+    Attributes:
+        name: Row label in the results
+        model: The model class
+        make: Builds ``(native, data)`` payload lists of keyword arguments
+            (Python objects) and their JSON-compatible form for a size
+    """
+
+    name: str
+    model: type
+    make: Callable[[random.Random, int], tuple[list[dict], list[dict]]]
+
+
+def _uuids(rng, n):
+    return [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(n)]
+
+
+def _dates(rng, n):
+    return [date(2000, 1, 1) + timedelta(days=rng.randrange(15_000)) for _ in range(n)]
+
+
+def _datetimes(rng, n):
+    tz = timezone(timedelta(hours=9))
+    return [datetime(2000, 1, 1, tzinfo=tz) + timedelta(microseconds=rng.getrandbits(50)) for _ in range(n)]
+
+
+def _encode(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else str(value)  # str and UUID
+
+
+def _collection(field, kind, values):
+    def make(rng, n):
+        native = values(rng, n)
+        return [{field: native, "kind": kind}], [{field: [_encode(value) for value in native], "kind": kind}]
+
+    return make
+
+
+def _batch(build):
+    def make(rng, n):
+        native = [build(rng) for _ in range(n)]
+        data = [{key: _encode(value) for key, value in item.items()} for item in native]
+        return native, data
+
+    return make
+
+
+CASES = [
+    Case("Resource", Resource, _batch(lambda rng: {"id": _uuids(rng, 1)[0], "kind": "resource"})),
+    Case("Project", Project, _batch(lambda rng: {"id": _uuids(rng, 1)[0], "kind": "project"})),
+    Case(
+        "Context",
+        Context,
+        _batch(
+            lambda rng: {
+                "user_api_key": "secret",
+                "base_url": "https://example.com",
+                "execution_id": _uuids(rng, 1)[0],
+            }
+        ),
+    ),
+    Case("Date", Date, _batch(lambda rng: {"value": _dates(rng, 1)[0], "kind": "date"})),
+    Case("DateTime", DateTime, _batch(lambda rng: {"value": _datetimes(rng, 1)[0], "kind": "datetime"})),
+    Case("Resources", Resources, _collection("ids", "resource[]", _uuids)),
+    Case("Resources[compact]", Resources.variant(storage="compact"), _collection("ids", "resource[]", _uuids)),
+    Case("Resources[lazy]", Resources.variant(storage="lazy"), _collection("ids", "resource[]", _uuids)),
+    Case("Projects", Projects, _collection("ids", "project[]", _uuids)),
+    Case("AttributeDefinitions", AttributeDefinitions, _collection("ids", "attribute_definition[]", _uuids)),
+    Case("Dates", Dates, _collection("values", "date[]", _dates)),
+    Case("DateTimes", DateTimes, _collection("values", "datetime[]", _datetimes)),
+]
+
+
+def operations(model, native, data):
+    """Return a callable per operation, each handling every payload."""
+    raws = [json.dumps(item) for item in data]
+    instances = [model(**kwargs) for kwargs in native]
+    return {
+        "construct": lambda: [model(**kwargs) for kwargs in native],
+        "validate": lambda: [model.model_validate(item) for item in data],
+        "validate_json": lambda: [model.model_validate_json(raw) for raw in raws],
+        "dump": lambda: [instance.model_dump() for instance in instances],
+        "dump_json": lambda: [instance.model_dump_json() for instance in instances],
+    }
+
+
+def best_seconds(func, repeat, target=0.05):
+    # Calls per timing run so that each run lasts about `target` seconds.
+    start = time.perf_counter()
+    func()
+    number = max(1, int(target / max(time.perf_counter() - start, 1e-7)))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def peak_bytes(func):
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def environment():
+    numpy = sys.modules.get("numpy")
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "tektome": tektome.__version__,
+        "pydantic": pydantic.VERSION,
+        "pydantic_core": pydantic_core.__version__,
+        "numpy": getattr(numpy, "__version__", None),
+    }
+
+
+def run(cases, sizes, names, repeat):
+    rng = random.Random(0)
+    results = []
+    print(f"{'schema':<22} {'operation':<14} {'size':>9} {'time ms':>12} {'peak MiB':>10}")
+    for case in cases:
+        for n in sizes:
+            funcs = operations(case.model, *case.make(rng, n))
+            for name in names:
+                seconds = best_seconds(funcs[name], repeat)
+                peak = peak_bytes(funcs[name])
+                results.append(
+                    {"schema": case.name, "operation": name, "size": n, "seconds": seconds, "peak_bytes": peak}
+                )
+                print(f"{case.name:<22} {name:<14} {n:>9} {seconds * 1e3:>12.4f} {peak / 2**20:>10.2f}")
+            del funcs
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print time and memory ratios to ``baseline``; return whether any time grew beyond ``threshold``."""
+    previous = {(row["schema"], row["operation"], row["size"]): row for row in baseline["results"]}
+    slower = False
+    print(f"\n{'schema':<22} {'operation':<14} {'size':>9} {'time x':>8} {'peak x':>8}")
+    for row in results:
+        old = previous.get((row["schema"], row["operation"], row["size"]))
+        if old is None:
+            continue
+        time_ratio = row["seconds"] / old["seconds"]
+        peak_ratio = row["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else float("nan")
+        flag = "  slower" if time_ratio > threshold else ""
+        slower = slower or bool(flag)
+        print(f"{row['schema']:<22} {row['operation']:<14} {row['size']:>9} {time_ratio:>8.2f} {peak_ratio:>8.2f}{flag}")
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--schemas", nargs="+", choices=[case.name for case in CASES])
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=time.strftime("bench_suite-%Y%m%d-%H%M%S.json"))
+    parser.add_argument("--compare", metavar="BASELINE")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    cases = [case for case in CASES if args.schemas is None or case.name in args.schemas]
+    results = run(cases, args.sizes, args.operations, args.repeat)
+    with open(args.output, "w") as fp:
+        json.dump({"environment": environment(), "results": results}, fp, indent=1)
+    print(f"\nsaved {len(results)} results to {args.output}")
+    if args.compare:
+        with open(args.compare) as fp:
+            return 1 if compare(results, json.load(fp), args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,17 +2,81 @@
 
 __version__ = "0.3.1"
 
-from tektome.schema import BaseSchema, Resource, Resources, Project, Projects, AttributeDefinitions, Context, Date, DateTime
-
-__all__ = [
-    "__version__",
-    "BaseSchema",
-    "Resource",
-    "Resources",
-    "Project",
-    "Projects",
-    "AttributeDefinitions",
-    "Context",
-    "Date",
-    "DateTime",
-]
\ No newline at end of file
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from tektome.binary import dumps_binary, loads_binary
+    from tektome.fetch import Fetched
+    from tektome.ids import IdSet, LazyUUIDs, UUIDArray
+    from tektome.temporal import DateArray, DateTimeArray
+    from tektome.inputs import StepInputs, StepTimings, load_inputs, step, step_inputs
+    from tektome.registry import ContextRegistry
+    from tektome.shared import SharedIds
+    from tektome.schema import (
+        BaseSchema,
+        BatchResult,
+        IdCollection,
+        Resource,
+        Resources,
+        Project,
+        Projects,
+        AttributeDefinitions,
+        Context,
+        Date,
+        DateTime,
+        Dates,
+        DateTimes,
+        TektomeValue,
+        parse_value,
+    )
+
+# Public names and the module defining them. They are imported on first
+# access, so a step only pays for the modules it uses.
+_EXPORTS = {
+    "BaseSchema": "tektome.schema",
+    "BatchResult": "tektome.schema",
+    "IdCollection": "tektome.schema",
+    "Resource": "tektome.schema",
+    "Resources": "tektome.schema",
+    "Project": "tektome.schema",
+    "Projects": "tektome.schema",
+    "AttributeDefinitions": "tektome.schema",
+    "Context": "tektome.schema",
+    "Date": "tektome.schema",
+    "DateTime": "tektome.schema",
+    "Dates": "tektome.schema",
+    "DateTimes": "tektome.schema",
+    "TektomeValue": "tektome.schema",
+    "parse_value": "tektome.schema",
+    "UUIDArray": "tektome.ids",
+    "LazyUUIDs": "tektome.ids",
+    "IdSet": "tektome.ids",
+    "DateArray": "tektome.temporal",
+    "DateTimeArray": "tektome.temporal",
+    "StepInputs": "tektome.inputs",
+    "load_inputs": "tektome.inputs",
+    "step_inputs": "tektome.inputs",
+    "step": "tektome.inputs",
+    "StepTimings": "tektome.inputs",
+    "Fetched": "tektome.fetch",
+    "dumps_binary": "tektome.binary",
+    "loads_binary": "tektome.binary",
+    "SharedIds": "tektome.shared",
+    "ContextRegistry": "tektome.registry",
+}
+
+__all__ = ["__version__", *_EXPORTS]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'tektome' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_EXPORTS})
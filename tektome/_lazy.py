@@ -0,0 +1,28 @@
+"""Deferred imports of optional heavy dependencies."""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return module ``name``, executed on first attribute access.
+
+    Lets modules keep ``np is not None`` checks for optional dependencies
+    without paying their import time until they are actually used.
+
+    Raises:
+        ImportError: If the module is not installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
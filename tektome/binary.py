@@ -0,0 +1,304 @@
+"""Compact binary encoding of schema objects for payloads passed between steps.
+
+A payload is ``MAGIC`` followed by one tagged value, the map of the model's
+fields. Each value starts with a one-byte tag:
+
+====  ==============  =====================================================
+tag   type            body
+====  ==============  =====================================================
+0x00  None
+0x01  False
+0x02  True
+0x03  int             zigzag varint
+0x04  float           float64
+0x05  str             varint length, UTF-8
+0x06  bytes           varint length, raw bytes
+0x07  UUID            16 bytes
+0x08  date            int64 days since 1970-01-01
+0x09  datetime        int64 microseconds since the epoch (UTC instant, or
+                      wall time when naive) and int32 UTC offset in
+                      seconds, `NAIVE` for naive values
+0x0A  list            varint count, values
+0x0B  map             varint count, (varint length, UTF-8 key, value) pairs
+0x0C  UUID array      varint count, 16 bytes per id
+0x0D  date array      varint count, int64 per value
+0x0E  datetime array  varint count, int64 per value, then int32 per value
+0x0F  JSON            varint length, JSON text of any other value
+====  ==============  =====================================================
+
+Fixed-width integers and floats are little-endian. Decoded maps are
+validated by the target model, so every `BaseSchema` subclass round-trips
+with the same result as its JSON form.
+"""
+
+import struct
+import sys
+from array import array
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, Optional, Union
+from uuid import UUID
+
+from pydantic import BaseModel
+from pydantic_core import from_json, to_json
+
+from tektome.ids import UUID_SIZE, LazyUUIDs, UUIDArray
+from tektome.temporal import _EPOCH_ORDINAL, DateArray, DateTimeArray
+
+if TYPE_CHECKING:
+    from tektome.schema import BaseSchema
+
+MAGIC = b"TKB\x01"
+"""Prefix of every payload: format name and version."""
+
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _BYTES, _UUID = range(8)
+_DATE, _DATETIME, _LIST, _MAP, _UUIDS, _DATES, _DATETIMES, _JSON = range(8, 16)
+
+_FLOAT64 = struct.Struct("<d")
+_INT64 = struct.Struct("<q")
+_DATETIME_PARTS = struct.Struct("<qi")
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def _little_endian(values: array) -> bytes:
+    if _BIG_ENDIAN:  # pragma: no cover - exercised only on big-endian hosts
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: Union[bytes, memoryview]) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if _BIG_ENDIAN:  # pragma: no cover - exercised only on big-endian hosts
+        values.byteswap()
+    return values
+
+
+def _varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _text(out: bytearray, value: str) -> None:
+    data = value.encode()
+    _varint(out, len(data))
+    out += data
+
+
+def _encode(out: bytearray, value: Any) -> None:
+    if value is None:
+        out.append(_NONE)
+    elif value is True or value is False:
+        out.append(_TRUE if value else _FALSE)
+    elif type(value) is int:
+        out.append(_INT)
+        _varint(out, value << 1 if value >= 0 else (~value << 1) | 1)
+    elif type(value) is float:
+        out.append(_FLOAT)
+        out += _FLOAT64.pack(value)
+    elif type(value) is str:
+        out.append(_STR)
+        _text(out, value)
+    elif isinstance(value, bytes):
+        out.append(_BYTES)
+        _varint(out, len(value))
+        out += value
+    elif isinstance(value, UUID):
+        out.append(_UUID)
+        out += value.bytes
+    elif isinstance(value, datetime):
+        parts = DateTimeArray([value])
+        out.append(_DATETIME)
+        out += _DATETIME_PARTS.pack(parts._values[0], parts._offsets[0])
+    elif isinstance(value, date):
+        out.append(_DATE)
+        out += _INT64.pack(value.toordinal() - _EPOCH_ORDINAL)
+    elif isinstance(value, (UUIDArray, LazyUUIDs)):
+        _uuids(out, value if isinstance(value, UUIDArray) else UUIDArray.from_uuids(value._raw))
+    elif isinstance(value, DateArray):
+        out.append(_DATES)
+        _varint(out, len(value))
+        out += _little_endian(value._values)
+    elif isinstance(value, DateTimeArray):
+        out.append(_DATETIMES)
+        _varint(out, len(value))
+        out += _little_endian(value._values)
+        out += _little_endian(value._offsets)
+    elif isinstance(value, (list, tuple)):
+        if value and all(type(item) is UUID for item in value):
+            _uuids(out, UUIDArray(b"".join([item.bytes for item in value])))
+            return
+        out.append(_LIST)
+        _varint(out, len(value))
+        for item in value:
+            _encode(out, item)
+    elif isinstance(value, BaseModel):
+        fields = type(value).model_fields
+        _map(out, {field.alias or name: getattr(value, name) for name, field in fields.items()})
+    elif isinstance(value, dict) and all(type(key) is str for key in value):
+        _map(out, value)
+    else:
+        out.append(_JSON)
+        data = to_json(value)
+        _varint(out, len(data))
+        out += data
+
+
+def _uuids(out: bytearray, ids: UUIDArray) -> None:
+    out.append(_UUIDS)
+    _varint(out, len(ids))
+    out += ids.buffer
+
+
+def _map(out: bytearray, values: dict[str, Any]) -> None:
+    out.append(_MAP)
+    _varint(out, len(values))
+    for key, value in values.items():
+        _text(out, key)
+        _encode(out, value)
+
+
+class _Decoder:
+    """Reads tagged values from a payload; arrays share its buffer when possible."""
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview]):
+        self.source = data
+        self.data = data if isinstance(data, bytes) else memoryview(data).cast("B").tobytes()
+        self.pos = 0
+
+    def take(self, size: int) -> bytes:
+        start = self.pos
+        self.pos = end = start + size
+        if end > len(self.data):
+            raise ValueError("truncated binary payload")
+        return self.data[start:end]
+
+    def take_view(self, size: int) -> memoryview:
+        start = self.pos
+        self.pos = end = start + size
+        if end > len(self.data):
+            raise ValueError("truncated binary payload")
+        return memoryview(self.source).cast("B")[start:end]
+
+    def varint(self) -> int:
+        data, pos = self.data, self.pos
+        result = shift = 0
+        while True:
+            if pos >= len(data):
+                raise ValueError("truncated binary payload")
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                self.pos = pos
+                return result
+            shift += 7
+
+    def text(self) -> str:
+        return self.take(self.varint()).decode()
+
+    def value(self, arrays: bool = False) -> Any:
+        """Decode the next value; UUID arrays are returned as `UUIDArray` when ``arrays`` is set."""
+        tag = self.take(1)[0]
+        if tag == _STR:
+            return self.text()
+        if tag == _UUID:
+            return UUID(bytes=self.take(UUID_SIZE))
+        if tag == _MAP:
+            return {self.text(): self.value(arrays) for _ in range(self.varint())}
+        if tag == _UUIDS:
+            ids = UUIDArray(self.take_view(self.varint() * UUID_SIZE))
+            return ids if arrays else list(ids)
+        if tag == _NONE:
+            return None
+        if tag in (_FALSE, _TRUE):
+            return tag == _TRUE
+        if tag == _INT:
+            value = self.varint()
+            return ~(value >> 1) if value & 1 else value >> 1
+        if tag == _FLOAT:
+            return _FLOAT64.unpack(self.take(8))[0]
+        if tag == _BYTES:
+            return self.take(self.varint())
+        if tag == _DATE:
+            return DateArray.from_days([_INT64.unpack(self.take(8))[0]])[0]
+        if tag == _DATETIME:
+            micros, offset = _DATETIME_PARTS.unpack(self.take(_DATETIME_PARTS.size))
+            return DateTimeArray.from_micros([micros], [offset])[0]
+        if tag == _LIST:
+            return [self.value() for _ in range(self.varint())]
+        if tag == _DATES:
+            return DateArray.from_days(_from_little_endian("q", self.take_view(self.varint() * 8)))
+        if tag == _DATETIMES:
+            count = self.varint()
+            micros = _from_little_endian("q", self.take_view(count * 8))
+            return DateTimeArray.from_micros(micros, _from_little_endian("i", self.take_view(count * 4)))
+        if tag == _JSON:
+            return from_json(self.take(self.varint()))
+        raise ValueError(f"unknown tag 0x{tag:02x} at byte {self.pos - 1}")
+
+
+def _id_items(ids: UUIDArray) -> list[bytes]:
+    # 16-byte values, turned into UUIDs by pydantic faster than building them here.
+    data = ids.tobytes()
+    return [data[offset : offset + UUID_SIZE] for offset in range(0, len(data), UUID_SIZE)]
+
+
+def dumps_binary(model: BaseModel) -> bytes:
+    """
+    Encode a schema object in the compact binary format.
+
+    UUIDs take 16 bytes, dates and datetimes fixed-width integers, and id,
+    date and datetime collections are written as contiguous arrays.
+
+    Args:
+        model: Any `BaseSchema` (or pydantic model) instance
+
+    Returns:
+        The payload, to be read back with `loads_binary`.
+    """
+    out = bytearray(MAGIC)
+    _encode(out, model)
+    return bytes(out)
+
+
+def loads_binary(data: Union[bytes, bytearray, memoryview], model: Optional[type] = None) -> "BaseSchema":
+    """
+    Decode and validate a payload written by `dumps_binary`.
+
+    Args:
+        data: The payload
+        model: Class to validate the fields with; ``None`` picks the class
+            from `kind` like `parse_value`
+
+    Returns:
+        The validated model, equal to the one that was encoded.
+
+    Raises:
+        ValueError: If ``data`` is not a valid payload.
+        ValidationError: If the fields do not validate against the model.
+    """
+    decoder = _Decoder(data)
+    if decoder.data[: len(MAGIC)] != MAGIC:
+        raise ValueError("not a tektome binary payload")
+    decoder.pos = len(MAGIC)
+    if decoder.data[decoder.pos : decoder.pos + 1] != bytes([_MAP]):
+        raise ValueError("binary payload does not hold an object")
+    fields = decoder.value(arrays=True)
+    if decoder.pos != len(decoder.data):
+        raise ValueError("trailing bytes after the binary payload")
+    for name, value in fields.items():
+        # Id arrays are kept for fields stored as `UUIDArray`, the others get a list.
+        if isinstance(value, UUIDArray):
+            field = None if model is None else model.model_fields.get(name)
+            if field is None or field.annotation == list[UUID]:
+                fields[name] = _id_items(value)
+            elif field.annotation is not UUIDArray:
+                fields[name] = list(value)
+    if model is None:
+        from tektome.schema import parse_value
+
+        return parse_value(fields)
+    return model.model_validate(fields)
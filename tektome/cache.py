@@ -0,0 +1,265 @@
+"""In-process LRU + TTL cache for fetched API payloads."""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, NamedTuple, Optional
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Snapshot of a cache's counters.
+
+    Attributes:
+        hits: Lookups served from the cache
+        misses: Lookups that had to load the value
+        evictions: Entries dropped to respect ``max_entries`` or ``max_bytes``
+        expirations: Entries dropped because their TTL elapsed
+        entries: Entries currently held
+        bytes: Total size of the entries currently held
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+_RETRY = object()
+"""Result of an async load whose task was cancelled: the waiting tasks load again."""
+
+
+class _Entry(NamedTuple):
+    value: bytes
+    expires: float
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of response bodies with a per-entry time to live.
+
+    Keys are usually `tektome.fetch.cache_key` tuples. Values are raw bodies, so each
+    caller decodes its own copy and sizes are exact. Concurrent misses on one
+    key are coalesced: a single caller loads the value while the others wait.
+
+    Attributes:
+        max_entries: Maximum number of entries, ``0`` disables the cache
+        max_bytes: Maximum total size of the entries
+        ttl: Default time to live of an entry, in seconds
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 2**20,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks: dict[Hashable, list] = {}
+        self._loading: dict[tuple, asyncio.Future] = {}
+        self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def _lookup(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires <= self._clock():
+                self._remove(key)
+                self._expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def _remove(self, key: Hashable) -> None:
+        self._bytes -= len(self._entries.pop(key).value)
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the cached value for ``key``, or ``None`` if absent or expired."""
+        value = self._lookup(key)
+        self._count(value is not None)
+        return value
+
+    def set(self, key: Hashable, value: bytes, *, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting least recently used entries as needed.
+
+        Values larger than ``max_bytes`` are not stored.
+
+        Args:
+            key: Cache key
+            value: Raw body to cache
+            ttl: Time to live in seconds, defaults to the cache's ``ttl``
+        """
+        if self.max_entries <= 0 or len(value) > self.max_bytes:
+            return
+        expires = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, expires)
+            self._bytes += len(value)
+            self._evict()
+
+    def get_or_load(self, key: Hashable, load: Callable[[], bytes], *, ttl: Optional[float] = None) -> bytes:
+        """
+        Return the cached value, calling ``load`` to fill it on a miss.
+
+        Threads missing the same key wait for the first one's ``load`` instead
+        of loading it again. Exceptions from ``load`` propagate and nothing is
+        cached.
+        """
+        value = self._lookup(key)
+        if value is None:
+            with self._key_lock(key):
+                value = self._lookup(key)
+                if value is None:
+                    self._count(False)
+                    value = load()
+                    self.set(key, value, ttl=ttl)
+                    return value
+        self._count(True)
+        return value
+
+    async def aget_or_load(
+        self, key: Hashable, load: Callable[[], Awaitable[bytes]], *, ttl: Optional[float] = None
+    ) -> bytes:
+        """
+        Async version of `get_or_load`: tasks missing the same key share one ``load``.
+
+        If the task running ``load`` is cancelled, only that task is: one of
+        the waiting tasks loads the key instead.
+        """
+        loading_key = (asyncio.get_running_loop(), key)
+        while True:
+            value = self._lookup(key)
+            if value is not None:
+                self._count(True)
+                return value
+            loading = self._loading.get(loading_key)
+            if loading is None:
+                break
+            value = await asyncio.shield(loading)
+            if value is not _RETRY:
+                self._count(True)
+                return value
+        self._count(False)
+        future = self._loading[loading_key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            future.set_result(_RETRY)
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        else:
+            self.set(key, value, ttl=ttl)
+            future.set_result(value)
+            return value
+        finally:
+            del self._loading[loading_key]
+
+    def _key_lock(self, key: Hashable) -> "_KeyLock":
+        return _KeyLock(self, key)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop one entry."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Drop every entry. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def configure(
+        self, *, max_entries: Optional[int] = None, max_bytes: Optional[int] = None, ttl: Optional[float] = None
+    ) -> None:
+        """Change the limits; entries over the new limits are evicted."""
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if ttl is not None:
+            self.ttl = ttl
+        with self._lock:
+            self._evict()
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key) is not None
+
+
+class _KeyLock:
+    """Reference-counted lock for one key, dropped when no thread uses it."""
+
+    def __init__(self, cache: ResponseCache, key: Hashable):
+        self._cache = cache
+        self._key = key
+
+    def __enter__(self):
+        with self._cache._lock:
+            slot = self._cache._key_locks.setdefault(self._key, [threading.Lock(), 0])
+            slot[1] += 1
+        slot[0].acquire()
+
+    def __exit__(self, *exc_info):
+        with self._cache._lock:
+            slot = self._cache._key_locks[self._key]
+            slot[0].release()
+            slot[1] -= 1
+            if not slot[1]:
+                del self._cache._key_locks[self._key]
+
+
+default_cache = ResponseCache()
+"""Process-wide cache consulted by the `Context`-based fetch paths."""
@@ -0,0 +1,204 @@
+"""Shared keep-alive HTTP clients for the Tektome API."""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - exercised only without the extra
+    httpx = None
+
+from tektome import __version__
+
+
+def _require_httpx() -> None:
+    if httpx is None:
+        raise ImportError("HTTP clients require httpx: pip install 'tektome[http]'")
+
+
+class ClientPool:
+    """
+    Registry of keep-alive HTTP clients, one per ``(base_url, user_api_key)``.
+
+    Each client keeps its own connection pool with authentication
+    preconfigured, and is reused by every caller with the same key.
+    Clients unused for ``idle_timeout`` seconds, and the least recently
+    used ones beyond ``max_clients``, are closed with their connections
+    when the pool is next used, or by `evict_idle`. Requests still running
+    on a closed client fail, so keep ``idle_timeout`` above ``timeout``.
+
+    Attributes:
+        max_connections: Maximum open connections per client
+        keepalive_expiry: Seconds an idle connection is kept before being closed
+        timeout: Default request timeout in seconds
+        max_clients: Maximum number of clients, sync and async, kept open
+        idle_timeout: Seconds after which an unused client is closed
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        max_clients: int = 100,
+        idle_timeout: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        # (event loop or None for sync clients, base_url, user_api_key) -> [client, last used], oldest use first
+        self._clients: "OrderedDict[tuple, list]" = OrderedDict()
+        self._closing: set = set()
+        self._lock = threading.Lock()
+
+    def get(self, base_url: str, user_api_key: str) -> "httpx.Client":
+        """
+        Return the client for a deployment and API key, creating it on first use.
+
+        Args:
+            base_url: Deployment base url, used for relative request urls
+            user_api_key: Sent as ``Authorization: Bearer <key>``
+
+        Returns:
+            The shared `httpx.Client`.
+        """
+        _require_httpx()
+        return self._get(None, base_url, user_api_key)
+
+    def get_async(self, base_url: str, user_api_key: str) -> "httpx.AsyncClient":
+        """
+        Return the asyncio client for a deployment and API key in the running event loop.
+
+        Async clients are bound to their event loop, so each loop gets its own.
+
+        Args:
+            base_url: Deployment base url, used for relative request urls
+            user_api_key: Sent as ``Authorization: Bearer <key>``
+
+        Returns:
+            The shared `httpx.AsyncClient`.
+        """
+        _require_httpx()
+        return self._get(asyncio.get_running_loop(), base_url, user_api_key)
+
+    def _get(self, loop: Optional[asyncio.AbstractEventLoop], base_url: str, user_api_key: str):
+        key = (loop, base_url, user_api_key)
+        with self._lock:
+            now = self._clock()
+            entry = self._clients.get(key)
+            if entry is None or entry[0].is_closed:
+                client_class = httpx.Client if loop is None else httpx.AsyncClient
+                entry = self._clients[key] = [self._create(base_url, user_api_key, client_class), now]
+                dropped = self._evict(now, keep=1)
+                if loop is not None:
+                    dropped += self._forget_closed_loops()
+            else:
+                entry[1] = now
+                self._clients.move_to_end(key)
+                dropped = self._evict(now, keep=1)
+        self._close_clients(dropped)
+        return entry[0]
+
+    def _evict(self, now: float, keep: int) -> list:
+        # Clients are kept in order of use, so idle ones come first and the one just used comes last.
+        dropped = []
+        while len(self._clients) > keep:
+            key, (client, last_used) = next(iter(self._clients.items()))
+            if len(self._clients) <= self.max_clients and last_used + self.idle_timeout > now:
+                break
+            del self._clients[key]
+            dropped.append((key[0], client))
+        return dropped
+
+    def _forget_closed_loops(self) -> list:
+        # Clients of finished event loops can no longer be used.
+        keys = [key for key in self._clients if key[0] is not None and key[0].is_closed()]
+        return [(key[0], self._clients.pop(key)[0]) for key in keys]
+
+    def _close_clients(self, dropped: list) -> None:
+        for loop, client in dropped:
+            if loop is None:
+                client.close()
+            elif not loop.is_closed():  # the connections of closed loops are released with their client
+                future = asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+                self._closing.add(future)
+                future.add_done_callback(self._closing.discard)
+
+    def evict_idle(self) -> None:
+        """Close the clients unused for ``idle_timeout`` seconds, without waiting for the next use."""
+        with self._lock:
+            dropped = self._evict(self._clock(), keep=0) + self._forget_closed_loops()
+        self._close_clients(dropped)
+
+    def _create(self, base_url: str, user_api_key: str, client_class: Optional[type] = None):
+        return (client_class or httpx.Client)(
+            base_url=base_url,
+            headers=self._headers(user_api_key),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            timeout=self.timeout,
+        )
+
+    @staticmethod
+    def _headers(user_api_key: str) -> dict[str, str]:
+        return {"Authorization": f"Bearer {user_api_key}", "User-Agent": f"tektome/{__version__}"}
+
+    def configure(
+        self,
+        *,
+        max_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_clients: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> None:
+        """Change the pool settings. Existing clients are closed and recreated on next use."""
+        if max_connections is not None:
+            self.max_connections = max_connections
+        if keepalive_expiry is not None:
+            self.keepalive_expiry = keepalive_expiry
+        if timeout is not None:
+            self.timeout = timeout
+        if max_clients is not None:
+            self.max_clients = max_clients
+        if idle_timeout is not None:
+            self.idle_timeout = idle_timeout
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close every client and its connections.
+
+        Async clients are closed on their event loop once it gets to run;
+        use `aclose` to wait for those of the running loop.
+        """
+        with self._lock:
+            clients, self._clients = list(self._clients.items()), OrderedDict()
+        self._close_clients([(loop, client) for (loop, _, _), (client, _) in clients])
+
+    async def aclose(self) -> None:
+        """Close the async clients of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            keys = [key for key in self._clients if key[0] is loop]
+            clients = [self._clients.pop(key)[0] for key in keys]
+        for client in clients:
+            await client.aclose()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+default_pool = ClientPool()
+"""Process-wide pool used by `Context.client`."""
@@ -0,0 +1,337 @@
+"""Persistent sqlite cache of fetched API payloads, shared across worker restarts."""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple, Optional, Union
+from uuid import UUID
+
+from tektome.cache import CacheStats
+
+FORMAT_VERSION = 2
+"""Version stamp of the database layout; files with another version are reset."""
+
+ENV_DIRECTORY = "TEKTOME_CACHE_DIR"
+"""Environment variable enabling the process-wide disk cache in that directory."""
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS entries (
+        base_url TEXT NOT NULL,
+        principal TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        id BLOB NOT NULL,
+        body BLOB NOT NULL,
+        etag TEXT,
+        stored REAL NOT NULL,
+        accessed REAL NOT NULL,
+        size INTEGER NOT NULL,
+        UNIQUE (base_url, principal, kind, id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)",
+    # Running totals kept by triggers, so size checks are O(1) and hold across processes.
+    "CREATE TABLE IF NOT EXISTS totals (entries INTEGER NOT NULL, bytes INTEGER NOT NULL)",
+    "INSERT INTO totals SELECT 0, 0 WHERE NOT EXISTS (SELECT 1 FROM totals)",
+    """CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+        UPDATE totals SET entries = entries + 1, bytes = bytes + NEW.size;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+        UPDATE totals SET entries = entries - 1, bytes = bytes - OLD.size;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+        UPDATE totals SET bytes = bytes - OLD.size + NEW.size;
+    END""",
+)
+
+
+Key = tuple[str, str, str, UUID]
+
+ACCESS_BATCH = 256
+"""Number of reads whose access times are buffered before being written in one transaction."""
+
+
+class Stored(NamedTuple):
+    """
+    A cached payload read from disk.
+
+    Attributes:
+        body: Raw response body
+        etag: ``ETag`` header of the response, if any
+        fresh: Whether the entry is younger than the cache's ``ttl``; stale
+            entries should be revalidated with ``If-None-Match``
+    """
+
+    body: bytes
+    etag: Optional[str]
+    fresh: bool
+
+
+class DiskCache:
+    """
+    LRU cache of response bodies in a sqlite database, safe across threads and processes.
+
+    Keys are ``(base_url, principal, kind, id)``, as built by
+    `tektome.fetch.cache_key`: an entry is only returned for the API key that
+    stored it, so one key's payloads are never served, nor revalidated, with
+    another. Entries past ``ttl`` are kept and
+    reported as stale, so they can be revalidated against their ETag instead
+    of downloaded again.
+
+    Reads do not write: access times are buffered and written in batches of
+    `ACCESS_BATCH`, and before this process evicts entries, so its reads do
+    not contend with other readers of the database.
+
+    Attributes:
+        path: The database file
+        max_entries: Maximum number of entries
+        max_bytes: Maximum total size of the bodies
+        ttl: Seconds an entry is served without revalidation
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike],
+        *,
+        max_entries: int = 100_000,
+        max_bytes: int = 1 << 30,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / "tektome-cache.sqlite3"
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = self._expirations = 0
+        self._accessed: dict[Key, float] = {}
+        self._setup()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _setup(self) -> None:
+        connection = self._connect()
+        with _transaction(connection):
+            (version,) = connection.execute("PRAGMA user_version").fetchone()
+            if version != FORMAT_VERSION:
+                connection.execute("DROP TABLE IF EXISTS entries")
+                connection.execute("DROP TABLE IF EXISTS totals")
+                connection.execute(f"PRAGMA user_version = {FORMAT_VERSION}")
+            for statement in _SCHEMA:
+                connection.execute(statement)
+
+    def get(self, key: Key) -> Optional[Stored]:
+        """Return the stored payload for ``key``, marking it recently used."""
+        base_url, principal, kind, id = key
+        connection = self._connect()
+        now = self._clock()
+        row = connection.execute(
+            "SELECT body, etag, stored FROM entries WHERE base_url = ? AND principal = ? AND kind = ? AND id = ?",
+            (base_url, principal, kind, id.bytes),
+        ).fetchone()
+        with self._lock:
+            if row is None:
+                self._misses += 1
+                return None
+            fresh = row[2] + self.ttl > now
+            if fresh:
+                self._hits += 1
+            else:
+                self._expirations += 1
+            self._accessed[key] = now
+            flush = len(self._accessed) >= ACCESS_BATCH
+        if flush:
+            with _transaction(connection):
+                self._write_accessed(connection)
+        return Stored(row[0], row[1], fresh)
+
+    def _write_accessed(self, connection: sqlite3.Connection) -> None:
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        connection.executemany(
+            "UPDATE entries SET accessed = max(accessed, ?)"
+            " WHERE base_url = ? AND principal = ? AND kind = ? AND id = ?",
+            [(now, base_url, principal, kind, id.bytes) for (base_url, principal, kind, id), now in accessed.items()],
+        )
+
+    def set(self, key: Key, body: bytes, *, etag: Optional[str] = None) -> None:
+        """
+        Store a payload, evicting least recently used entries as needed.
+
+        Bodies larger than ``max_bytes`` are not stored.
+
+        Args:
+            key: ``(base_url, principal, kind, id)``
+            body: Raw response body
+            etag: ``ETag`` header of the response
+        """
+        if self.max_entries <= 0 or len(body) > self.max_bytes:
+            return
+        base_url, principal, kind, id = key
+        now = self._clock()
+        connection = self._connect()
+        with _transaction(connection):
+            connection.execute(
+                "INSERT INTO entries (base_url, principal, kind, id, body, etag, stored, accessed, size)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (base_url, principal, kind, id) DO UPDATE SET body = excluded.body, etag = excluded.etag,"
+                " stored = excluded.stored, accessed = excluded.accessed, size = excluded.size",
+                (base_url, principal, kind, id.bytes, body, etag, now, now, len(body)),
+            )
+            self._evict(connection)
+
+    def touch(self, key: Key) -> None:
+        """Mark an entry as fresh again, after the server confirmed its ETag."""
+        base_url, principal, kind, id = key
+        now = self._clock()
+        self._connect().execute(
+            "UPDATE entries SET stored = ?, accessed = ?"
+            " WHERE base_url = ? AND principal = ? AND kind = ? AND id = ?",
+            (now, now, base_url, principal, kind, id.bytes),
+        )
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        entries, size = connection.execute("SELECT entries, bytes FROM totals").fetchone()
+        excess_entries = entries - self.max_entries
+        excess_bytes = size - self.max_bytes
+        if excess_entries <= 0 and excess_bytes <= 0:
+            return
+        self._write_accessed(connection)  # so that entries read since the last batch are not picked
+        victims = []
+        for rowid, entry_size in connection.execute("SELECT rowid, size FROM entries ORDER BY accessed, rowid"):
+            if excess_entries <= 0 and excess_bytes <= 0:
+                break
+            victims.append((rowid,))
+            excess_entries -= 1
+            excess_bytes -= entry_size
+        connection.executemany("DELETE FROM entries WHERE rowid = ?", victims)
+        with self._lock:
+            self._evictions += len(victims)
+
+    def invalidate(self, key: Key) -> None:
+        """Drop one entry."""
+        base_url, principal, kind, id = key
+        self._connect().execute(
+            "DELETE FROM entries WHERE base_url = ? AND principal = ? AND kind = ? AND id = ?",
+            (base_url, principal, kind, id.bytes),
+        )
+
+    def clear(self) -> None:
+        """Drop every entry. Counters are kept."""
+        self._connect().execute("DELETE FROM entries")
+
+    def configure(
+        self, *, max_entries: Optional[int] = None, max_bytes: Optional[int] = None, ttl: Optional[float] = None
+    ) -> None:
+        """Change the limits; entries over the new limits are evicted."""
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if ttl is not None:
+            self.ttl = ttl
+        connection = self._connect()
+        with _transaction(connection):
+            self._evict(connection)
+
+    def stats(self) -> CacheStats:
+        """
+        Return a snapshot of the counters.
+
+        Hits, misses and evictions are counted by this process; stale entries
+        found by `get` count as expirations. Entries and bytes cover the
+        whole database.
+        """
+        entries, size = self._connect().execute("SELECT entries, bytes FROM totals").fetchone()
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                entries=entries,
+                bytes=size,
+            )
+
+    def close(self) -> None:
+        """Write the buffered access times and close this thread's database connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            with _transaction(connection):
+                self._write_accessed(connection)
+            connection.close()
+            self._local.connection = None
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT entries FROM totals").fetchone()[0]
+
+
+@contextmanager
+def _transaction(connection: sqlite3.Connection) -> Iterator[None]:
+    """Immediate transaction on an autocommit connection."""
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+_default: Optional[DiskCache] = None
+_default_lock = threading.Lock()
+_initialized = False
+
+
+def enable(directory: Union[str, os.PathLike], **limits) -> DiskCache:
+    """
+    Enable the process-wide disk cache consulted by `Context`-based fetches.
+
+    Args:
+        directory: Directory holding the database, created if missing
+        **limits: ``max_entries``, ``max_bytes`` or ``ttl``, see `DiskCache`
+
+    Returns:
+        The new cache.
+    """
+    global _default, _initialized
+    cache = DiskCache(directory, **limits)
+    with _default_lock:
+        _default, _initialized = cache, True
+    return cache
+
+
+def disable() -> None:
+    """Disable the process-wide disk cache, including one set by ``TEKTOME_CACHE_DIR``."""
+    global _default, _initialized
+    with _default_lock:
+        _default, _initialized = None, True
+
+
+def default_disk_cache() -> Optional[DiskCache]:
+    """
+    Return the process-wide disk cache, or ``None`` when disabled.
+
+    It is disabled unless `enable` was called or ``TEKTOME_CACHE_DIR`` is set.
+    """
+    global _default, _initialized
+    if not _initialized:
+        with _default_lock:
+            if not _initialized:
+                directory = os.environ.get(ENV_DIRECTORY)
+                if directory:
+                    _default = DiskCache(directory)
+                _initialized = True
+    return _default
@@ -0,0 +1,231 @@
+"""Concurrent fetching of the objects behind ids."""
+
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, Optional
+from uuid import UUID
+
+if TYPE_CHECKING:
+    import httpx
+
+    from tektome.disk_cache import DiskCache, Stored
+    from tektome.schema import Context
+
+ENDPOINTS: dict[str, str] = {}
+"""
+Request path template of a single object, relative to `Context.base_url`, per item kind.
+
+Empty until the paths of the deployment's API are set with `register_endpoint`.
+"""
+
+
+@dataclass
+class Fetched:
+    """
+    Outcome of fetching one id.
+
+    Attributes:
+        id: The requested id
+        data: Decoded JSON body, ``None`` on failure
+        error: The exception raised by the request, ``None`` on success
+    """
+
+    id: UUID
+    data: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the fetch succeeded."""
+        return self.error is None
+
+
+def register_endpoint(kind: str, template: str) -> None:
+    """
+    Set the request path of single objects of a kind, for every fetch.
+
+    Example:
+        ```python
+        register_endpoint("resource", "api/resources/{id}")
+        ```
+
+    Args:
+        kind: An item kind (``"resource"``) or collection kind (``"resource[]"``)
+        template: Path relative to `Context.base_url`, with an ``{id}`` placeholder
+
+    Raises:
+        ValueError: If the template has no ``{id}`` placeholder.
+    """
+    if "{id}" not in template:
+        raise ValueError("endpoint template must contain '{id}'")
+    ENDPOINTS[_item_kind(kind)] = template
+
+
+def endpoint(kind: str) -> str:
+    """
+    Return the request path template for a kind.
+
+    Args:
+        kind: An item kind (``"resource"``) or collection kind (``"resource[]"``)
+
+    Raises:
+        ValueError: If no endpoint was registered for the kind.
+    """
+    try:
+        return ENDPOINTS[_item_kind(kind)]
+    except KeyError:
+        raise ValueError(f"no endpoint registered for kind '{kind}', see tektome.fetch.register_endpoint") from None
+
+
+def _item_kind(kind: str) -> str:
+    return kind.removesuffix("[]")
+
+
+@lru_cache(maxsize=1024)
+def principal(user_api_key: str) -> str:
+    """Return the hash identifying an API key in cache keys, without revealing it."""
+    return hashlib.sha256(user_api_key.encode()).hexdigest()[:32]
+
+
+def cache_key(ctx: "Context", kind: str, id: UUID) -> tuple[str, str, str, UUID]:
+    """
+    Return the ``(base_url, principal, kind, id)`` cache key of an object.
+
+    The `principal` of the API key is part of the key: a payload fetched
+    with one key is never served to another, which may not be allowed to
+    read it.
+    """
+    return str(ctx.base_url), principal(ctx.user_api_key), _item_kind(kind), id
+
+
+def _revalidation_headers(stored: Optional["Stored"]) -> dict[str, str]:
+    return {"If-None-Match": stored.etag} if stored is not None and stored.etag else {}
+
+
+def _response_body(
+    response: "httpx.Response", disk: Optional["DiskCache"], key: tuple, stored: Optional["Stored"]
+) -> bytes:
+    if response.status_code == 304 and stored is not None:
+        disk.touch(key)
+        return stored.body
+    response.raise_for_status()
+    if disk is not None:
+        disk.set(key, response.content, etag=response.headers.get("ETag"))
+    return response.content
+
+
+def fetch_json(ctx: "Context", kind: str, id: UUID) -> Any:
+    """
+    Fetch one object, consulting the context's caches first.
+
+    The in-memory `Context.cache` is checked first, then `Context.disk_cache`
+    when enabled. Stale disk entries are revalidated with ``If-None-Match``.
+
+    Args:
+        ctx: Context of the current execution
+        kind: Item or collection kind selecting the endpoint
+        id: Id of the object
+
+    Returns:
+        The decoded JSON body.
+
+    Raises:
+        httpx.HTTPError: If the request fails; failures are not cached.
+    """
+    path = endpoint(kind).format(id=id)
+    key = cache_key(ctx, kind, id)
+
+    def load() -> bytes:
+        disk = ctx.disk_cache()
+        stored = disk.get(key) if disk is not None else None
+        if stored is not None and stored.fresh:
+            return stored.body
+        response = ctx.client().get(path, headers=_revalidation_headers(stored))
+        return _response_body(response, disk, key, stored)
+
+    return json.loads(ctx.cache().get_or_load(key, load))
+
+
+async def fetch_one(ctx: "Context", kind: str, id: UUID) -> Fetched:
+    """Async `fetch_json`, capturing any failure in the returned `Fetched`."""
+    path = endpoint(kind).format(id=id)
+    key = cache_key(ctx, kind, id)
+
+    async def load() -> bytes:
+        # Local sqlite lookups are fast enough to run on the event loop.
+        disk = ctx.disk_cache()
+        stored = disk.get(key) if disk is not None else None
+        if stored is not None and stored.fresh:
+            return stored.body
+        response = await ctx.async_client().get(path, headers=_revalidation_headers(stored))
+        return _response_body(response, disk, key, stored)
+
+    try:
+        return Fetched(id, json.loads(await ctx.cache().aget_or_load(key, load)))
+    except Exception as exc:
+        return Fetched(id, error=exc)
+
+
+async def iter_fetch(
+    ctx: "Context", kind: str, ids: Iterable[UUID], *, concurrency: int = 8
+) -> AsyncIterator[tuple[int, Fetched]]:
+    """
+    Fetch ids with at most ``concurrency`` requests in flight.
+
+    Args:
+        ctx: Context of the current execution
+        kind: Item or collection kind selecting the endpoint
+        ids: The ids to fetch
+        concurrency: Maximum number of requests in flight
+
+    Yields:
+        ``(index, Fetched)`` pairs as requests complete, ``index`` being the
+        position of the id in ``ids``.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    endpoint(kind)
+
+    async def fetch(index: int, id: UUID) -> tuple[int, Fetched]:
+        return index, await fetch_one(ctx, kind, id)
+
+    pending: set[asyncio.Task] = set()
+    try:
+        for index, id in enumerate(ids):
+            if len(pending) >= concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+            pending.add(asyncio.ensure_future(fetch(index, id)))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def fetch_all(
+    ctx: "Context", kind: str, ids: Iterable[UUID], *, concurrency: int = 8, ordered: bool = True
+) -> list[Fetched]:
+    """
+    Fetch every id with bounded concurrency and collect the results.
+
+    Args:
+        ctx: Context of the current execution
+        kind: Item or collection kind selecting the endpoint
+        ids: The ids to fetch
+        concurrency: Maximum number of requests in flight
+        ordered: Return results in input order, otherwise in completion order
+
+    Returns:
+        One `Fetched` per id; failures do not stop the other requests.
+    """
+    results = [pair async for pair in iter_fetch(ctx, kind, ids, concurrency=concurrency)]
+    if ordered:
+        results.sort(key=lambda pair: pair[0])
+    return [fetched for _, fetched in results]
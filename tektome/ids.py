@@ -0,0 +1,560 @@
+"""Compact and lazy storage for collections of UUIDs."""
+
+import re
+from collections.abc import Sequence
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Iterable, Iterator, Union, overload
+from uuid import UUID
+
+from pydantic_core import SchemaValidator, core_schema
+
+from tektome._lazy import lazy_import
+
+try:
+    np = lazy_import("numpy")  # imported on first use
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+try:
+    pa = lazy_import("pyarrow")
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+
+UUID_SIZE = 16
+
+_ITER_CHUNK = 4096 * UUID_SIZE
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy export requires numpy: pip install 'tektome[numpy]'")
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Arrow export requires pyarrow: pip install 'tektome[arrow]'")
+
+_HEX = "[0-9a-fA-F]"
+_HYPHENATED = rf"{_HEX}{{8}}-{_HEX}{{4}}-{_HEX}{{4}}-{_HEX}{{4}}-{_HEX}{{12}}"
+UUID_PATTERN = rf"^(?:{_HYPHENATED}|{_HEX}{{32}}|\{{{_HYPHENATED}\}}|urn:uuid:{_HYPHENATED})$"
+"""Regular expression matching the UUID string forms accepted by pydantic.
+
+These are the hyphenated form, alone, in braces or as a URN, and the 32
+hex digits without hyphens.
+"""
+
+
+class _UUIDSequence(Sequence):
+    """Shared read-only behaviour of the UUID containers."""
+
+    __slots__ = ()
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, tuple, _UUIDSequence)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+    @classmethod
+    def _reuse_instance(cls, value: Any, handler: core_schema.ValidatorFunctionWrapHandler) -> Any:
+        return value if isinstance(value, cls) else handler(value)
+
+    def id_set(self) -> "IdSet":
+        """Return the ids as an `IdSet`, built on first use and kept with the container."""
+        if self._id_set is None:
+            self._id_set = IdSet(self)
+        return self._id_set
+
+
+class UUIDArray(_UUIDSequence):
+    """
+    Read-only sequence of UUIDs stored as one contiguous buffer of 16 bytes per id.
+
+    Behaves like a ``list[UUID]`` for reading, but keeps no per-id Python
+    objects: a `UUID` is built only when an element is accessed.
+    """
+
+    __slots__ = ("_buf", "_id_set", "_owner")
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview] = b""):
+        view = memoryview(buffer).cast("B")
+        if view.nbytes % UUID_SIZE:
+            raise ValueError(f"buffer size must be a multiple of {UUID_SIZE} bytes")
+        self._buf = view.toreadonly()
+        self._id_set = None
+        self._owner = None  # kept alive with the buffer, e.g. a shared memory segment
+
+    @classmethod
+    def from_uuids(cls, values: Iterable[Union[UUID, str]]) -> "UUIDArray":
+        """
+        Pack UUIDs (or UUID strings) into a new array.
+
+        Args:
+            values: UUID objects or strings accepted by `uuid.UUID`
+
+        Returns:
+            A new `UUIDArray` owning its buffer.
+        """
+        buf = bytearray()
+        for value in values:
+            buf += value.bytes if isinstance(value, UUID) else UUID(value).bytes
+        return cls(buf)
+
+    @property
+    def buffer(self) -> memoryview:
+        """Read-only view of the underlying 16-byte-per-id buffer."""
+        return self._buf
+
+    def tobytes(self) -> bytes:
+        """Return a copy of the underlying buffer."""
+        return self._buf.tobytes()
+
+    def to_numpy(self, *, structured: bool = False) -> "np.ndarray":
+        """
+        Return the ids as a read-only numpy array sharing the buffer.
+
+        Args:
+            structured: Return one record per id with its big-endian 64-bit
+                halves ``hi`` and ``lo`` (ordered like the ids) instead of an
+                ``(n, 16)`` uint8 array
+
+        Raises:
+            ImportError: If numpy is not installed.
+        """
+        _require_numpy()
+        if structured:
+            return _u128(self._buf)
+        return np.frombuffer(self._buf, dtype=np.uint8).reshape(-1, UUID_SIZE)
+
+    def to_arrow(self) -> "pa.FixedSizeBinaryArray":
+        """
+        Return the ids as a ``fixed_size_binary(16)`` Arrow array sharing the buffer.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        _require_pyarrow()
+        return pa.Array.from_buffers(pa.binary(UUID_SIZE), len(self), [None, pa.py_buffer(self._buf)])
+
+    @classmethod
+    def from_arrow(cls, array: Union["pa.Array", "pa.ChunkedArray"]) -> "UUIDArray":
+        """
+        Wrap the ids of an Arrow array, sharing its buffer.
+
+        Args:
+            array: A ``fixed_size_binary(16)`` array (or an extension array
+                stored as one, such as ``pa.uuid()``) without nulls. A chunked
+                array with several chunks is copied into one buffer.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+            TypeError: If the array does not hold 16-byte values.
+            ValueError: If the array has nulls.
+        """
+        _require_pyarrow()
+        if isinstance(array, pa.ChunkedArray):
+            if array.num_chunks != 1:
+                return cls(b"".join(cls.from_arrow(chunk).buffer for chunk in array.chunks))
+            array = array.chunk(0)
+        if isinstance(array.type, pa.BaseExtensionType):
+            array = array.storage
+        if array.type != pa.binary(UUID_SIZE):
+            raise TypeError(f"expected a fixed_size_binary({UUID_SIZE}) array, got {array.type}")
+        if array.null_count:
+            raise ValueError("ids must not be null")
+        data = array.buffers()[1]
+        if data is None:
+            return cls()
+        start = array.offset * UUID_SIZE
+        return cls(memoryview(data)[start : start + len(array) * UUID_SIZE])
+
+    def __len__(self) -> int:
+        return self._buf.nbytes // UUID_SIZE
+
+    @overload
+    def __getitem__(self, index: int) -> UUID: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "UUIDArray": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                view = UUIDArray.__new__(UUIDArray)  # the buffer is already a read-only byte view
+                view._buf = self._buf[start * UUID_SIZE : max(start, stop) * UUID_SIZE]
+                view._id_set = None
+                view._owner = self._owner
+                return view
+            return UUIDArray(b"".join(self._raw(i) for i in range(start, stop, step)))
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("UUIDArray index out of range")
+        return UUID(bytes=self._raw(index))
+
+    def _raw(self, index: int) -> bytes:
+        offset = index * UUID_SIZE
+        return self._buf[offset : offset + UUID_SIZE].tobytes()
+
+    def __iter__(self) -> Iterator[UUID]:
+        buf = self._buf
+        # Copies a bounded chunk at a time, never the whole buffer.
+        for start in range(0, buf.nbytes, _ITER_CHUNK):
+            data = buf[start : start + _ITER_CHUNK].tobytes()
+            for offset in range(0, len(data), UUID_SIZE):
+                yield UUID(bytes=data[offset : offset + UUID_SIZE])
+
+    def __contains__(self, value: Any) -> bool:
+        if not isinstance(value, UUID):
+            return False
+        # re searches the buffer in place; only matches on an id boundary count.
+        search = re.compile(re.escape(value.bytes)).search
+        match = search(self._buf)
+        while match is not None:
+            offset = match.start()
+            if offset % UUID_SIZE == 0:
+                return True
+            match = search(self._buf, offset - offset % UUID_SIZE + UUID_SIZE)
+        return False
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, UUIDArray):
+            return self._buf == other._buf
+        return super().__eq__(other)
+
+    def __reduce_ex__(self, protocol: int):
+        if protocol >= 5:
+            from pickle import PickleBuffer
+
+            # Sent out-of-band with a ``buffer_callback``, and then wrapped without a copy.
+            return (UUIDArray, (PickleBuffer(self._buf),))
+        return (UUIDArray, (self.tobytes(),))
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler) -> core_schema.CoreSchema:
+        from_list = core_schema.no_info_after_validator_function(
+            cls.from_uuids, core_schema.list_schema(core_schema.uuid_schema())
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_list,
+            python_schema=core_schema.no_info_wrap_validator_function(cls._reuse_instance, from_list),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                list, return_schema=core_schema.list_schema(core_schema.uuid_schema())
+            ),
+        )
+
+
+class LazyUUIDs(_UUIDSequence):
+    """
+    Read-only sequence of UUIDs kept as the validated input strings.
+
+    Strings are only checked against `UUID_PATTERN` during validation; a
+    `UUID` is built when an element is accessed, iterated or dumped.
+    """
+
+    __slots__ = ("_raw", "_id_set")
+
+    def __init__(self, values: Iterable[Union[UUID, str]] = ()):
+        self._raw = values if isinstance(values, list) else list(values)
+        self._id_set = None
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    @overload
+    def __getitem__(self, index: int) -> UUID: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "LazyUUIDs": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LazyUUIDs(self._raw[index])
+        return _as_uuid(self._raw[index])
+
+    def __iter__(self) -> Iterator[UUID]:
+        return map(_as_uuid, self._raw)
+
+    def __contains__(self, value: Any) -> bool:
+        return isinstance(value, UUID) and any(value == _as_uuid(raw) for raw in self._raw)
+
+    def __reduce__(self):
+        return (LazyUUIDs, (self._raw,))
+
+    def _dump(self, info: core_schema.SerializationInfo) -> list:
+        if info.mode_is_json():
+            return [raw if _is_canonical(raw) else str(_as_uuid(raw)) for raw in self._raw]
+        return list(self)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler) -> core_schema.CoreSchema:
+        error = {"custom_error_type": "uuid_format", "custom_error_message": "Input should be a valid UUID"}
+        uuid_str = core_schema.custom_error_schema(core_schema.str_schema(pattern=UUID_PATTERN), **error)
+        return core_schema.json_or_python_schema(
+            json_schema=core_schema.no_info_after_validator_function(cls, core_schema.list_schema(uuid_str)),
+            python_schema=core_schema.no_info_wrap_validator_function(
+                cls._reuse_instance,
+                core_schema.no_info_after_validator_function(
+                    cls,
+                    core_schema.list_schema(
+                        core_schema.union_schema([core_schema.is_instance_schema(UUID), uuid_str], **error)
+                    ),
+                ),
+            ),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls._dump, info_arg=True, return_schema=core_schema.list_schema()
+            ),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema, handler):
+        return handler(core_schema.list_schema(core_schema.uuid_schema()))
+
+
+class IdSet(_UUIDSequence):
+    """
+    Immutable set of UUIDs stored as a sorted buffer of unique 16-byte ids.
+
+    Ids are ordered as big-endian 128-bit integers. Membership is a binary
+    search, and `union`, `intersection` and `difference` work on the raw
+    buffers: vectorized with numpy when it is installed, with a pure Python
+    fallback otherwise.
+    """
+
+    __slots__ = ("_buf",)
+
+    def __init__(self, values: Union[Iterable[Union[UUID, str]], UUIDArray] = ()):
+        if isinstance(values, IdSet):
+            self._buf = values._buf
+        else:
+            array = values if isinstance(values, UUIDArray) else UUIDArray.from_uuids(values)
+            self._buf = _sorted_unique(array.buffer)
+
+    @classmethod
+    def _from_sorted(cls, buffer: bytes) -> "IdSet":
+        instance = cls.__new__(cls)
+        instance._buf = buffer
+        return instance
+
+    @property
+    def buffer(self) -> memoryview:
+        """Read-only view of the sorted buffer."""
+        return memoryview(self._buf).toreadonly()
+
+    def id_set(self) -> "IdSet":
+        return self
+
+    def to_array(self) -> UUIDArray:
+        """Return the ids, in sorted order, as a `UUIDArray` sharing the buffer."""
+        array = UUIDArray(self._buf)
+        array._id_set = self
+        return array
+
+    def __len__(self) -> int:
+        return len(self._buf) // UUID_SIZE
+
+    def __getitem__(self, index: int) -> UUID:
+        return self.to_array()[index]
+
+    def __iter__(self) -> Iterator[UUID]:
+        return iter(self.to_array())
+
+    def __contains__(self, value: Any) -> bool:
+        if not isinstance(value, UUID):
+            return False
+        needle = value.bytes
+        index = _bisect(self._buf, needle)
+        return self._buf[index * UUID_SIZE : (index + 1) * UUID_SIZE] == needle
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, IdSet):
+            return self._buf == other._buf
+        if isinstance(other, (set, frozenset)):
+            return len(self) == len(other) and all(value in self for value in other)
+        return NotImplemented
+
+    def union(self, other: Iterable[Union[UUID, str]]) -> "IdSet":
+        """Return the ids in either set."""
+        return IdSet._from_sorted(_union(self._buf, _as_id_set(other)._buf))
+
+    def intersection(self, other: Iterable[Union[UUID, str]]) -> "IdSet":
+        """Return the ids in both sets."""
+        return IdSet._from_sorted(_intersection(self._buf, _as_id_set(other)._buf))
+
+    def difference(self, other: Iterable[Union[UUID, str]]) -> "IdSet":
+        """Return the ids of this set that are not in ``other``."""
+        return IdSet._from_sorted(_difference(self._buf, _as_id_set(other)._buf))
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def __reduce__(self):
+        return (IdSet._from_sorted, (self._buf,))
+
+
+def _as_id_set(values: Iterable[Union[UUID, str]]) -> IdSet:
+    return values if isinstance(values, IdSet) else IdSet(values)
+
+
+def _bisect(data: bytes, needle: bytes) -> int:
+    """Index of the first 16-byte record of sorted ``data`` not less than ``needle``."""
+    low, high = 0, len(data) // UUID_SIZE
+    while low < high:
+        middle = (low + high) // 2
+        if data[middle * UUID_SIZE : (middle + 1) * UUID_SIZE] < needle:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _records(data: Union[bytes, memoryview]) -> list[bytes]:
+    data = bytes(data)
+    return [data[offset : offset + UUID_SIZE] for offset in range(0, len(data), UUID_SIZE)]
+
+
+@lru_cache(maxsize=None)
+def _uuid_list_validator() -> SchemaValidator:
+    return SchemaValidator(core_schema.list_schema(core_schema.uuid_schema()))
+
+
+def _uuid_list(data: Union[bytes, memoryview]) -> list[UUID]:
+    # pydantic-core builds UUIDs from 16-byte values about twice as fast as `UUID(bytes=...)`.
+    return _uuid_list_validator().validate_python(_records(data))
+
+
+def _u128(data: Union[bytes, memoryview]) -> "np.ndarray":
+    return np.frombuffer(data, dtype=[("hi", ">u8"), ("lo", ">u8")])
+
+
+def _halves(data: Union[bytes, memoryview]) -> tuple["np.ndarray", "np.ndarray"]:
+    # Big-endian 64-bit halves, in native order so numpy sorts and searches them fast.
+    words = np.frombuffer(data, dtype=">u8")
+    return words[0::2].astype(np.uint64), words[1::2].astype(np.uint64)
+
+
+def _sort_order(hi: "np.ndarray", lo: "np.ndarray") -> "np.ndarray":
+    """Indices sorting ids by (hi, lo); a stable sort on ``hi`` alone when it decides."""
+    order = np.argsort(hi, kind="stable")  # linear on already sorted runs
+    hi_sorted, lo_sorted = hi[order], lo[order]
+    if np.any((hi_sorted[1:] == hi_sorted[:-1]) & (lo_sorted[1:] != lo_sorted[:-1])):
+        order = np.lexsort((lo, hi))
+    return order
+
+
+def _member_mask(a: bytes, b: bytes) -> "np.ndarray":
+    """For sorted unique ``a`` and ``b``, whether each id of ``a`` is in ``b``."""
+    a_hi, a_lo = _halves(a)
+    b_hi, b_lo = _halves(b)
+    left = np.searchsorted(b_hi, a_hi, "left")
+    right = np.searchsorted(b_hi, a_hi, "right")
+    count = right - left
+    mask = np.zeros(len(a_hi), dtype=bool)
+    single = count == 1
+    mask[single] = b_lo[left[single]] == a_lo[single]
+    shared = np.flatnonzero(count > 1)  # several ids of b share these high halves
+    if len(shared):
+        # Binary search of the low halves, sorted within each run of b, for all of them at once.
+        target, end = a_lo[shared], right[shared]
+        low, high = left[shared], end.copy()
+        while True:
+            active = low < high
+            if not active.any():
+                break
+            middle = (low + high) // 2
+            below = active & (b_lo[np.minimum(middle, len(b_lo) - 1)] < target)
+            low = np.where(below, middle + 1, low)
+            high = np.where(active & ~below, middle, high)
+        found = low < end
+        mask[shared[found]] = b_lo[low[found]] == target[found]
+    return mask
+
+
+def _sorted_unique(buffer: memoryview) -> bytes:
+    if np is not None:
+        hi, lo = _halves(buffer)
+        order = _sort_order(hi, lo)
+        hi, lo = hi[order], lo[order]
+        keep = np.ones(len(order), dtype=bool)
+        keep[1:] = (hi[1:] != hi[:-1]) | (lo[1:] != lo[:-1])
+        return _u128(buffer)[order[keep]].tobytes()
+    return b"".join(sorted(set(_records(buffer))))
+
+
+def _union(a: bytes, b: bytes) -> bytes:
+    if np is not None:
+        merged = a + _u128(b)[~_member_mask(b, a)].tobytes()
+        return _u128(merged)[_sort_order(*_halves(merged))].tobytes()
+    return b"".join(sorted(set(_records(a)).union(_records(b))))
+
+
+def _intersection(a: bytes, b: bytes) -> bytes:
+    if np is not None:
+        return _u128(a)[_member_mask(a, b)].tobytes()
+    other = set(_records(b))
+    return b"".join(record for record in _records(a) if record in other)
+
+
+def _difference(a: bytes, b: bytes) -> bytes:
+    if np is not None:
+        return _u128(a)[~_member_mask(a, b)].tobytes()
+    other = set(_records(b))
+    return b"".join(record for record in _records(a) if record not in other)
+
+
+def dedupe(values: Union[list[UUID], UUIDArray, LazyUUIDs], order: str = "first"):
+    """
+    Drop repeated ids, keeping the container type.
+
+    Args:
+        values: A ``list[UUID]``, `UUIDArray` or `LazyUUIDs`
+        order: ``"first"`` keeps the first occurrence of each id in input
+            order, ``"sorted"`` returns the ids in ascending 128-bit order
+
+    Returns:
+        A new container of the same type without duplicates.
+    """
+    if order not in ("first", "sorted"):
+        raise ValueError("order must be 'first' or 'sorted'")
+    if isinstance(values, UUIDArray):
+        if order == "sorted":
+            return values.id_set().to_array()
+        return UUIDArray(_first_unique(values.buffer))
+    if isinstance(values, LazyUUIDs):
+        # Canonical strings compare like the ids, so they serve as keys and sort keys.
+        keys = [raw if _is_canonical(raw) else str(_as_uuid(raw)) for raw in values._raw]
+        unique = dict(zip(keys, values._raw))  # first position of each id, one of its spellings
+        if order == "sorted":
+            return LazyUUIDs([unique[key] for key in sorted(unique)])
+        return LazyUUIDs(list(unique.values()))
+    unique = list(dict.fromkeys(values))
+    return sorted(unique, key=attrgetter("int")) if order == "sorted" else unique
+
+
+def _first_unique(buffer: memoryview) -> bytes:
+    if np is not None:
+        hi, lo = _halves(buffer)
+        order = _sort_order(hi, lo)  # stable, so each run starts with its first occurrence
+        hi_sorted, lo_sorted = hi[order], lo[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (hi_sorted[1:] != hi_sorted[:-1]) | (lo_sorted[1:] != lo_sorted[:-1])
+        return _u128(buffer)[np.sort(order[first])].tobytes()
+    return b"".join(dict.fromkeys(_records(buffer)))
+
+
+def _as_uuid(value: Union[UUID, str]) -> UUID:
+    return value if isinstance(value, UUID) else UUID(value)
+
+
+def _is_canonical(value: Union[UUID, str]) -> bool:
+    # The only form of `UUID_PATTERN` with 36 chars is the hyphenated one; it
+    # is canonical if it is also lowercase.
+    return isinstance(value, str) and len(value) == 36 and value == value.lower()
@@ -0,0 +1,350 @@
+"""Validation of openflow step arguments straight from raw JSON."""
+
+import functools
+import inspect
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Literal, Optional, Union, get_type_hints
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model
+
+from tektome.instrumentation import _execution_id
+
+
+class StepInputs:
+    """
+    Validator for the parameters of one step function.
+
+    Parameters become fields of a generated model, so a whole JSON payload is
+    validated by a single pydantic-core pass without intermediate dicts.
+    """
+
+    def __init__(self, signature: inspect.Signature, name: str = "Step", *, strict: bool = False):
+        fields = {}
+        self._names = []
+        # Parameters annotated with a model class, whose instances need no validation.
+        self._instances = {}
+        for param in signature.parameters.values():
+            if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                raise TypeError(f"parameter '{param.name}': *args and **kwargs are not supported")
+            annotation = Any if param.annotation is param.empty else param.annotation
+            if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+                self._instances[param.name] = annotation
+            default = ... if param.default is param.empty else param.default
+            field_name = param.name
+            if hasattr(BaseModel, field_name) or field_name.startswith("_"):
+                # Names clashing with BaseModel attributes are stored under a neutral one.
+                field_name = f"arg{len(fields)}"
+            fields[field_name] = (annotation, Field(default, alias=param.name))
+            self._names.append((field_name, param.name))
+        self._required = {param.name for param in signature.parameters.values() if param.default is param.empty}
+        self.model = create_model(f"{name}Inputs", __config__=ConfigDict(extra="forbid", strict=strict), **fields)
+
+    def validate_json(self, raw: Union[str, bytes, bytearray]) -> dict[str, Any]:
+        """Validate a JSON object of arguments and return them as keyword arguments."""
+        return self._arguments(self.model.model_validate_json(raw))
+
+    def validate_python(self, data: Any) -> dict[str, Any]:
+        """Validate a mapping of arguments and return them as keyword arguments."""
+        return self._arguments(self.model.model_validate(data))
+
+    def validate_arguments(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """
+        Validate keyword arguments, returning them as is when there is nothing to do.
+
+        Arguments are passed through without validation when every one of
+        them is an instance of the model class its parameter is annotated
+        with; otherwise they are validated like `validate_python`.
+        """
+        instances = self._instances
+        for name, value in arguments.items():
+            annotation = instances.get(name)
+            # Cheaper than isinstance, which goes through pydantic's metaclass.
+            if annotation is None or annotation not in type(value).__mro__:
+                return self.validate_python(arguments)
+        if self._required <= arguments.keys():
+            return arguments
+        return self.validate_python(arguments)
+
+    def _arguments(self, inputs: BaseModel) -> dict[str, Any]:
+        values = inputs.__dict__
+        return {param: values[field] for field, param in self._names}
+
+
+@lru_cache(maxsize=None)
+def _inputs_for_signature(signature: inspect.Signature, name: str) -> StepInputs:
+    return StepInputs(signature, name)
+
+
+def _resolved_signature(func: Callable) -> inspect.Signature:
+    signature = inspect.signature(func)
+    try:
+        hints = get_type_hints(func, include_extras=True)
+    except TypeError:
+        hints = {}
+    return signature.replace(
+        parameters=[
+            param.replace(annotation=hints.get(param.name, param.annotation))
+            for param in signature.parameters.values()
+        ],
+        return_annotation=hints.get("return", signature.return_annotation),
+    )
+
+
+@lru_cache(maxsize=None)
+def _inputs_for_function(func: Callable, strict: bool = False) -> StepInputs:
+    return StepInputs(_resolved_signature(func), getattr(func, "__name__", "Step"), strict=strict)
+
+
+def step_inputs(signature_or_func: Union[inspect.Signature, Callable]) -> StepInputs:
+    """
+    Return the cached `StepInputs` validator for a step function or signature.
+
+    Args:
+        signature_or_func: The step function, or its `inspect.Signature`
+
+    Returns:
+        The validator built on first use for that function or signature.
+    """
+    if isinstance(signature_or_func, inspect.Signature):
+        return _inputs_for_signature(signature_or_func, "Step")
+    return _inputs_for_function(signature_or_func, False)
+
+
+def load_inputs(
+    raw: Union[str, bytes, bytearray], signature_or_func: Union[inspect.Signature, Callable]
+) -> dict[str, Any]:
+    """
+    Validate a step's raw JSON arguments in a single pass.
+
+    Args:
+        raw: JSON object mapping parameter names to values
+        signature_or_func: The step function, or its `inspect.Signature`
+
+    Returns:
+        Validated keyword arguments, ready for ``func(**kwargs)``.
+
+    Raises:
+        ValidationError: If an argument is missing, unexpected or invalid.
+
+    Example:
+        ```python
+        def main(ctx: Context, r: Resource): ...
+
+        main(**load_inputs(raw, main))
+        ```
+    """
+    return step_inputs(signature_or_func).validate_json(raw)
+
+
+@dataclass(frozen=True)
+class StepTimings:
+    """
+    Seconds spent in each phase of one call of a `step` function.
+
+    Attributes:
+        function: Qualified name of the step function
+        validate: Validating the arguments
+        run: Running the function, awaiting it for coroutine functions
+        serialize: Dumping the result to JSON, 0 unless ``output="json"``
+        execution_id: Execution id of the `Context` argument, if any
+    """
+
+    function: str
+    validate: float
+    run: float
+    serialize: float
+    execution_id: Optional[UUID]
+
+
+def step(
+    func: Optional[Callable] = None,
+    *,
+    strict: bool = False,
+    output: Literal["python", "json"] = "python",
+    timings: Optional[Callable[[StepTimings], None]] = None,
+) -> Callable:
+    """
+    Validate the arguments of a step function, in place of pydantic's ``@validate_call``.
+
+    The validator is built once, when the function is decorated. Calls whose
+    arguments are all instances of their annotated model classes skip
+    validation entirely. Raw inputs are validated in a single pass with
+    ``func.call_json(raw)`` and ``func.call_python(data)``. Coroutine
+    functions are supported. A `Context` argument scopes the run to its
+    execution for `tektome.instrumentation`.
+
+    Args:
+        func: The step function; omit it to pass options (``@step(strict=True)``)
+        strict: Validate arguments in pydantic strict mode
+        output: ``"json"`` to dump the result to JSON bytes, using the return
+            annotation
+        timings: Called with the `StepTimings` of every call
+
+    Returns:
+        The wrapped function.
+
+    Raises:
+        TypeError: If the function has positional-only, ``*args`` or
+            ``**kwargs`` parameters.
+        ValueError: If ``output`` is not ``"python"`` or ``"json"``.
+
+    Example:
+        ```python
+        @step
+        def main(ctx: Context, r: Resource):
+            ...
+
+        main(ctx, r)               # instances: no validation
+        main.call_json(raw_bytes)  # raw arguments
+        ```
+    """
+    if func is None:
+        return lambda func: step(func, strict=strict, output=output, timings=timings)
+    if output not in ("python", "json"):
+        raise ValueError("output must be 'python' or 'json'")
+
+    signature = _resolved_signature(func)
+    params = list(signature.parameters.values())
+    for param in params:
+        if param.kind is param.POSITIONAL_ONLY:
+            raise TypeError(f"parameter '{param.name}': positional-only parameters are not supported")
+    from tektome.schema import Context
+
+    inputs = _inputs_for_function(func, strict)
+    name = func.__qualname__
+    names = [param.name for param in params if param.kind is param.POSITIONAL_OR_KEYWORD]
+    models = [inputs._instances.get(param) for param in names]
+    required = [i for i, param in enumerate(params) if param.default is param.empty]
+    # Fewest positional arguments covering the required parameters, None if one is keyword-only.
+    fewest = (required[-1] + 1 if required else 0) if all(i < len(names) for i in required) else None
+    context = next((param for param, model in inputs._instances.items() if issubclass(model, Context)), None)
+    returns = signature.return_annotation
+    dump = TypeAdapter(Any if returns is signature.empty else returns).dump_json if output == "json" else None
+
+    def bind(args: tuple, kwargs: dict[str, Any]) -> dict[str, Any]:
+        if len(args) > len(names):
+            raise TypeError(f"{name}() takes {len(names)} positional arguments but {len(args)} were given")
+        arguments = dict(zip(names, args))
+        for param in kwargs:
+            if param in arguments:
+                raise TypeError(f"{name}() got multiple values for argument '{param}'")
+        arguments.update(kwargs)
+        return arguments
+
+    context_index = names.index(context) if context in names else None
+
+    def passthrough(args: tuple, kwargs: dict[str, Any]) -> bool:
+        # Every argument given positionally, each an instance of exactly its model class.
+        if kwargs or fewest is None or not fewest <= len(args) <= len(models) or timings or dump:
+            return False
+        for value, model in zip(args, models):
+            if type(value) is not model:
+                return False
+        return True
+
+    def arguments_of(args: tuple, kwargs: dict[str, Any]) -> dict[str, Any]:
+        return inputs.validate_arguments(bind(args, kwargs) if args else kwargs)
+
+    def execution_id(arguments: dict[str, Any]) -> Optional[UUID]:
+        ctx = arguments.get(context) if context is not None else None
+        return None if ctx is None else ctx.execution_id
+
+    if inspect.iscoroutinefunction(func):
+
+        async def run(arguments: dict[str, Any]) -> Any:
+            scope = execution_id(arguments)
+            if scope is None:
+                return await func(**arguments)
+            token = _execution_id.set(scope)
+            try:
+                return await func(**arguments)
+            finally:
+                _execution_id.reset(token)
+
+        async def call(validate: Callable[..., dict[str, Any]], *payload: Any) -> Any:
+            if timings is None:
+                result = await run(validate(*payload))
+                return result if dump is None else dump(result)
+            start = time.perf_counter()
+            arguments = validate(*payload)
+            validated = time.perf_counter()
+            result = await run(arguments)
+            ran = time.perf_counter()
+            if dump is not None:
+                result = dump(result)
+            end = time.perf_counter()
+            timings(StepTimings(name, validated - start, ran - validated, end - ran, execution_id(arguments)))
+            return result
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if passthrough(args, kwargs):
+                if context_index is None or context_index >= len(args):
+                    return await func(*args)
+                token = _execution_id.set(args[context_index].execution_id)
+                try:
+                    return await func(*args)
+                finally:
+                    _execution_id.reset(token)
+            return await call(arguments_of, args, kwargs)
+
+        async def call_json(raw: Union[str, bytes, bytearray]) -> Any:
+            return await call(inputs.validate_json, raw)
+
+        async def call_python(data: Any) -> Any:
+            return await call(inputs.validate_python, data)
+
+    else:
+
+        def run(arguments: dict[str, Any]) -> Any:
+            scope = execution_id(arguments)
+            if scope is None:
+                return func(**arguments)
+            token = _execution_id.set(scope)
+            try:
+                return func(**arguments)
+            finally:
+                _execution_id.reset(token)
+
+        def call(validate: Callable[..., dict[str, Any]], *payload: Any) -> Any:
+            if timings is None:
+                result = run(validate(*payload))
+                return result if dump is None else dump(result)
+            start = time.perf_counter()
+            arguments = validate(*payload)
+            validated = time.perf_counter()
+            result = run(arguments)
+            ran = time.perf_counter()
+            if dump is not None:
+                result = dump(result)
+            end = time.perf_counter()
+            timings(StepTimings(name, validated - start, ran - validated, end - ran, execution_id(arguments)))
+            return result
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if passthrough(args, kwargs):
+                if context_index is None or context_index >= len(args):
+                    return func(*args)
+                token = _execution_id.set(args[context_index].execution_id)
+                try:
+                    return func(*args)
+                finally:
+                    _execution_id.reset(token)
+            return call(arguments_of, args, kwargs)
+
+        def call_json(raw: Union[str, bytes, bytearray]) -> Any:
+            return call(inputs.validate_json, raw)
+
+        def call_python(data: Any) -> Any:
+            return call(inputs.validate_python, data)
+
+    call_json.__doc__ = "Call the step with a JSON object of arguments, validated in a single pass."
+    call_python.__doc__ = "Call the step with a mapping of arguments."
+    wrapper.call_json = call_json
+    wrapper.call_python = call_python
+    wrapper.inputs = inputs
+    return wrapper
@@ -0,0 +1,328 @@
+"""Validation timing and failure reporting for every `BaseSchema` subclass."""
+
+import bisect
+import json
+import threading
+import time
+import warnings
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
+from uuid import UUID
+
+from pydantic import BaseModel, ValidationError
+
+if TYPE_CHECKING:
+    from tektome.schema import Context
+
+Hook = Callable[["ValidationEvent"], None]
+
+_hooks: tuple[Hook, ...] = ()
+_lock = threading.Lock()
+_execution_id: ContextVar[Optional[UUID]] = ContextVar("tektome_execution_id", default=None)
+
+
+@dataclass(frozen=True)
+class ValidationEvent:
+    """
+    One validation of a schema class, reported to every registered hook.
+
+    Attributes:
+        model: Name of the validated class (``"TektomeValue"`` when
+            `parse_value` failed before a class was picked)
+        operation: ``"init"``, ``"validate"``, ``"validate_json"``,
+            ``"validate_strings"``, ``"validate_many"`` or ``"parse_value"``
+        seconds: Wall time spent validating
+        count: Number of payloads validated, more than 1 for `validate_many`
+        input_bytes: Length of the JSON input, ``None`` for Python input
+        errors: Error type of each validation error (e.g. ``"uuid_parsing"``),
+            empty when validation succeeded
+        execution_id: Execution set with `execution` when the event happened
+    """
+
+    model: str
+    operation: str
+    seconds: float
+    count: int
+    input_bytes: Optional[int]
+    errors: tuple[str, ...]
+    execution_id: Optional[UUID]
+
+    @property
+    def ok(self) -> bool:
+        """Whether validation succeeded."""
+        return not self.errors
+
+
+def register_hook(hook: Hook) -> Callable[[], None]:
+    """
+    Call ``hook`` with a `ValidationEvent` after each validation of a schema class.
+
+    Constructing a model, ``model_validate``, ``model_validate_json``,
+    ``model_validate_strings``, `BaseSchema.validate_many` and
+    `tektome.parse_value` are reported. Timing wrappers are only installed
+    while at least one hook is registered, so validation has no overhead
+    otherwise. Exceptions raised by a hook are turned into warnings.
+
+    Returns:
+        A function unregistering the hook.
+    """
+    global _hooks
+    with _lock:
+        if not _hooks:
+            _install()
+        _hooks = (*_hooks, hook)
+    return lambda: unregister_hook(hook)
+
+
+def unregister_hook(hook: Hook) -> None:
+    """Stop calling ``hook``; does nothing if it is not registered."""
+    global _hooks
+    with _lock:
+        if hook not in _hooks:
+            return
+        hooks = list(_hooks)
+        hooks.remove(hook)
+        _hooks = tuple(hooks)
+        if not _hooks:
+            _uninstall()
+
+
+class execution:
+    """
+    Attribute the validations made inside a ``with`` block to an execution.
+
+    Args:
+        ctx: The step's `Context`, or its execution id
+    """
+
+    __slots__ = ("_execution_id", "_token")
+
+    def __init__(self, ctx: Union["Context", UUID]):
+        self._execution_id = ctx if isinstance(ctx, UUID) else ctx.execution_id
+
+    def __enter__(self) -> None:
+        self._token = _execution_id.set(self._execution_id)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _execution_id.reset(self._token)
+
+
+def _emit(model: str, operation: str, start: float, count: int, input_bytes: Optional[int], errors: tuple) -> None:
+    event = ValidationEvent(
+        model, operation, time.perf_counter() - start, count, input_bytes, errors, _execution_id.get()
+    )
+    for hook in _hooks:
+        try:
+            hook(event)
+        except Exception as exc:
+            warnings.warn(f"validation hook {hook!r} failed: {exc!r}", RuntimeWarning, stacklevel=2)
+
+
+def _error_types(exc: ValidationError) -> tuple[str, ...]:
+    return tuple(error["type"] for error in exc.errors(include_url=False, include_context=False, include_input=False))
+
+
+def _json_length(data: Any) -> Optional[int]:
+    return len(data) if isinstance(data, (str, bytes, bytearray)) else None
+
+
+def _timed(operation: str, validate: Callable, input_bytes: Callable[[Any], Optional[int]] = lambda data: None):
+    # Wraps a classmethod-style ``validate(cls, data, ...)``.
+    def wrapper(cls, data, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = validate(cls, data, *args, **kwargs)
+        except ValidationError as exc:
+            _emit(cls.__name__, operation, start, 1, input_bytes(data), _error_types(exc))
+            raise
+        _emit(cls.__name__, operation, start, 1, input_bytes(data), ())
+        return result
+
+    return classmethod(wrapper)
+
+
+def _timed_init(self, /, **data) -> None:
+    start = time.perf_counter()
+    try:
+        BaseModel.__init__(self, **data)
+    except ValidationError as exc:
+        _emit(type(self).__name__, "init", start, 1, None, _error_types(exc))
+        raise
+    _emit(type(self).__name__, "init", start, 1, None, ())
+
+
+# Keeps pydantic from treating models created while hooks are registered as having a custom __init__.
+_timed_init.__pydantic_base_init__ = True
+
+
+def _timed_validate_many(validate_many: Callable):
+    def wrapper(cls, items, *, errors="raise"):
+        if not isinstance(items, (list, tuple)):
+            items = list(items)
+        start = time.perf_counter()
+        try:
+            result = validate_many(cls, items, errors=errors)
+        except ValidationError as exc:
+            _emit(cls.__name__, "validate_many", start, len(items), None, _error_types(exc))
+            raise
+        failed = () if errors == "raise" else tuple(e["type"] for item in result.errors.values() for e in item)
+        _emit(cls.__name__, "validate_many", start, len(items), None, failed)
+        return result
+
+    return classmethod(wrapper)
+
+
+class _TimedAdapter:
+    """Stand-in for the `parse_value` adapter reporting each validation."""
+
+    def __init__(self, adapter):
+        self._adapter = adapter
+
+    def _validate(self, validate: Callable, payload: Any, input_bytes: Optional[int]):
+        start = time.perf_counter()
+        try:
+            value = validate(payload)
+        except ValidationError as exc:
+            _emit("TektomeValue", "parse_value", start, 1, input_bytes, _error_types(exc))
+            raise
+        _emit(type(value).__name__, "parse_value", start, 1, input_bytes, ())
+        return value
+
+    def validate_python(self, payload: Any):
+        return self._validate(self._adapter.validate_python, payload, None)
+
+    def validate_json(self, payload: Union[str, bytes, bytearray]):
+        return self._validate(self._adapter.validate_json, payload, len(payload))
+
+
+_originals: dict[str, Any] = {}
+
+
+def _install() -> None:
+    from tektome import schema
+
+    base = schema.BaseSchema
+    _originals.update(validate_many=base.__dict__["validate_many"], value_adapter=schema._value_adapter)
+    base.__init__ = _timed_init
+    base.model_validate = _timed("validate", BaseModel.model_validate.__func__)
+    base.model_validate_json = _timed("validate_json", BaseModel.model_validate_json.__func__, _json_length)
+    base.model_validate_strings = _timed("validate_strings", BaseModel.model_validate_strings.__func__)
+    base.validate_many = _timed_validate_many(_originals["validate_many"].__func__)
+    adapter = _TimedAdapter(_originals["value_adapter"]())
+    schema._value_adapter = lambda: adapter
+
+
+def _uninstall() -> None:
+    from tektome import schema
+
+    base = schema.BaseSchema
+    del base.__init__, base.model_validate, base.model_validate_json, base.model_validate_strings
+    base.validate_many = _originals.pop("validate_many")
+    schema._value_adapter = _originals.pop("value_adapter")
+
+
+DEFAULT_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0)
+"""Upper bounds in seconds of the latency histogram buckets of `Aggregator`."""
+
+
+class _ModelStats:
+    __slots__ = ("count", "failures", "seconds", "max_seconds", "input_bytes", "histogram", "operations", "errors")
+
+    def __init__(self, buckets: int):
+        self.count = self.failures = self.input_bytes = 0
+        self.seconds = self.max_seconds = 0.0
+        self.histogram = [0] * (buckets + 1)
+        self.operations: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+
+
+class Aggregator:
+    """
+    In-memory statistics of validation events, per execution and model.
+
+    Register it as a hook and dump the statistics of an execution at its end:
+
+    ```python
+    register_hook(default_aggregator)
+    with execution(ctx):
+        ...
+    print(default_aggregator.dump_json(ctx.execution_id))
+    ```
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._stats: dict[Optional[UUID], dict[str, _ModelStats]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: ValidationEvent) -> None:
+        with self._lock:
+            models = self._stats.setdefault(event.execution_id, {})
+            stats = models.get(event.model)
+            if stats is None:
+                stats = models[event.model] = _ModelStats(len(self.buckets))
+            stats.count += event.count
+            stats.failures += not event.ok
+            stats.seconds += event.seconds
+            stats.max_seconds = max(stats.max_seconds, event.seconds)
+            stats.input_bytes += event.input_bytes or 0
+            stats.histogram[bisect.bisect_left(self.buckets, event.seconds)] += 1
+            stats.operations[event.operation] = stats.operations.get(event.operation, 0) + 1
+            for error in event.errors:
+                stats.errors[error] = stats.errors.get(error, 0) + 1
+
+    def executions(self) -> list[Optional[UUID]]:
+        """Return the execution ids seen so far, ``None`` for events outside `execution`."""
+        with self._lock:
+            return list(self._stats)
+
+    def stats(self, execution_id: Optional[UUID] = None) -> dict[str, Any]:
+        """
+        Return the statistics of one execution as JSON-compatible data.
+
+        Each model has its number of validated payloads (``count``), failed
+        validations, total and maximum seconds, JSON input bytes, validations
+        per operation, error types with their number of occurrences and a
+        latency histogram: ``counts[i]`` validations took at most
+        ``buckets[i]`` seconds (and more than the previous bound), the last
+        count being for slower ones.
+        """
+        with self._lock:
+            models = {
+                name: {
+                    "count": stats.count,
+                    "failures": stats.failures,
+                    "seconds": stats.seconds,
+                    "max_seconds": stats.max_seconds,
+                    "input_bytes": stats.input_bytes,
+                    "operations": dict(stats.operations),
+                    "errors": dict(stats.errors),
+                    "histogram": {"buckets": list(self.buckets), "counts": list(stats.histogram)},
+                }
+                for name, stats in self._stats.get(execution_id, {}).items()
+            }
+        return {"execution_id": None if execution_id is None else str(execution_id), "models": models}
+
+    def dump_json(self, execution_id: Optional[UUID] = None, *, clear: bool = False, **kwargs: Any) -> str:
+        """
+        Return `stats` of one execution as a JSON string.
+
+        Args:
+            execution_id: The execution's `Context.execution_id`
+            clear: Drop the execution's statistics afterwards
+            **kwargs: Passed to `json.dumps`
+        """
+        dumped = json.dumps(self.stats(execution_id), **kwargs)
+        if clear:
+            self.clear(execution_id)
+        return dumped
+
+    def clear(self, execution_id: Optional[UUID] = None) -> None:
+        """Drop the statistics of one execution."""
+        with self._lock:
+            self._stats.pop(execution_id, None)
+
+
+default_aggregator = Aggregator()
+"""Aggregator for the process; not registered until passed to `register_hook`."""
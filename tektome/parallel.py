@@ -0,0 +1,148 @@
+"""Validation of very large id collections across several processes or threads."""
+
+import math
+import os
+import sys
+import warnings
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Optional, Union, get_args
+from uuid import UUID
+
+from pydantic import ValidationError
+from pydantic_core import InitErrorDetails, PydanticCustomError, core_schema, from_json
+
+from tektome.ids import UUIDArray, _uuid_list_validator
+
+if TYPE_CHECKING:
+    from tektome.schema import IdCollection
+
+CHUNKS_PER_WORKER = 4
+"""Default number of chunks per worker, so that slower chunks even out."""
+
+MIN_ID_JSON_BYTES = 34
+"""Fewest bytes an id takes in a JSON array: 32 hex digits, quotes and a comma."""
+
+_KNOWN_ERROR_TYPES = frozenset(get_args(core_schema.ErrorType))
+
+
+def free_threaded() -> bool:
+    """Whether the interpreter runs without the GIL, so that threads validate in parallel."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _validate_chunk(values: list, pack: bool) -> tuple[Union[bytes, list[UUID], None], list[dict[str, Any]]]:
+    # Runs in the workers; packing also spares processes from pickling UUIDs back.
+    try:
+        ids = _uuid_list_validator().validate_python(values)
+    except ValidationError as exc:
+        return None, exc.errors(include_url=False)
+    return (b"".join([value.bytes for value in ids]) if pack else ids), []
+
+
+def _details(error: dict[str, Any], loc: tuple) -> InitErrorDetails:
+    # Rebuilds an error of ``ValidationError.errors()``, as when validating serially.
+    ctx = error.get("ctx")
+    if error["type"] in _KNOWN_ERROR_TYPES:
+        details: InitErrorDetails = {"type": error["type"], "loc": loc, "input": error["input"]}
+        if ctx is not None:
+            details["ctx"] = ctx
+        return details
+    return {"type": PydanticCustomError(error["type"], error["msg"], ctx), "loc": loc, "input": error["input"]}
+
+
+def _plan(model: type["IdCollection"], workers: Optional[int], executor: Union[str, Executor, None]):
+    # Returns the worker count and executor, or the reason why validating in this process is as fast.
+    if executor is None:
+        executor = "thread" if free_threaded() else "process"
+    if executor not in ("thread", "process") and not isinstance(executor, Executor):
+        raise ValueError("executor must be 'thread', 'process' or an Executor")
+    workers = workers or os.cpu_count() or 1
+    processes = executor == "process" or isinstance(executor, ProcessPoolExecutor)
+    if workers < 2:
+        return "a single worker is available"
+    if model.ids_storage == "lazy":
+        return "the 'lazy' storage only checks the format of the ids"
+    if processes and model.ids_storage != "compact":
+        # Building UUIDs again from what the workers send back would cost as much as validating.
+        return (
+            f"worker processes only speed up the 'compact' storage, not {model.ids_storage!r}; "
+            "use storage='compact', or threads on a free-threaded build"
+        )
+    return workers, executor, processes
+
+
+def parallelizable(model: type["IdCollection"]) -> bool:
+    """Whether `validate_parallel` with default options can speed up validating ``model``."""
+    return not isinstance(_plan(model, None, None), str)
+
+
+def _warn_serial(model: type["IdCollection"], stacklevel: int = 1) -> None:
+    # Used by the parallel_threshold checks, which already know that no plan applies.
+    _warn(model, _plan(model, None, None), stacklevel + 1)
+
+
+def _warn(model: type["IdCollection"], reason: str, stacklevel: int) -> None:
+    warnings.warn(
+        f"{model.__name__} ids are validated in this process: {reason}", RuntimeWarning, stacklevel=stacklevel + 1
+    )
+
+
+def validate_parallel(
+    model: type["IdCollection"],
+    data: Any,
+    *,
+    workers: Optional[int] = None,
+    executor: Union[str, Executor, None] = None,
+    chunk_size: Optional[int] = None,
+) -> "IdCollection":
+    """
+    Validate a collection payload, checking chunks of `ids` in parallel.
+
+    See `IdCollection.validate_parallel`.
+    """
+    from tektome.schema import IdCollection
+
+    base = super(IdCollection, model)
+    plan = _plan(model, workers, executor)
+    is_json = isinstance(data, (str, bytes, bytearray))
+    if isinstance(plan, str):
+        _warn(model, plan, stacklevel=3)  # the caller of IdCollection.validate_parallel
+        return base.model_validate_json(data) if is_json else base.model_validate(data)
+    workers, executor, processes = plan
+    if is_json:
+        try:
+            data = from_json(data)
+        except ValueError:
+            return base.model_validate_json(data)  # raises the pydantic error
+    ids = data.get("ids") if isinstance(data, dict) else None
+    if not isinstance(ids, (list, tuple)) or len(ids) < 2:
+        return base.model_validate(data)
+
+    pack = model.ids_storage == "compact"
+    size = chunk_size or math.ceil(len(ids) / (workers * CHUNKS_PER_WORKER))
+    offsets = range(0, len(ids), size)
+    chunks = [ids[offset : offset + size] for offset in offsets]
+    if isinstance(executor, Executor):
+        results = list(executor.map(_validate_chunk, chunks, [pack] * len(chunks)))
+    else:
+        pool_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with pool_class(max_workers=min(workers, len(chunks))) as pool:
+            results = list(pool.map(_validate_chunk, chunks, [pack] * len(chunks)))
+
+    errors = [
+        _details(error, ("ids", error["loc"][0] + offset, *error["loc"][1:]))
+        for offset, (_, chunk_errors) in zip(offsets, results)
+        for error in chunk_errors
+    ]
+    if errors:
+        try:
+            base.model_validate({**data, "ids": []})
+        except ValidationError as exc:
+            errors += [_details(error, error["loc"]) for error in exc.errors(include_url=False)]
+        raise ValidationError.from_exception_data(model.__name__, errors)
+    if pack:
+        validated = UUIDArray(b"".join([part for part, _ in results]))
+    else:
+        validated = [value for part, _ in results for value in part]
+    return base.model_validate({**data, "ids": validated})
@@ -0,0 +1,272 @@
+"""Per-tenant HTTP clients and caches, bounded for workers serving many tenants."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional
+
+from tektome.cache import ResponseCache
+from tektome.client import ClientPool
+
+if TYPE_CHECKING:
+    import httpx
+
+    from tektome.schema import Context
+
+TenantKey = tuple[str, str]
+"""``(base_url, user_api_key)`` of a tenant."""
+
+
+@dataclass(frozen=True)
+class RegistryStats:
+    """
+    Snapshot of a registry's counters.
+
+    Attributes:
+        tenants: Tenants currently held
+        connected: Tenants currently holding HTTP clients
+        clients: HTTP clients, sync and async, held by those tenants
+        evictions: Tenants dropped to respect ``max_tenants``
+        expirations: Tenants dropped after ``idle_ttl`` seconds without use
+        disconnections: Clients closed to respect ``max_connections``
+    """
+
+    tenants: int
+    connected: int
+    clients: int
+    evictions: int
+    expirations: int
+    disconnections: int
+
+
+class Tenant:
+    """
+    Clients and cache shared by every execution of one ``(base_url, user_api_key)``.
+
+    Attributes:
+        base_url: Deployment base url
+        user_api_key: API key of the tenant
+        pool: `ClientPool` holding the tenant's clients
+        cache: `ResponseCache` of the tenant's fetches
+    """
+
+    __slots__ = ("base_url", "user_api_key", "pool", "cache", "last_used")
+
+    def __init__(self, base_url: str, user_api_key: str, pool: ClientPool, cache: ResponseCache, now: float):
+        self.base_url = base_url
+        self.user_api_key = user_api_key
+        self.pool = pool
+        self.cache = cache
+        self.last_used = now
+
+    def __repr__(self) -> str:
+        return f"Tenant(base_url={self.base_url!r})"
+
+
+class ContextRegistry:
+    """
+    Registry of per-tenant clients and caches, keyed by ``(base_url, user_api_key)``.
+
+    Every `Context` of a tenant, whatever its execution, gets the same
+    `Tenant`: one keep-alive client and one cache, so executions share
+    connections and cached payloads without seeing other tenants' ones.
+    Resource use stays bounded however many tenants pass through the
+    worker: the least recently used tenants beyond ``max_tenants`` and
+    those unused for ``idle_ttl`` seconds are dropped, and clients of least
+    recently used tenants are closed so that at most ``max_connections``
+    connections are open. Every client counts for ``connections_per_tenant``:
+    a tenant's sync client and its async client of each event loop alike.
+    Requests still running on a closed client fail.
+
+    Enable it for `Context.client`, `Context.async_client` and
+    `Context.cache` with `enable`. `Context.disk_cache` stays one database
+    for the process, its entries keyed by tenant like those in memory.
+
+    Attributes:
+        max_tenants: Maximum number of tenants held
+        idle_ttl: Seconds after which an unused tenant is dropped
+        max_connections: Maximum open connections across tenants
+        connections_per_tenant: Maximum open connections of each client of a tenant
+    """
+
+    def __init__(
+        self,
+        *,
+        max_tenants: int = 1_000,
+        idle_ttl: float = 600.0,
+        max_connections: int = 200,
+        connections_per_tenant: int = 4,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        cache_max_entries: int = 1_000,
+        cache_max_bytes: int = 4 * 2**20,
+        cache_ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if connections_per_tenant > max_connections:
+            raise ValueError("connections_per_tenant must not exceed max_connections")
+        self.max_tenants = max_tenants
+        self.idle_ttl = idle_ttl
+        self.max_connections = max_connections
+        self.connections_per_tenant = connections_per_tenant
+        self._pool_options = {"keepalive_expiry": keepalive_expiry, "timeout": timeout}
+        self._cache_options = {"max_entries": cache_max_entries, "max_bytes": cache_max_bytes, "ttl": cache_ttl}
+        self._clock = clock
+        self._tenants: "OrderedDict[TenantKey, Tenant]" = OrderedDict()
+        self._connected: "OrderedDict[TenantKey, Tenant]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._evictions = self._expirations = self._disconnections = 0
+
+    def tenant(self, ctx: "Context") -> Tenant:
+        """
+        Return the tenant of a context, creating it on first use.
+
+        Args:
+            ctx: Context of any execution of the tenant
+        """
+        key = (str(ctx.base_url), ctx.user_api_key)
+        dropped: list[Tenant] = []
+        with self._lock:
+            now = self._clock()
+            self._expire(now, dropped)
+            tenant = self._tenants.get(key)
+            if tenant is None:
+                pool = ClientPool(
+                    max_connections=self.connections_per_tenant,
+                    max_clients=self.max_connections // self.connections_per_tenant,
+                    **self._pool_options,
+                )
+                tenant = self._tenants[key] = Tenant(*key, pool, ResponseCache(**self._cache_options), now)
+                while len(self._tenants) > self.max_tenants:
+                    dropped.append(self._remove(next(iter(self._tenants))))
+                    self._evictions += 1
+            else:
+                self._tenants.move_to_end(key)
+                tenant.last_used = now
+        _close(dropped)
+        return tenant
+
+    def client(self, ctx: "Context") -> "httpx.Client":
+        """Return the keep-alive client of a context's tenant, see `Context.client`."""
+        tenant = self.tenant(ctx)
+        return self._connect(tenant, tenant.pool.get)
+
+    def async_client(self, ctx: "Context") -> "httpx.AsyncClient":
+        """Return the asyncio client of a context's tenant, see `Context.async_client`."""
+        tenant = self.tenant(ctx)
+        return self._connect(tenant, tenant.pool.get_async)
+
+    def cache(self, ctx: "Context") -> ResponseCache:
+        """Return the response cache of a context's tenant."""
+        return self.tenant(ctx).cache
+
+    def _connect(self, tenant: Tenant, get: Callable):
+        key = (tenant.base_url, tenant.user_api_key)
+        held = len(tenant.pool)
+        client = get(tenant.base_url, tenant.user_api_key)
+        disconnected: list[Tenant] = []
+        with self._lock:
+            self._connected[key] = tenant
+            self._connected.move_to_end(key)
+            if len(tenant.pool) > held:  # only a new client can go over the cap
+                clients = sum(len(other.pool) for other in self._connected.values())
+                for other_key, other in list(self._connected.items()):
+                    if clients * self.connections_per_tenant <= self.max_connections or other is tenant:
+                        break
+                    del self._connected[other_key]
+                    clients -= len(other.pool)
+                    disconnected.append(other)
+                    self._disconnections += 1
+        for other in disconnected:
+            other.pool.close()
+        return client
+
+    def _expire(self, now: float, dropped: list) -> None:
+        # Tenants are kept in order of use, so the expired ones come first.
+        while self._tenants:
+            tenant = next(iter(self._tenants.values()))
+            if tenant.last_used + self.idle_ttl > now:
+                break
+            dropped.append(self._remove((tenant.base_url, tenant.user_api_key)))
+            self._expirations += 1
+
+    def _remove(self, key: TenantKey) -> Tenant:
+        self._connected.pop(key, None)
+        return self._tenants.pop(key)
+
+    def evict(self, ctx: "Context") -> None:
+        """Drop a context's tenant, closing its clients; does nothing if it is not held."""
+        with self._lock:
+            key = (str(ctx.base_url), ctx.user_api_key)
+            dropped = [self._remove(key)] if key in self._tenants else []
+        _close(dropped)
+
+    def close(self) -> None:
+        """Drop every tenant and close its clients. Counters are kept."""
+        with self._lock:
+            dropped = list(self._tenants.values())
+            self._tenants.clear()
+            self._connected.clear()
+        _close(dropped)
+
+    def stats(self) -> RegistryStats:
+        """Return a snapshot of the counters."""
+        with self._lock:
+            return RegistryStats(
+                tenants=len(self._tenants),
+                connected=len(self._connected),
+                clients=sum(len(tenant.pool) for tenant in self._connected.values()),
+                evictions=self._evictions,
+                expirations=self._expirations,
+                disconnections=self._disconnections,
+            )
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def __contains__(self, ctx: "Context") -> bool:
+        return (str(ctx.base_url), ctx.user_api_key) in self._tenants
+
+
+def _close(tenants: list[Tenant]) -> None:
+    # Outside the registry lock: closing waits for the clients' connections.
+    for tenant in tenants:
+        tenant.pool.close()
+        tenant.cache.clear()
+
+
+_default: Optional[ContextRegistry] = None
+
+
+def enable(**limits) -> ContextRegistry:
+    """
+    Route `Context.client`, `Context.async_client` and `Context.cache` through a new registry.
+
+    The previous registry, if any, is closed.
+
+    Args:
+        **limits: Options of `ContextRegistry`
+
+    Returns:
+        The new registry.
+    """
+    global _default
+    registry, previous = ContextRegistry(**limits), _default
+    _default = registry
+    if previous is not None:
+        previous.close()
+    return registry
+
+
+def disable() -> None:
+    """Go back to the process-wide client pool and cache, closing the registry."""
+    global _default
+    previous, _default = _default, None
+    if previous is not None:
+        previous.close()
+
+
+def default_registry() -> Optional[ContextRegistry]:
+    """Return the registry set with `enable`, or ``None`` when disabled (the default)."""
+    return _default
@@ -0,0 +1,112 @@
+"""Hand-off of id collections between processes of one host through shared memory.
+
+A segment holds a 16-byte header (`MAGIC`, then the number of ids as a
+little-endian uint64) followed by the ids, 16 bytes each. The process calling
+`IdCollection.to_shared_memory` owns the segment and unlinks it; other
+processes attach to it by name and read the ids in place.
+"""
+
+import struct
+import sys
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional
+
+from tektome.ids import UUID_SIZE, UUIDArray
+
+MAGIC = b"TKID"
+"""First bytes of every segment: format name."""
+
+_HEADER = struct.Struct("<4s4xQ")
+
+
+class _Segment(SharedMemory):
+    """`SharedMemory` whose mapping may outlive it in views of the ids."""
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except (BufferError, OSError):
+            pass  # the mapping is released with the last view of it
+
+
+class SharedIds:
+    """
+    Ids published in a shared memory segment, owned by the creating process.
+
+    Pass `name` to the workers, which read the ids with
+    `IdCollection.attach_shared_memory`. The owner unlinks the segment when
+    the workers are done, with `unlink` or by using the handle as a context
+    manager:
+
+    ```python
+    with resources.to_shared_memory() as shared:
+        pool.map(work, [shared.name] * 8)
+    ```
+
+    Attached workers keep reading their mapping after the segment is
+    unlinked; only new attachments fail. Before Python 3.13, attaching
+    registers the segment with the resource tracker of the worker, which
+    unlinks it when the worker exits unless that tracker is the owner's:
+    start pools after calling `multiprocessing.resource_tracker.ensure_running`
+    (or after the first `to_shared_memory`) so that workers inherit it.
+
+    Args:
+        ids: The ids to publish
+        name: Name of the segment; ``None`` picks a unique one
+    """
+
+    def __init__(self, ids: UUIDArray, name: Optional[str] = None):
+        size = len(ids) * UUID_SIZE
+        self._segment = SharedMemory(name, create=True, size=_HEADER.size + size)
+        _HEADER.pack_into(self._segment.buf, 0, MAGIC, len(ids))
+        self._segment.buf[_HEADER.size : _HEADER.size + size] = ids.buffer
+        self._count = len(ids)
+
+    @property
+    def name(self) -> str:
+        """Name of the segment, to pass to `attach_ids` in other processes."""
+        return self._segment.name
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """Unmap the segment from this process, keeping it available to others."""
+        self._segment.close()
+
+    def unlink(self) -> None:
+        """Destroy the segment once every process has closed it; call once, from the owner."""
+        self._segment.unlink()
+
+    def __enter__(self) -> "SharedIds":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+        self.unlink()
+
+    def __repr__(self) -> str:
+        return f"SharedIds(name={self.name!r}, ids={self._count})"
+
+
+def attach_ids(name: str) -> UUIDArray:
+    """
+    Return the ids of a segment published with `SharedIds`, without copying them.
+
+    The array is read-only and maps the segment until it, and every view
+    taken from it, is garbage collected.
+
+    Raises:
+        FileNotFoundError: If no segment has that name.
+        ValueError: If the segment does not hold ids.
+    """
+    # Only the owner's resource tracker should unlink the segment; see `SharedIds`.
+    segment = _Segment(name, track=False) if sys.version_info >= (3, 13) else _Segment(name)
+    if segment.size < _HEADER.size:
+        raise ValueError(f"shared memory segment {name!r} does not hold ids")
+    magic, count = _HEADER.unpack_from(segment.buf)
+    if magic != MAGIC or segment.size < _HEADER.size + count * UUID_SIZE:
+        raise ValueError(f"shared memory segment {name!r} does not hold ids")
+    ids = UUIDArray(segment.buf[_HEADER.size : _HEADER.size + count * UUID_SIZE])
+    ids._owner = segment
+    return ids
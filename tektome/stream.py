@@ -0,0 +1,260 @@
+"""Incremental parsing and writing of large collection JSON payloads."""
+
+import codecs
+import io
+import json
+import re
+from functools import lru_cache
+from typing import IO, Any, Iterator, NoReturn
+from uuid import UUID
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import InitErrorDetails, PydanticCustomError
+
+_UUIDS = TypeAdapter(list[UUID])
+_WS = re.compile(r"[ \t\n\r]*")
+# One string element followed by its separator, e.g. ` "1b4e...", `
+_ELEMENT = re.compile(r'[ \t\n\r]*"([^"\\]*)"[ \t\n\r]*([,\]])')
+# A run of string elements each followed by a comma, matched in one pass
+_RUN = re.compile(r'(?:[ \t\n\r]*"[^"\\]*"[ \t\n\r]*,)+')
+_STRING = re.compile(r'"([^"\\]*)"')
+_LOOKAHEAD = 128
+_DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    """Buffered reader over a text or binary stream with just enough JSON scanning."""
+
+    def __init__(self, fp: IO, read_size: int):
+        self._fp = fp
+        self._read_size = read_size
+        self._decoder = None
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next block of input, dropping consumed text. False at end of stream."""
+        if self.eof:
+            return False
+        data = self._fp.read(self._read_size)
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder("utf-8")()
+            try:
+                text = self._decoder.decode(bytes(data), final=not data)
+            except UnicodeDecodeError as exc:
+                raise _JSONError(str(exc)) from None
+        else:
+            text = data
+        if not data:
+            self.eof = True
+            self.buf += text
+            return False
+        self.buf = self.buf[self.pos :] + text
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or "" at end of stream."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise _JSONError(f"expected '{char}', found {found or 'end of input'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if self.fill():
+                    continue
+                raise _JSONError("invalid or truncated JSON value") from None
+            # A value ending with the buffer (e.g. a number) may continue in the next block.
+            if end < len(self.buf) or not self.fill():
+                self.pos = end
+                return value
+
+    def string(self) -> str:
+        if self.peek() != '"':
+            raise _JSONError("expected a string")
+        return self.value()
+
+
+class _JSONError(Exception):
+    pass
+
+
+def _raise(title: str, errors: list) -> NoReturn:
+    raise ValidationError.from_exception_data(title, errors)
+
+
+def iter_ids(
+    fp: IO, model: type, *, chunk_size: int = 10_000, read_size: int = 1 << 16
+) -> Iterator[list[UUID]]:
+    """
+    Stream the `ids` of a serialized id collection in validated chunks.
+
+    Args:
+        fp: Readable text or binary stream holding the JSON object
+        model: The `IdCollection` subclass the payload must match
+        chunk_size: Maximum number of ids per yielded list
+        read_size: Number of bytes or characters read from ``fp`` at a time
+
+    Yields:
+        Lists of at most ``chunk_size`` UUIDs, in payload order.
+
+    Raises:
+        ValidationError: On malformed JSON, a wrong or missing `kind`, an
+            unexpected key or an invalid id. A wrong `kind` is reported as soon
+            as it is read, which may be after some chunks were yielded.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    title = model.__name__
+    (tag,) = model.model_fields["kind"].annotation.__args__
+    reader = _Reader(fp, read_size)
+    seen = set()
+    try:
+        reader.expect("{")
+        if reader.peek() == "}":
+            reader.pos += 1
+        else:
+            while True:
+                key = reader.string()
+                reader.expect(":")
+                if key in seen:
+                    raise _JSONError(f"duplicate key {key!r}")
+                seen.add(key)
+                if key == "kind":
+                    kind = reader.value()
+                    if kind != tag:
+                        error = PydanticCustomError("kind_mismatch", "kind must be '{tag}'", {"tag": tag})
+                        _raise(title, [InitErrorDetails(type=error, loc=("kind",), input=kind)])
+                elif key == "ids":
+                    if reader.peek() != "[":
+                        _raise(title, [InitErrorDetails(type="list_type", loc=("ids",), input=reader.value())])
+                    reader.pos += 1
+                    yield from _iter_array(reader, title, chunk_size)
+                else:
+                    _raise(title, [InitErrorDetails(type="extra_forbidden", loc=(key,), input=reader.value())])
+                separator = reader.peek()
+                reader.pos += 1
+                if separator == "}":
+                    break
+                if separator != ",":
+                    raise _JSONError(f"expected ',' or '}}', found {separator or 'end of input'!r}")
+        if reader.peek():
+            raise _JSONError("trailing characters after the JSON object")
+    except _JSONError as exc:
+        _raise(title, [InitErrorDetails(type="json_invalid", loc=(), input="", ctx={"error": str(exc)})])
+    missing = [InitErrorDetails(type="missing", loc=(key,), input={}) for key in ("ids", "kind") if key not in seen]
+    if missing:
+        _raise(title, missing)
+
+
+def _iter_array(reader: _Reader, title: str, chunk_size: int) -> Iterator[list[UUID]]:
+    chunk: list[Any] = []
+    offset = 0
+    done = reader.peek() == "]"
+    if done:
+        reader.pos += 1
+    while not done:
+        run = _RUN.match(reader.buf, reader.pos)
+        match = None if run else _ELEMENT.match(reader.buf, reader.pos)
+        if run:
+            chunk += _STRING.findall(reader.buf, run.start(), run.end())
+            reader.pos = run.end()
+        elif match:
+            chunk.append(match.group(1))
+            reader.pos = match.end()
+            done = match.group(2) == "]"
+        elif len(reader.buf) - reader.pos < _LOOKAHEAD and reader.fill():
+            continue
+        else:
+            chunk.append(reader.value())
+            separator = reader.peek()
+            reader.pos += 1
+            if separator not in (",", "]"):
+                raise _JSONError(f"expected ',' or ']', found {separator or 'end of input'!r}")
+            done = separator == "]"
+        while len(chunk) >= chunk_size or (done and chunk):
+            yield _validate_chunk(chunk[:chunk_size], offset, title)
+            offset += len(chunk[:chunk_size])
+            chunk = chunk[chunk_size:]
+
+
+def _validate_chunk(chunk: list, offset: int, title: str) -> list[UUID]:
+    try:
+        return _UUIDS.validate_python(chunk)
+    except ValidationError as exc:
+        errors = [
+            InitErrorDetails(
+                type=error["type"],
+                loc=("ids", offset + error["loc"][0], *error["loc"][1:]),
+                input=error["input"],
+                **({"ctx": error["ctx"]} if "ctx" in error else {}),
+            )
+            for error in exc.errors()
+        ]
+        _raise(title, errors)
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(model: type, field: str) -> TypeAdapter:
+    return TypeAdapter(model.model_fields[field].annotation)
+
+
+def write_json(fp: IO, instance: BaseModel, field: str, *, chunk_size: int = 10_000) -> int:
+    """
+    Write ``instance.model_dump_json()`` to a stream, serializing one field in chunks.
+
+    The rest of the object is dumped with ``field`` empty, then the items of
+    ``field`` are dumped ``chunk_size`` at a time with the serializer of its
+    type, so the output is byte-identical to `model_dump_json` while memory
+    is bounded by one chunk.
+
+    Args:
+        fp: Writable text or binary stream
+        instance: The model to dump
+        field: Name of the array field holding most of the data
+        chunk_size: Maximum number of items serialized at a time
+
+    Returns:
+        The number of bytes of JSON written.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    text = isinstance(fp, io.TextIOBase)
+    written = 0
+
+    def write(data: bytes) -> None:
+        nonlocal written
+        fp.write(data.decode() if text else data)
+        written += len(data)
+
+    items = getattr(instance, field)
+    envelope = instance.model_copy(update={field: items[:0]}).model_dump_json().encode()
+    key = f'"{field}":['.encode()
+    head, found, tail = envelope.partition(key + b"]")
+    if not found:
+        # A custom serializer changed the layout: fall back to a single dump.
+        write(instance.model_dump_json().encode())
+        return written
+    write(head + key)
+    dump = _field_adapter(type(instance), field).dump_json
+    for start in range(0, len(items), chunk_size):
+        chunk = dump(items[start : start + chunk_size])[1:-1]
+        write(b"," + chunk if start else chunk)
+    write(b"]" + tail)
+    return written
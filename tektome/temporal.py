@@ -0,0 +1,417 @@
+"""Compact arrays of dates and datetimes."""
+
+from array import array
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Optional, Union
+
+from pydantic_core import SchemaValidator, core_schema
+
+from tektome._lazy import lazy_import
+
+try:
+    np = lazy_import("numpy")  # imported on first use
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_MICROS_RANGE = ((datetime.min - _EPOCH) // _MICROSECOND, (datetime.max - _EPOCH) // _MICROSECOND)
+NAIVE = -(2**31)
+"""Offset stored for naive datetimes in `DateTimeArray.offsets`."""
+
+
+@lru_cache(maxsize=None)
+def _tz(offset: int) -> timezone:
+    # One shared tzinfo per distinct offset.
+    return timezone.utc if offset == 0 else timezone(timedelta(seconds=offset))
+
+
+# Validator for the values the fast path does not recognise.
+_DATETIME = SchemaValidator(core_schema.datetime_schema())
+
+# Canonical ISO-8601 datetimes by length: (length of their "YYYY-MM-DDTHH:MM:SS",
+# "...SS.fff" or "...SS.ffffff" part, offset suffix).
+_DATETIME_LAYOUTS = {end + len(suffix): (end, suffix) for end in (19, 23, 26) for suffix in ("", "Z", "+HH:MM")}
+_SEPARATORS = {4: "-", 7: "-", 10: "T", 13: ":", 16: ":", 19: "."}
+
+
+def _fast_path(values: Any) -> bool:
+    # Vectorized parsing pays off for lists of strings, the shape of JSON input.
+    return np is not None and type(values) is list and all(type(value) is str for value in values)
+
+
+def _codes(values: list, width: int) -> "np.ndarray":
+    # ASCII bytes of the strings, one row per string. Longer strings are
+    # truncated (callers check the lengths); other characters, which no
+    # canonical value contains, raise UnicodeEncodeError.
+    return np.array(values, dtype=f"S{width}").view(np.uint8).reshape(len(values), width)
+
+
+def _canonical(codes: "np.ndarray", end: int) -> "np.ndarray":
+    # Rows whose first `end` bytes are digits and separators in the canonical places.
+    digits = [column for column in range(end) if column not in _SEPARATORS]
+    ok = (codes[:, digits] - ord("0") <= 9).all(axis=1)  # uint8 wraps around below "0"
+    for column in range(4, end):
+        if column in _SEPARATORS:
+            ok &= codes[:, column] == ord(_SEPARATORS[column])
+    return ok & (codes[:, :4] != ord("0")).any(axis=1)  # year 0 is out of range for Python
+
+
+def _parse_prefix(codes: "np.ndarray", end: int, unit: str) -> "np.ndarray":
+    # numpy's datetime64 parser checks the field ranges; raises ValueError for invalid values.
+    text = np.ascontiguousarray(codes[:, :end]).view(f"S{end}").ravel()
+    return text.astype(f"datetime64[{unit}]").view(np.int64)
+
+
+def _parse_datetimes(values: list) -> tuple["np.ndarray", "np.ndarray", list[int]]:
+    """
+    Parse canonical ISO-8601 datetime strings (see `_DATETIME_LAYOUTS`).
+
+    Returns microseconds and offsets as stored by `DateTimeArray`, and the
+    indices of the values that are not canonical, left undefined.
+
+    Raises:
+        ValueError: For canonical-looking values that are not valid datetimes.
+    """
+    n = len(values)
+    lengths = np.fromiter(map(len, values), dtype=np.intp, count=n)
+    codes = _codes(values, max(_DATETIME_LAYOUTS))
+    micros = np.zeros(n, dtype=np.int64)
+    offsets = np.full(n, NAIVE, dtype=np.int32)
+    parsed = np.zeros(n, dtype=bool)
+    for length, (end, suffix) in _DATETIME_LAYOUTS.items():
+        rows = np.flatnonzero(lengths == length)
+        if not len(rows):
+            continue
+        group = codes[rows]
+        ok = _canonical(group, end)
+        offset = NAIVE
+        if suffix == "Z":
+            ok &= group[:, end] == ord("Z")
+            offset = 0
+        elif suffix:
+            sign = group[:, end]
+            digits = (group[:, [end + 1, end + 2, end + 4, end + 5]] - ord("0")).astype(np.int64)
+            hours, minutes = digits[:, 0] * 10 + digits[:, 1], digits[:, 2] * 10 + digits[:, 3]
+            ok &= (sign == ord("+")) | (sign == ord("-"))
+            ok &= (digits <= 9).all(axis=1) & (group[:, end + 3] == ord(":")) & (hours < 24) & (minutes < 60)
+            offset = (np.where(sign == ord("-"), -1, 1) * (hours * 3_600 + minutes * 60))[ok]
+        rows = rows[ok]
+        local = _parse_prefix(group[ok], end, "us")
+        # Aware values are stored as UTC instants, naive ones as wall time.
+        micros[rows] = local if suffix == "" else local - np.asarray(offset) * 1_000_000
+        offsets[rows] = offset
+        parsed[rows] = True
+    return micros, offsets, np.flatnonzero(~parsed).tolist()
+
+
+def _int_array(typecode: str, values: "np.ndarray") -> array:
+    result = array(typecode)
+    result.frombytes(values.tobytes())
+    return result
+
+
+class _ValueArray(Sequence):
+    """Shared read-only behaviour of the temporal arrays, backed by an int64 ``array``."""
+
+    __slots__ = ("_values",)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self._item, range(len(self)))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._take(range(*index.indices(len(self))))
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError(f"{type(self).__name__} index out of range")
+        return self._item(index)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, type(self)):
+            return self._state() == other._state()
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+    def __reduce__(self):
+        return (type(self)._from_state, self._state())
+
+    @classmethod
+    def _reuse_instance(cls, value: Any, handler: core_schema.ValidatorFunctionWrapHandler) -> Any:
+        return value if isinstance(value, cls) else handler(value)
+
+    def _order(self) -> list[int]:
+        if np is not None:
+            return np.argsort(self._numpy_keys(), kind="stable").tolist()
+        return sorted(range(len(self)), key=self._values.__getitem__)
+
+    def _numpy_keys(self) -> "np.ndarray":
+        return np.frombuffer(self._values, dtype=np.int64)
+
+    def min(self) -> Any:
+        """Return the earliest value; raises `ValueError` when empty."""
+        if not len(self):
+            raise ValueError(f"min() of an empty {type(self).__name__}")
+        if np is not None:
+            return self._item(int(np.argmin(self._numpy_keys())))
+        return self._item(min(range(len(self)), key=self._values.__getitem__))
+
+    def max(self) -> Any:
+        """Return the latest value; raises `ValueError` when empty."""
+        if not len(self):
+            raise ValueError(f"max() of an empty {type(self).__name__}")
+        if np is not None:
+            return self._item(int(np.argmax(self._numpy_keys())))
+        return self._item(max(range(len(self)), key=self._values.__getitem__))
+
+    def sorted(self, *, reverse: bool = False):
+        """Return a new array with the values in chronological order (stable)."""
+        order = self._order()
+        return self._take(order[::-1] if reverse else order)
+
+    def between(self, start: Any = None, stop: Any = None):
+        """
+        Return a new array of the values in ``[start, stop)``, in their current order.
+
+        Args:
+            start: Inclusive lower bound, ``None`` for no bound
+            stop: Exclusive upper bound, ``None`` for no bound
+        """
+        low = None if start is None else self._key(start)
+        high = None if stop is None else self._key(stop)
+        if np is not None:
+            keys = self._numpy_keys()
+            mask = np.ones(len(keys), dtype=bool)
+            if low is not None:
+                mask &= keys >= low
+            if high is not None:
+                mask &= keys < high
+            return self._take(np.flatnonzero(mask).tolist())
+        values = self._values
+        return self._take(
+            [
+                i
+                for i in range(len(values))
+                if (low is None or values[i] >= low) and (high is None or values[i] < high)
+            ]
+        )
+
+
+class DateArray(_ValueArray):
+    """
+    Read-only sequence of dates stored as int64 days since 1970-01-01.
+
+    Behaves like a ``list[date]`` for reading, with 8 bytes per value; a
+    `date` is built only when an element is accessed.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, values: Iterable[date] = ()):
+        self._values = array("q", [value.toordinal() - _EPOCH_ORDINAL for value in values])
+
+    @classmethod
+    def from_days(cls, days: Union[Iterable[int], array]) -> "DateArray":
+        """Build an array from days since 1970-01-01."""
+        instance = cls.__new__(cls)
+        instance._values = days if isinstance(days, array) and days.typecode == "q" else array("q", days)
+        return instance
+
+    @property
+    def days(self) -> memoryview:
+        """Read-only view of the days since 1970-01-01."""
+        return memoryview(self._values).toreadonly()
+
+    def to_numpy(self) -> "np.ndarray":
+        """Return a read-only ``datetime64[D]`` view of the values (requires numpy)."""
+        if np is None:
+            raise ImportError("to_numpy requires numpy: pip install 'tektome[numpy]'")
+        return np.frombuffer(self.days, dtype="datetime64[D]")
+
+    def _item(self, index: int) -> date:
+        return date.fromordinal(self._values[index] + _EPOCH_ORDINAL)
+
+    def _take(self, indices: Iterable[int]) -> "DateArray":
+        values = self._values
+        return DateArray.from_days(array("q", [values[i] for i in indices]))
+
+    def _key(self, value: date) -> int:
+        if isinstance(value, datetime):
+            value = value.date()
+        return value.toordinal() - _EPOCH_ORDINAL
+
+    def _state(self) -> tuple:
+        return (self._values.tobytes(),)
+
+    @classmethod
+    def _from_state(cls, data: bytes) -> "DateArray":
+        values = array("q")
+        values.frombytes(data)
+        return cls.from_days(values)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler) -> core_schema.CoreSchema:
+        from_list = core_schema.no_info_after_validator_function(
+            cls, core_schema.list_schema(core_schema.date_schema())
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_list,
+            python_schema=core_schema.no_info_wrap_validator_function(cls._reuse_instance, from_list),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                list, return_schema=core_schema.list_schema(core_schema.date_schema())
+            ),
+        )
+
+
+class DateTimeArray(_ValueArray):
+    """
+    Read-only sequence of datetimes stored as int64 microseconds since the epoch.
+
+    Aware values are stored as UTC instants plus their UTC offset in seconds,
+    so they read back with the same offset; naive values keep their wall
+    time and `NAIVE` as offset. Ordering, `min`, `max` and `between` compare
+    instants, treating naive values as UTC.
+    """
+
+    __slots__ = ("_offsets",)
+
+    def __init__(self, values: Iterable[datetime] = ()):
+        micros, offsets = array("q"), array("i")
+        add_micros, add_offset = micros.append, offsets.append
+        for value in values:
+            # Integer arithmetic on the fields is exact and much cheaper than timedelta math.
+            seconds = (value.toordinal() - _EPOCH_ORDINAL) * 86_400
+            seconds += value.hour * 3_600 + value.minute * 60 + value.second
+            offset = value.utcoffset()
+            if offset is None:
+                add_offset(NAIVE)
+            else:
+                offset = offset.days * 86_400 + offset.seconds
+                seconds -= offset
+                add_offset(offset)
+            add_micros(seconds * 1_000_000 + value.microsecond)
+        self._values, self._offsets = micros, offsets
+
+    @classmethod
+    def from_micros(
+        cls, micros: Union[Iterable[int], array], offsets: Optional[Union[Iterable[int], array]] = None
+    ) -> "DateTimeArray":
+        """
+        Build an array from microseconds since the epoch.
+
+        Args:
+            micros: UTC instants, or wall times for naive values
+            offsets: UTC offsets in seconds, `NAIVE` for naive values;
+                ``None`` makes every value aware in UTC
+        """
+        instance = cls.__new__(cls)
+        instance._values = micros if isinstance(micros, array) and micros.typecode == "q" else array("q", micros)
+        if offsets is None:
+            offsets = array("i", [0]) * len(instance._values)
+        instance._offsets = offsets if isinstance(offsets, array) and offsets.typecode == "i" else array("i", offsets)
+        if len(instance._offsets) != len(instance._values):
+            raise ValueError("micros and offsets must have the same length")
+        return instance
+
+    @property
+    def micros(self) -> memoryview:
+        """Read-only view of the microseconds since the epoch (UTC instants for aware values)."""
+        return memoryview(self._values).toreadonly()
+
+    @property
+    def offsets(self) -> memoryview:
+        """Read-only view of the UTC offsets in seconds, `NAIVE` for naive values."""
+        return memoryview(self._offsets).toreadonly()
+
+    def to_numpy(self) -> "np.ndarray":
+        """Return a read-only ``datetime64[us]`` view of the UTC instants (requires numpy)."""
+        if np is None:
+            raise ImportError("to_numpy requires numpy: pip install 'tektome[numpy]'")
+        return np.frombuffer(self.micros, dtype="datetime64[us]")
+
+    def _item(self, index: int) -> datetime:
+        micros, offset = self._values[index], self._offsets[index]
+        if offset == NAIVE:
+            return _EPOCH + timedelta(microseconds=micros)
+        # Back to the wall time in integers first: the UTC instant of a value
+        # near the datetime limits may be out of range.
+        return (_EPOCH + timedelta(microseconds=micros + offset * 1_000_000)).replace(tzinfo=_tz(offset))
+
+    def _take(self, indices: Iterable[int]) -> "DateTimeArray":
+        values, offsets = self._values, self._offsets
+        indices = list(indices)
+        return DateTimeArray.from_micros(
+            array("q", [values[i] for i in indices]), array("i", [offsets[i] for i in indices])
+        )
+
+    def _key(self, value: datetime) -> int:
+        offset = value.utcoffset()
+        if offset is None:
+            return (value - _EPOCH) // _MICROSECOND
+        return (value.replace(tzinfo=None) - _EPOCH - offset) // _MICROSECOND  # timedeltas do not overflow here
+
+    def _state(self) -> tuple:
+        return (self._values.tobytes(), self._offsets.tobytes())
+
+    @classmethod
+    def _from_state(cls, micros: bytes, offsets: bytes) -> "DateTimeArray":
+        values, offset_values = array("q"), array("i")
+        values.frombytes(micros)
+        offset_values.frombytes(offsets)
+        return cls.from_micros(values, offset_values)
+
+    def to_utc(self) -> "DateTimeArray":
+        """
+        Return an array of the same instants in UTC, naive values being taken as UTC.
+
+        Raises:
+            ValueError: If an instant is out of `datetime`'s range in UTC.
+        """
+        if self._values:
+            values = np.frombuffer(self._values, dtype=np.int64) if np is not None else self._values
+            if min(values) < _MICROS_RANGE[0] or max(values) > _MICROS_RANGE[1]:
+                raise ValueError("datetime is out of range in UTC")
+        return DateTimeArray.from_micros(self._values)
+
+    @classmethod
+    def _validate(cls, value: Any, handler: core_schema.ValidatorFunctionWrapHandler) -> "DateTimeArray":
+        if isinstance(value, cls):
+            return value
+        if _fast_path(value):
+            try:
+                micros, offsets, rest = _parse_datetimes(value)
+                others = cls(_DATETIME.validate_python(value[i]) for i in rest)
+            except ValueError:
+                pass  # invalid values: let the list validator report every error with its index
+            else:
+                micros[rest] = np.frombuffer(others._values, dtype=np.int64)
+                offsets[rest] = np.frombuffer(others._offsets, dtype=np.int32)
+                return cls.from_micros(_int_array("q", micros), _int_array("i", offsets))
+        return handler(value)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler) -> core_schema.CoreSchema:
+        from_list = core_schema.no_info_after_validator_function(
+            cls, core_schema.list_schema(core_schema.datetime_schema())
+        )
+        return core_schema.no_info_wrap_validator_function(
+            cls._validate,
+            from_list,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                list, return_schema=core_schema.list_schema(core_schema.datetime_schema())
+            ),
+        )
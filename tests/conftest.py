@@ -1,7 +1,12 @@
 """Shared fixtures for tests."""
+import json
+import threading
 import uuid
+import zlib
 from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
+from tektome.fetch import ENDPOINTS
 
 
 @pytest.fixture
@@ -32,3 +37,91 @@ def sample_date():
 def sample_datetime():
     """Return a sample datetime for testing."""
     return datetime(2025, 11, 17, 14, 30, 0)
+
+
+TEST_ENDPOINTS = {
+    "resource": "api/resources/{id}",
+    "project": "api/projects/{id}",
+    "attribute_definition": "api/attribute-definitions/{id}",
+}
+"""Paths of single objects on the `api_server` stand-in."""
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Return a fake clock, for caches and pools taking a ``clock`` argument."""
+    return FakeClock()
+
+
+class _APIHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler answering from `server.routes`, echoing the request otherwise.
+
+    Responses carry an ETag; a matching ``If-None-Match`` gets a 304.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append(
+                {"path": self.path, "headers": dict(self.headers), "port": self.client_address[1]}
+            )
+        route = self.server.routes.get(self.path, self.server.routes.get("*"))
+        if callable(route):
+            route = route(self)
+        status, payload = route or (200, {"path": self.path, "authorization": self.headers.get("Authorization")})
+        body = json.dumps(payload).encode()
+        etag = f'"{zlib.crc32(body):x}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def api_server(monkeypatch):
+    """Run a local stand-in for the Tektome API and return it.
+
+    `server.url` is its base url, `server.routes` maps request paths (or
+    ``"*"`` for any other path) to ``(status, json)`` or to a callable
+    returning them, and
+    `server.requests` / `server.connections` record what was received.
+    `TEST_ENDPOINTS` are registered for fetches while it runs.
+    """
+    for kind, template in TEST_ENDPOINTS.items():
+        monkeypatch.setitem(ENDPOINTS, kind, template)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _APIHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.routes = {}
+    server.requests = []
+    server.connections = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
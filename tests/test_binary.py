@@ -0,0 +1,158 @@
+"""Test suite for the binary wire format."""
+import uuid
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from pydantic import BaseModel, Field, ValidationError
+from tektome import (
+    AttributeDefinitions,
+    Context,
+    Date,
+    Dates,
+    DateTime,
+    DateTimes,
+    Project,
+    Projects,
+    Resource,
+    Resources,
+    dumps_binary,
+    loads_binary,
+)
+from tektome.binary import MAGIC
+from tektome.ids import UUIDArray
+
+JST = timezone(timedelta(hours=9))
+
+
+def _models(ids):
+    return [
+        Resource(id=ids[0], kind="resource"),
+        Project(id=ids[1], kind="project"),
+        Context(user_api_key="key", base_url="https://example.tektome.com/api", execution_id=ids[2]),
+        Date(value=date(2024, 2, 29), kind="date"),
+        DateTime(value=datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=JST), kind="datetime"),
+        DateTime(value=datetime(1969, 12, 31, 23, 59, 59), kind="datetime"),
+        Resources(ids=ids, kind="resource[]"),
+        Projects(ids=[], kind="project[]"),
+        AttributeDefinitions(ids=ids, kind="attribute_definition[]"),
+        Resources.variant(storage="compact")(ids=ids, kind="resource[]"),
+        Resources.variant(storage="lazy")(ids=ids, kind="resource[]"),
+        Dates(values=[date(2020, 1, 1), date(1900, 5, 5)], kind="date[]"),
+        DateTimes(values=[datetime(2020, 1, 1, tzinfo=JST), datetime(2021, 6, 1, 12, 30)], kind="datetime[]"),
+        DateTimes(values=[datetime.max.replace(tzinfo=timezone(-timedelta(hours=1)))], kind="datetime[]"),
+    ]
+
+
+@pytest.fixture(params=range(14), ids=lambda i: str(i))
+def model(request, sample_uuid_list):
+    """Return one instance of every schema class and storage."""
+    return _models(sample_uuid_list)[request.param]
+
+
+class TestRoundTrip:
+    """Test that every schema round-trips through the binary format."""
+
+    def test_round_trip(self, model):
+        """Test that decoding gives back an equal object of the same class."""
+        decoded = type(model).loads_binary(model.dumps_binary())
+        assert type(decoded) is type(model)
+        assert decoded.model_dump_json() == model.model_dump_json()
+
+    def test_same_as_json(self, model):
+        """Test that the result matches validating the JSON form."""
+        decoded = type(model).loads_binary(model.dumps_binary())
+        assert decoded == type(model).model_validate_json(model.model_dump_json())
+
+    def test_dispatch_on_kind(self, model):
+        """Test decoding without a class, like parse_value."""
+        if not hasattr(model, "kind"):
+            pytest.skip("Context has no kind")
+        decoded = loads_binary(dumps_binary(model))
+        assert decoded.model_dump_json() == model.model_dump_json()
+
+    def test_smaller_than_json(self, model):
+        """Test that the binary payload is smaller than its JSON."""
+        assert len(model.dumps_binary()) < len(model.model_dump_json())
+
+    def test_accepts_buffers(self, sample_uuid_list):
+        """Test decoding from bytearray and memoryview."""
+        data = Resources(ids=sample_uuid_list, kind="resource[]").dumps_binary()
+        for buffer in (bytearray(data), memoryview(data)):
+            assert Resources.loads_binary(buffer).ids == sample_uuid_list
+
+    def test_compact_ids_share_payload(self, sample_uuid_list):
+        """Test that compact storage wraps the ids of the payload."""
+        Compact = Resources.variant(storage="compact")
+        data = Compact(ids=sample_uuid_list, kind="resource[]").dumps_binary()
+        ids = Compact.loads_binary(data).ids
+        assert isinstance(ids, UUIDArray)
+        assert ids.buffer.obj is data
+
+    def test_uuid_size(self, sample_uuid_list):
+        """Test that ids take 16 bytes each."""
+        small = Resources(ids=sample_uuid_list[:1], kind="resource[]").dumps_binary()
+        large = Resources(ids=sample_uuid_list, kind="resource[]").dumps_binary()
+        assert len(large) - len(small) == 16 * (len(sample_uuid_list) - 1)
+
+    def test_dedupe_variant(self, sample_uuid_list):
+        """Test that dedupe variants deduplicate decoded ids."""
+        data = Resources(ids=sample_uuid_list * 2, kind="resource[]").dumps_binary()
+        decoded = Resources.variant(storage="compact", dedupe="first").loads_binary(data)
+        assert decoded.ids == sample_uuid_list
+        assert decoded.duplicates_dropped == len(sample_uuid_list)
+
+    def test_other_models(self, sample_uuid):
+        """Test a pydantic model with nested values, aliases and other types."""
+
+        class Item(BaseModel):
+            name: str
+            weight: float
+
+        class Payload(BaseModel):
+            items: list[Item]
+            owner: uuid.UUID = Field(alias="ownerId")
+            flags: dict[str, bool]
+            counts: tuple[int, ...]
+            note: bytes
+            missing: None = None
+            ratio: complex = 1j
+
+        payload = Payload(
+            items=[{"name": "a", "weight": 1.5}],
+            ownerId=sample_uuid,
+            flags={"x": True, "y": False},
+            counts=(-3, 0, 2**70),
+            note=b"\x00\xff",
+            ratio=2 + 3j,
+        )
+        assert loads_binary(dumps_binary(payload), Payload) == payload
+
+
+class TestErrors:
+    """Test invalid payloads."""
+
+    def test_not_a_payload(self):
+        """Test that other data is rejected."""
+        with pytest.raises(ValueError, match="not a tektome binary payload"):
+            Resource.loads_binary(b'{"id": 1}')
+
+    def test_truncated(self, sample_uuid_list):
+        """Test that truncated payloads are rejected."""
+        data = Resources(ids=sample_uuid_list, kind="resource[]").dumps_binary()
+        with pytest.raises(ValueError, match="truncated"):
+            Resources.loads_binary(data[:-5])
+
+    def test_trailing_bytes(self, sample_uuid):
+        """Test that trailing bytes are rejected."""
+        with pytest.raises(ValueError, match="trailing"):
+            Resource.loads_binary(Resource(id=sample_uuid, kind="resource").dumps_binary() + b"\x00")
+
+    def test_unknown_tag(self):
+        """Test that unknown tags are rejected."""
+        with pytest.raises(ValueError, match="unknown tag"):
+            Resource.loads_binary(MAGIC + b"\x0b\x01\x02id\xff")
+
+    def test_validation(self, sample_uuid):
+        """Test that decoded fields are validated by the target class."""
+        data = Resource(id=sample_uuid, kind="resource").dumps_binary()
+        with pytest.raises(ValidationError):
+            Project.loads_binary(data)
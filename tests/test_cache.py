@@ -0,0 +1,293 @@
+"""Test suite for the in-process response cache."""
+import asyncio
+import threading
+import time
+import uuid
+import pytest
+from tektome import Context, Project, Resource, Resources
+from tektome.cache import CacheStats, ResponseCache, default_cache
+from tektome.client import default_pool
+from tektome.fetch import cache_key
+
+httpx = pytest.importorskip("httpx")
+
+
+@pytest.fixture
+def context(api_server, sample_uuid):
+    """Return a Context pointing at the local API server."""
+    yield Context(user_api_key="secret", base_url=api_server.url, execution_id=sample_uuid)
+    default_pool.close()
+    default_cache.clear()
+
+
+class TestResponseCache:
+    """Test ResponseCache."""
+
+    def test_get_and_set(self):
+        """Test that stored values are returned."""
+        cache = ResponseCache()
+        assert cache.get("a") is None
+        cache.set("a", b"1")
+        assert cache.get("a") == b"1"
+        assert "a" in cache
+        assert len(cache) == 1
+
+    def test_lru_by_count(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+        cache.get("a")
+        cache.set("c", b"3")
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert cache.stats().evictions == 1
+
+    def test_lru_by_bytes(self):
+        """Test that entries are evicted to respect max_bytes."""
+        cache = ResponseCache(max_bytes=10)
+        cache.set("a", b"12345")
+        cache.set("b", b"12345")
+        cache.set("c", b"123")
+        assert "a" not in cache
+        assert cache.stats().bytes == 8
+
+    def test_oversized_value_not_stored(self):
+        """Test that a value larger than max_bytes is skipped."""
+        cache = ResponseCache(max_bytes=4)
+        cache.set("a", b"12345")
+        assert len(cache) == 0
+
+    def test_disabled(self):
+        """Test that max_entries=0 disables caching."""
+        cache = ResponseCache(max_entries=0)
+        cache.set("a", b"1")
+        assert cache.get("a") is None
+
+    def test_ttl(self, clock):
+        """Test that entries expire after their time to live."""
+        cache = ResponseCache(ttl=10, clock=clock)
+        cache.set("a", b"1")
+        cache.set("b", b"2", ttl=30)
+        clock.now = 10
+        assert cache.get("a") is None
+        assert cache.get("b") == b"2"
+        clock.now = 30
+        assert cache.get("b") is None
+        assert cache.stats().expirations == 2
+        assert len(cache) == 0
+
+    def test_stats(self):
+        """Test the hit and miss counters."""
+        cache = ResponseCache()
+        cache.get_or_load("a", lambda: b"1")
+        cache.get_or_load("a", lambda: b"2")
+        cache.get("b")
+        assert cache.stats() == CacheStats(hits=1, misses=2, evictions=0, expirations=0, entries=1, bytes=1)
+        assert cache.stats().hit_rate == pytest.approx(1 / 3)
+
+    def test_invalidate_and_clear(self):
+        """Test dropping entries."""
+        cache = ResponseCache()
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+        cache.invalidate("a")
+        assert "a" not in cache and "b" in cache
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats().bytes == 0
+
+    def test_configure_evicts(self):
+        """Test that lowering the limits evicts entries."""
+        cache = ResponseCache()
+        for key in "abc":
+            cache.set(key, b"1")
+        cache.configure(max_entries=1)
+        assert len(cache) == 1 and "c" in cache
+
+    def test_load_errors_not_cached(self):
+        """Test that a failing load propagates and caches nothing."""
+        cache = ResponseCache()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_load("a", fail)
+        assert cache.get_or_load("a", lambda: b"1") == b"1"
+
+    def test_single_flight_threads(self):
+        """Test that concurrent misses on one key load it once."""
+        cache = ResponseCache()
+        calls = []
+
+        def load():
+            calls.append(1)
+            time.sleep(0.05)
+            return b"1"
+
+        threads = [threading.Thread(target=cache.get_or_load, args=("a", load)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert cache.stats().misses == 1
+        assert cache.stats().hits == 7
+        assert cache._key_locks == {}
+
+    def test_single_flight_async(self):
+        """Test that concurrent tasks missing one key share a load."""
+        cache = ResponseCache()
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return b"1"
+
+        async def main():
+            return await asyncio.gather(*(cache.aget_or_load("a", load) for _ in range(8)))
+
+        assert asyncio.run(main()) == [b"1"] * 8
+        assert len(calls) == 1
+        assert cache._loading == {}
+
+    def test_single_flight_async_error(self):
+        """Test that waiters see the loader's exception."""
+        cache = ResponseCache()
+
+        async def load():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        async def main():
+            return await asyncio.gather(*(cache.aget_or_load("a", load) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in asyncio.run(main()))
+        assert len(cache) == 0
+
+
+    def test_cancelled_loader_does_not_cancel_waiters(self):
+        """Test that cancelling the task loading a key lets a waiting task load it instead."""
+        cache = ResponseCache()
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return b"1"
+
+        async def main():
+            loader = asyncio.ensure_future(cache.aget_or_load("a", load))
+            await asyncio.sleep(0)
+            waiters = [asyncio.ensure_future(cache.aget_or_load("a", load)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            loader.cancel()
+            results = await asyncio.gather(*waiters)
+            assert loader.cancelled()
+            return results
+
+        assert asyncio.run(main()) == [b"1"] * 3
+        assert len(calls) == 2
+        assert cache._loading == {}
+
+    def test_cancelled_waiter(self):
+        """Test that cancelling a waiting task leaves the load running for the others."""
+        cache = ResponseCache()
+
+        async def load():
+            await asyncio.sleep(0.05)
+            return b"1"
+
+        async def main():
+            loader = asyncio.ensure_future(cache.aget_or_load("a", load))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(cache.aget_or_load("a", load))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            assert await loader == b"1"
+            return waiter.cancelled()
+
+        assert asyncio.run(main())
+        assert cache.get("a") == b"1"
+
+
+class TestContextCache:
+    """Test that Context-based fetches go through the cache."""
+
+    def test_default_cache(self, context):
+        """Test that contexts share the process-wide cache."""
+        assert context.cache() is default_cache
+
+    def test_fetch_cached(self, context, api_server, sample_uuid):
+        """Test that a second fetch of a resource makes no request."""
+        resource = Resource(id=sample_uuid, kind="resource")
+        first = resource.fetch(context)
+        assert first["path"] == f"/api/resources/{sample_uuid}"
+        assert resource.fetch(context) == first
+        assert len(api_server.requests) == 1
+        assert cache_key(context, "resource", sample_uuid) in default_cache
+
+    def test_keys_cached_separately(self, context, api_server, sample_uuid):
+        """Test that a payload is not served to another API key, which the server may refuse."""
+
+        def authorize(handler):
+            if handler.headers["Authorization"] != "Bearer secret":
+                return 403, {"detail": "forbidden"}
+            return None
+
+        api_server.routes["*"] = authorize
+        resource = Resource(id=sample_uuid, kind="resource")
+        assert resource.fetch(context)["authorization"] == "Bearer secret"
+        other = Context(user_api_key="other", base_url=str(context.base_url), execution_id=sample_uuid)
+        with pytest.raises(httpx.HTTPStatusError) as exc_info:
+            resource.fetch(other)
+        assert exc_info.value.response.status_code == 403
+        assert len(api_server.requests) == 2
+        assert "secret" not in repr(cache_key(context, "resource", sample_uuid))
+
+    def test_kinds_cached_separately(self, context, api_server, sample_uuid):
+        """Test that the kind is part of the cache key."""
+        Resource(id=sample_uuid, kind="resource").fetch(context)
+        assert Project(id=sample_uuid, kind="project").fetch(context)["path"] == f"/api/projects/{sample_uuid}"
+        assert len(api_server.requests) == 2
+
+    def test_errors_not_cached(self, context, api_server, sample_uuid):
+        """Test that failed requests are retried."""
+        api_server.routes[f"/api/resources/{sample_uuid}"] = (404, {"detail": "not found"})
+        resource = Resource(id=sample_uuid, kind="resource")
+        with pytest.raises(httpx.HTTPStatusError):
+            resource.fetch(context)
+        del api_server.routes[f"/api/resources/{sample_uuid}"]
+        assert resource.fetch(context)["path"] == f"/api/resources/{sample_uuid}"
+        assert len(api_server.requests) == 2
+
+    def test_fetch_all_uses_cache(self, context, api_server):
+        """Test that fetch_all only requests ids missing from the cache."""
+        ids = [uuid.uuid4() for _ in range(4)]
+        Resource(id=ids[0], kind="resource").fetch(context)
+
+        async def main():
+            try:
+                return await Resources(ids=ids + ids, kind="resource[]").fetch_all(context)
+            finally:
+                await default_pool.aclose()
+
+        results = asyncio.run(main())
+        assert [result.id for result in results] == ids + ids
+        assert all(result.ok for result in results)
+        assert len(api_server.requests) == 4
+
+    def test_afetch(self, context, api_server, sample_uuid):
+        """Test the async single-object fetch."""
+
+        async def main():
+            try:
+                return await Resource(id=sample_uuid, kind="resource").afetch(context)
+            finally:
+                await default_pool.aclose()
+
+        fetched = asyncio.run(main())
+        assert fetched.ok
+        assert fetched.data["path"] == f"/api/resources/{sample_uuid}"
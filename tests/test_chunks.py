@@ -0,0 +1,109 @@
+"""Test suite for slicing and chunking id collections."""
+import gc
+import tracemalloc
+import uuid
+import pytest
+from tektome import AttributeDefinitions, Projects, Resources
+from tektome.ids import LazyUUIDs, UUIDArray
+
+STORAGES = ["list", "compact", "lazy"]
+
+
+@pytest.fixture
+def ids():
+    """Return 10 UUIDs."""
+    return [uuid.uuid4() for _ in range(10)]
+
+
+@pytest.mark.parametrize("storage", STORAGES)
+class TestSlicing:
+    """Test slices of collections."""
+
+    def test_slice(self, storage, ids):
+        """Test that a slice is a collection of the same class, kind and storage."""
+        model = Projects.variant(storage=storage)
+        projects = model(ids=ids, kind="project[]")
+        part = projects[2:5]
+        assert type(part) is model
+        assert part.kind == "project[]"
+        assert list(part.ids) == ids[2:5]
+        assert type(part.ids) is type(projects.ids)
+        assert part.model_dump_json() == Projects(ids=ids[2:5], kind="project[]").model_dump_json()
+
+    def test_index(self, storage, ids):
+        """Test that an index returns the id."""
+        resources = Resources.variant(storage=storage)(ids=ids, kind="resource[]")
+        assert resources[0] == ids[0]
+        assert resources[-1] == ids[-1]
+        with pytest.raises(IndexError):
+            resources[10]
+
+    def test_steps_and_bounds(self, storage, ids):
+        """Test negative, stepped and empty slices."""
+        resources = Resources.variant(storage=storage)(ids=ids, kind="resource[]")
+        assert list(resources[::-3].ids) == ids[::-3]
+        assert list(resources[-2:].ids) == ids[-2:]
+        assert list(resources[7:3].ids) == []
+
+    def test_chunks(self, storage, ids):
+        """Test that chunks cover the ids in order."""
+        resources = Resources.variant(storage=storage)(ids=ids, kind="resource[]")
+        chunks = list(resources.chunks(4))
+        assert [len(chunk.ids) for chunk in chunks] == [4, 4, 2]
+        assert [value for chunk in chunks for value in chunk.ids] == ids
+        assert all(type(chunk) is type(resources) and chunk.kind == "resource[]" for chunk in chunks)
+
+    def test_not_revalidated(self, storage, ids, monkeypatch):
+        """Test that slicing does not validate."""
+        model = Resources.variant(storage=storage)
+        resources = model(ids=ids, kind="resource[]")
+        monkeypatch.setattr(model, "__pydantic_validator__", None)
+        assert len(list(resources.chunks(3))) == 4
+        assert len(resources[1:3].ids) == 2
+
+
+class TestViews:
+    """Test that slices share the parent's storage."""
+
+    def test_compact_shares_buffer(self, ids):
+        """Test that compact slices are views of the parent buffer."""
+        resources = Resources.variant(storage="compact")(ids=ids, kind="resource[]")
+        part = resources[3:6]
+        assert isinstance(part.ids, UUIDArray)
+        assert part.ids.buffer.obj is resources.ids.buffer.obj
+        assert all(chunk.ids.buffer.obj is resources.ids.buffer.obj for chunk in resources.chunks(3))
+
+    def test_list_shares_uuids(self, ids):
+        """Test that list slices hold the parent's UUID objects."""
+        resources = Resources(ids=ids, kind="resource[]")
+        assert all(a is b for a, b in zip(resources[2:8].ids, ids[2:8]))
+
+    def test_lazy_slice(self, ids):
+        """Test that lazy slices keep the input strings."""
+        resources = Resources.variant(storage="lazy")(ids=[str(value) for value in ids], kind="resource[]")
+        assert isinstance(resources[1:4].ids, LazyUUIDs)
+
+    def test_duplicates_dropped(self, ids):
+        """Test that slices of a dedupe variant do not report the parent's drops."""
+        resources = Resources.variant(dedupe="first")(ids=ids * 2, kind="resource[]")
+        assert resources.duplicates_dropped == 10
+        assert resources[:5].duplicates_dropped == 0
+        resources[:5].ids.append(ids[0])
+        assert len(resources.ids) == 10
+
+    def test_flat_memory(self):
+        """Test that chunking a compact collection allocates no copy of the ids."""
+        ids = UUIDArray(uuid.uuid4().bytes * 100_000)
+        definitions = AttributeDefinitions.variant(storage="compact")(ids=ids, kind="attribute_definition[]")
+        gc.collect()
+        tracemalloc.start()
+        count = sum(len(chunk.ids) for chunk in definitions.chunks(1_000))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert count == 100_000
+        assert peak < 50_000
+
+    def test_invalid_size(self, ids):
+        """Test that chunk sizes must be positive."""
+        with pytest.raises(ValueError, match="positive"):
+            next(Resources(ids=ids, kind="resource[]").chunks(0))
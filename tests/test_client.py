@@ -0,0 +1,184 @@
+"""Test suite for shared HTTP clients."""
+import asyncio
+import time
+import pytest
+from tektome import Context
+from tektome.client import ClientPool, default_pool
+
+httpx = pytest.importorskip("httpx")
+
+
+@pytest.fixture
+def pool():
+    """Return a fresh client pool, closed after the test."""
+    pool = ClientPool(max_connections=4, keepalive_expiry=5.0)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def context(api_server, sample_uuid):
+    """Return a Context pointing at the local API server."""
+    yield Context(user_api_key="secret", base_url=api_server.url, execution_id=sample_uuid)
+    default_pool.close()
+
+
+class TestContextClient:
+    """Test Context.client."""
+
+    def test_authorization_preconfigured(self, context, api_server):
+        """Test that requests carry the bearer token."""
+        response = context.client().get("api/resources")
+        assert response.status_code == 200
+        assert response.json() == {"path": "/api/resources", "authorization": "Bearer secret"}
+        assert api_server.requests[0]["headers"]["User-Agent"].startswith("tektome/")
+
+    def test_client_is_shared(self, context, sample_uuid):
+        """Test that contexts with the same url and key share one client."""
+        other = Context(user_api_key="secret", base_url=str(context.base_url), execution_id=sample_uuid)
+        assert context.client() is other.client()
+        assert isinstance(context.client(), httpx.Client)
+
+    def test_clients_keyed_by_api_key(self, context, sample_uuid):
+        """Test that another API key gets another client."""
+        other = Context(user_api_key="other", base_url=str(context.base_url), execution_id=sample_uuid)
+        assert context.client() is not other.client()
+
+    def test_connections_are_reused(self, context, api_server):
+        """Test that sequential requests reuse one keep-alive connection."""
+        client = context.client()
+        for _ in range(5):
+            client.get("api/resources").raise_for_status()
+        assert api_server.connections == 1
+        assert len({request["port"] for request in api_server.requests}) == 1
+
+
+class TestClientPool:
+    """Test ClientPool behaviour."""
+
+    def test_get_creates_once(self, pool, api_server):
+        """Test that clients are created once per key."""
+        client = pool.get(api_server.url, "key")
+        assert pool.get(api_server.url, "key") is client
+        assert len(pool) == 1
+        pool.get(api_server.url + "/", "key")
+        assert len(pool) == 2
+
+    def test_pool_limits(self, pool, api_server):
+        """Test that pool settings are applied to the client."""
+        client = pool.get(api_server.url, "key")
+        pool_impl = client._transport._pool
+        assert pool_impl._max_connections == 4
+        assert pool_impl._keepalive_expiry == 5.0
+
+    def test_idle_connections_evicted(self, api_server):
+        """Test that idle connections are closed after keepalive_expiry."""
+        pool = ClientPool(keepalive_expiry=0.05)
+        try:
+            client = pool.get(api_server.url, "key")
+            client.get("/a").raise_for_status()
+            time.sleep(0.2)
+            client.get("/b").raise_for_status()
+            assert api_server.connections == 2
+        finally:
+            pool.close()
+
+    def test_close(self, pool, api_server):
+        """Test that close closes and forgets every client."""
+        client = pool.get(api_server.url, "key")
+        pool.close()
+        assert client.is_closed
+        assert len(pool) == 0
+        assert pool.get(api_server.url, "key") is not client
+
+    def test_close_async_clients(self, pool, api_server):
+        """Test that close also closes async clients, on their event loop."""
+
+        async def main():
+            client = pool.get_async(api_server.url, "key")
+            (await client.get("/a")).raise_for_status()
+            pool.close()
+            await asyncio.sleep(0.05)
+            return client
+
+        assert asyncio.run(main()).is_closed
+        assert len(pool) == 0
+
+    def test_closed_client_replaced(self, pool, api_server):
+        """Test that a client closed by a caller is recreated."""
+        client = pool.get(api_server.url, "key")
+        client.close()
+        assert not pool.get(api_server.url, "key").is_closed
+
+    def test_idle_clients_closed(self, api_server, clock):
+        """Test that clients unused for idle_timeout are closed when the pool is next used."""
+        pool = ClientPool(idle_timeout=60.0, clock=clock)
+        try:
+            client = pool.get(api_server.url, "a")
+            clock.now = 30.0
+            other = pool.get(api_server.url, "b")
+            clock.now = 60.0
+            pool.get(api_server.url, "b")
+            assert client.is_closed and not other.is_closed
+            assert len(pool) == 1
+        finally:
+            pool.close()
+
+    def test_evict_idle(self, api_server, clock):
+        """Test that evict_idle closes idle clients without another use of the pool."""
+        pool = ClientPool(idle_timeout=60.0, clock=clock)
+        client = pool.get(api_server.url, "a")
+        clock.now = 60.0
+        pool.evict_idle()
+        assert client.is_closed
+        assert len(pool) == 0
+
+    def test_max_clients(self, api_server, clock):
+        """Test that the least recently used clients beyond max_clients are closed."""
+        pool = ClientPool(max_clients=2, clock=clock)
+        try:
+            clients = [pool.get(api_server.url, key) for key in "ab"]
+            pool.get(api_server.url, "a")
+            pool.get(api_server.url, "c")
+            assert clients[1].is_closed and not clients[0].is_closed
+            assert len(pool) == 2
+        finally:
+            pool.close()
+
+    def test_async_clients_evicted(self, api_server, clock):
+        """Test that evicted async clients are closed, and counted against max_clients."""
+        pool = ClientPool(max_clients=2, clock=clock)
+
+        async def main():
+            first = pool.get_async(api_server.url, "a")
+            (await first.get("/a")).raise_for_status()
+            pool.get(api_server.url, "b")
+            pool.get_async(api_server.url, "c")
+            await asyncio.sleep(0.05)
+            await pool.aclose()
+            return first
+
+        assert asyncio.run(main()).is_closed
+        assert len(pool) == 1
+        pool.close()
+
+    def test_clients_of_finished_loops_forgotten(self, api_server):
+        """Test that async clients of closed event loops are dropped."""
+        pool = ClientPool()
+
+        async def main():
+            return pool.get_async(api_server.url, "a")
+
+        first = asyncio.run(main())
+        second = asyncio.run(main())
+        assert second is not first
+        assert len(pool) == 1
+
+    def test_configure(self, pool, api_server):
+        """Test that configure applies to new clients."""
+        client = pool.get(api_server.url, "key")
+        pool.configure(max_connections=2, timeout=1.0)
+        assert client.is_closed
+        new_client = pool.get(api_server.url, "key")
+        assert new_client._transport._pool._max_connections == 2
+        assert new_client.timeout.read == 1.0
@@ -0,0 +1,260 @@
+"""Test suite for Dates and DateTimes collections."""
+import json
+import pickle
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from pydantic import TypeAdapter, ValidationError
+from tektome import DateArray, Dates, DateTime, DateTimeArray, DateTimes, parse_value
+from tektome import temporal
+
+TOKYO = timezone(timedelta(hours=9))
+DATETIME_STRINGS = [
+    "2025-11-17T14:30:00",
+    "2025-11-17T14:30:00.123456+09:00",
+    "2025-01-01T00:00:00Z",
+    "2024-12-31T23:59:59-05:30",
+    "1969-07-20T20:17:40Z",
+]
+
+
+@pytest.fixture(params=["numpy", "python"], autouse=True)
+def backend(request, monkeypatch):
+    """Run each test with and without numpy."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(temporal, "np", None)
+    return request.param
+
+
+class TestDates:
+    """Test the Dates collection."""
+
+    def test_create(self, sample_date):
+        """Test creating Dates from dates and strings."""
+        dates = Dates(values=[sample_date, "2020-02-29"], kind="date[]")
+        assert isinstance(dates.values, DateArray)
+        assert list(dates.values) == [sample_date, date(2020, 2, 29)]
+        assert dates.kind == "date[]"
+
+    def test_json_round_trip(self):
+        """Test that dumps reproduce the input JSON."""
+        raw = '{"values":["2025-11-17","1900-01-01","2100-12-31"],"kind":"date[]"}'
+        dates = Dates.model_validate_json(raw)
+        assert dates.model_dump_json() == raw
+        assert dates.model_dump() == {
+            "values": [date(2025, 11, 17), date(1900, 1, 1), date(2100, 12, 31)],
+            "kind": "date[]",
+        }
+
+    def test_invalid_value(self):
+        """Test that invalid dates are reported at their index."""
+        with pytest.raises(ValidationError) as exc_info:
+            Dates(values=["2025-11-17", "2025-02-30"], kind="date[]")
+        assert exc_info.value.errors()[0]["loc"] == ("values", 1)
+
+    def test_invalid_kind(self, sample_date):
+        """Test that the kind is checked."""
+        with pytest.raises(ValidationError, match="kind must be 'date\\[\\]'"):
+            Dates(values=[sample_date], kind="date")
+
+    def test_min_max_sorted_between(self):
+        """Test vectorized queries."""
+        dates = Dates(values=["2025-03-01", "2024-01-01", "2025-01-01", "2024-06-30"], kind="date[]")
+        assert dates.min() == date(2024, 1, 1)
+        assert dates.max() == date(2025, 3, 1)
+        assert list(dates.sorted().values) == [date(2024, 1, 1), date(2024, 6, 30), date(2025, 1, 1), date(2025, 3, 1)]
+        assert list(dates.sorted(reverse=True).values)[0] == date(2025, 3, 1)
+        selected = dates.between(date(2024, 6, 30), date(2025, 3, 1))
+        assert isinstance(selected, Dates)
+        assert list(selected.values) == [date(2025, 1, 1), date(2024, 6, 30)]
+        assert list(dates.between(stop=date(2024, 6, 30)).values) == [date(2024, 1, 1)]
+
+    def test_empty(self):
+        """Test that min and max of nothing raise."""
+        dates = Dates(values=[], kind="date[]")
+        with pytest.raises(ValueError):
+            dates.min()
+        assert len(dates.sorted().values) == 0
+
+    def test_parse_value(self):
+        """Test that parse_value dispatches on 'date[]'."""
+        assert isinstance(parse_value({"values": ["2025-11-17"], "kind": "date[]"}), Dates)
+
+
+class TestDateTimes:
+    """Test the DateTimes collection."""
+
+    def test_json_round_trip(self):
+        """Test that offsets, naive values and microseconds survive a round trip."""
+        raw = json.dumps({"values": DATETIME_STRINGS, "kind": "datetime[]"}, separators=(",", ":"))
+        values = DateTimes.model_validate_json(raw)
+        assert values.model_dump_json() == raw
+        assert DateTimes.model_validate_json(values.model_dump_json()) == values
+
+    def test_values_read_back(self):
+        """Test that elements keep their offset or naivety."""
+        values = DateTimes(values=DATETIME_STRINGS, kind="datetime[]").values
+        assert isinstance(values, DateTimeArray)
+        assert values[0] == datetime(2025, 11, 17, 14, 30) and values[0].tzinfo is None
+        assert values[1] == datetime(2025, 11, 17, 14, 30, 0, 123456, tzinfo=TOKYO)
+        assert values[1].utcoffset() == timedelta(hours=9)
+        assert values[4] == datetime(1969, 7, 20, 20, 17, 40, tzinfo=timezone.utc)
+        assert values[1].tzinfo is DateTimes(values=[values[1]], kind="datetime[]").values[0].tzinfo
+
+    def test_python_datetimes(self, sample_datetime):
+        """Test creating DateTimes from datetime objects."""
+        aware = datetime(2025, 1, 1, 9, tzinfo=TOKYO)
+        values = DateTimes(values=[sample_datetime, aware], kind="datetime[]").values
+        assert list(values) == [sample_datetime, aware]
+
+    def test_queries_compare_instants(self):
+        """Test that ordering uses UTC instants, naive values counting as UTC."""
+        values = DateTimes(values=DATETIME_STRINGS, kind="datetime[]")
+        assert values.min() == datetime(1969, 7, 20, 20, 17, 40, tzinfo=timezone.utc)
+        assert values.max() == datetime(2025, 11, 17, 14, 30)
+        ordered = list(values.sorted().values)
+        assert [value.isoformat() for value in ordered[1:3]] == [
+            "2025-01-01T00:00:00+00:00",
+            "2024-12-31T23:59:59-05:30",
+        ]
+        start = datetime(2025, 1, 1, 3, tzinfo=timezone.utc)
+        assert list(values.between(start, datetime(2025, 11, 17, 6, tzinfo=timezone.utc)).values) == [
+            datetime(2025, 11, 17, 14, 30, 0, 123456, tzinfo=TOKYO),
+            datetime(2024, 12, 31, 23, 59, 59, tzinfo=timezone(timedelta(hours=-5, minutes=-30))),
+        ]
+
+    def test_values_near_limits(self):
+        """Test that aware values whose UTC instant is out of datetime's range round-trip."""
+        strings = ["9999-12-31T23:59:59-01:00", "0001-01-01T00:00:00+01:00", "9999-12-31T23:59:59.999999-23:59"]
+        raw = json.dumps({"values": strings, "kind": "datetime[]"}, separators=(",", ":"))
+        values = DateTimes.model_validate_json(raw)
+        assert values.model_dump_json() == raw
+        assert list(values.values) == [datetime.fromisoformat(value) for value in strings]
+        assert DateTimes(values=list(values.values), kind="datetime[]") == values
+        assert values.max() == datetime.fromisoformat(strings[2])
+        late = datetime(9999, 12, 31, 23, tzinfo=timezone(timedelta(hours=-1)))
+        assert list(values.between(late).values) == [datetime.fromisoformat(strings[0]), values.max()]
+
+    def test_invalid_value(self):
+        """Test that invalid datetimes are reported at their index."""
+        with pytest.raises(ValidationError) as exc_info:
+            DateTimes(values=["2025-11-17T14:30:00", "yesterday"], kind="datetime[]")
+        assert exc_info.value.errors()[0]["loc"] == ("values", 1)
+
+    def test_parse_value(self):
+        """Test that parse_value dispatches on 'datetime[]'."""
+        assert isinstance(parse_value('{"values": [], "kind": "datetime[]"}'), DateTimes)
+
+
+class TestParsing:
+    """Test that the canonical ISO-8601 fast path agrees with pydantic."""
+
+    def test_canonical_shapes(self):
+        """Test every canonical layout against pydantic's datetime parsing."""
+        strings = [
+            f"{day}T{time}{fraction}{suffix}"
+            for day in ("0001-01-01", "1969-12-31", "2024-02-29", "9999-12-31")
+            for time in ("00:00:00", "23:59:59")
+            for fraction in ("", ".123", ".000001")
+            for suffix in ("", "Z", "+09:00", "-05:30", "-00:00", "+14:00")
+            if not (day == "0001-01-01" and suffix.startswith("+"))
+            and not (day == "9999-12-31" and suffix.startswith("-"))
+        ]
+        expected = TypeAdapter(list[datetime]).validate_python(strings)
+        values = DateTimes(values=strings, kind="datetime[]").values
+        assert list(values) == expected
+        assert [value.utcoffset() for value in values] == [value.utcoffset() for value in expected]
+
+    def test_other_formats_fall_back(self):
+        """Test that values outside the fast path are parsed as before."""
+        strings = ["2025-11-17T14:30:00Z", "2025-11-17 14:30:00", "2025-11-17T14:30:00.5+09:00", "2025-11-17"]
+        expected = TypeAdapter(list[datetime]).validate_python(strings)
+        assert list(DateTimes(values=strings, kind="datetime[]").values) == expected
+
+    @pytest.mark.parametrize(
+        "invalid",
+        [
+            "2023-02-29T00:00:00",
+            "0000-01-01T00:00:00Z",
+            "2025-11-17T24:00:00+09:00",
+            "2025-11-17T10:00:00+24:00",
+            "2025-13-01T00:00:00.000Z",
+            "２０２５-11-17T00:00:00",
+        ],
+    )
+    def test_invalid_canonical_values(self, invalid):
+        """Test that values the fast path rejects are reported at their index."""
+        with pytest.raises(ValidationError) as exc_info:
+            DateTimes(values=["2025-11-17T14:30:00Z", invalid], kind="datetime[]")
+        assert exc_info.value.errors()[0]["loc"] == ("values", 1)
+
+    def test_tzinfo_shared(self):
+        """Test that values with the same offset share one tzinfo."""
+        values = DateTimes(values=DATETIME_STRINGS[1:2] * 3, kind="datetime[]").values
+        assert len({id(value.tzinfo) for value in values}) == 1
+
+    def test_utc_variant(self):
+        """Test normalizing every value to UTC."""
+        model = DateTimes.variant(tz="utc")
+        values = model(values=DATETIME_STRINGS, kind="datetime[]").values
+        assert [value.tzinfo for value in values] == [timezone.utc] * len(DATETIME_STRINGS)
+        assert values[0] == datetime(2025, 11, 17, 14, 30, tzinfo=timezone.utc)
+        assert values[1] == datetime(2025, 11, 17, 5, 30, 0, 123456, tzinfo=timezone.utc)
+        assert model is DateTimes.variant(tz="utc") and model.variant() is DateTimes
+        assert issubclass(model, DateTimes)
+
+    def test_utc_variant_out_of_range(self):
+        """Test that values whose UTC instant is out of datetime's range fail validation."""
+        with pytest.raises(ValidationError, match="out of range in UTC"):
+            DateTimes.variant(tz="utc")(values=["2025-01-01T00:00:00Z", "9999-12-31T23:59:59-01:00"], kind="datetime[]")
+        with pytest.raises(ValidationError, match="out of range in UTC"):
+            DateTime.variant(tz="utc")(value="0001-01-01T00:00:00+01:00", kind="datetime")
+
+
+class TestArrays:
+    """Test DateArray and DateTimeArray."""
+
+    def test_storage(self):
+        """Test the raw days and microseconds."""
+        assert list(DateArray([date(1970, 1, 2), date(1969, 12, 31)]).days) == [1, -1]
+        array = DateTimeArray([datetime(1970, 1, 1, 9, tzinfo=TOKYO), datetime(1970, 1, 1, 0, 0, 1)])
+        assert list(array.micros) == [0, 1_000_000]
+        assert list(array.offsets) == [9 * 3600, temporal.NAIVE]
+
+    def test_from_raw(self):
+        """Test building arrays from days and microseconds."""
+        assert DateArray.from_days([0]) == [date(1970, 1, 1)]
+        assert DateTimeArray.from_micros([0]) == [datetime(1970, 1, 1, tzinfo=timezone.utc)]
+        with pytest.raises(ValueError):
+            DateTimeArray.from_micros([0, 1], [0])
+
+    def test_slicing_and_pickle(self, sample_datetime):
+        """Test slices and pickling."""
+        array = DateTimeArray([sample_datetime, datetime(2025, 1, 1, tzinfo=TOKYO)] * 2)
+        assert array[1:3] == [datetime(2025, 1, 1, tzinfo=TOKYO), sample_datetime]
+        assert array[-1] == datetime(2025, 1, 1, tzinfo=TOKYO)
+        assert pickle.loads(pickle.dumps(array)) == array
+        dates = DateArray([date(2025, 1, 1)])
+        assert pickle.loads(pickle.dumps(dates)) == dates
+        with pytest.raises(IndexError):
+            dates[1]
+
+    def test_instance_reused(self):
+        """Test that validating an existing array keeps it."""
+        array = DateArray([date(2025, 1, 1)])
+        assert Dates(values=array, kind="date[]").values is array
+
+    def test_to_numpy(self, backend):
+        """Test the datetime64 views."""
+        dates = DateArray([date(2025, 11, 17)])
+        stamps = DateTimeArray([datetime(2025, 11, 17, 9, tzinfo=TOKYO)])
+        if backend == "python":
+            with pytest.raises(ImportError):
+                dates.to_numpy()
+            return
+        import numpy as np
+
+        assert dates.to_numpy()[0] == np.datetime64("2025-11-17")
+        assert stamps.to_numpy()[0] == np.datetime64("2025-11-17T00:00:00")
+        assert not dates.to_numpy().flags.writeable
@@ -1,5 +1,5 @@
 """Test suite for DateTime class."""
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import pytest
 from pydantic import ValidationError
 from tektome import DateTime
@@ -159,6 +159,33 @@ class TestDateTimeEdgeCases:
         assert datetime_obj.value.microsecond == 123456
 
 
+class TestDateTimeUtcVariant:
+    """Test DateTime.variant(tz="utc")."""
+
+    def test_values_converted_to_utc(self):
+        """Test that aware values are converted and naive values taken as UTC."""
+        model = DateTime.variant(tz="utc")
+        aware = model(value="2025-11-17T14:30:00+09:00", kind="datetime")
+        naive = model.model_validate_json('{"value": "2025-11-17T14:30:00", "kind": "datetime"}')
+        assert aware.value == datetime(2025, 11, 17, 5, 30, tzinfo=timezone.utc)
+        assert aware.value.tzinfo is timezone.utc
+        assert naive.value == datetime(2025, 11, 17, 14, 30, tzinfo=timezone.utc)
+        assert model(value=datetime(2025, 1, 1, tzinfo=timezone(timedelta(hours=-5))), kind="datetime").value.hour == 5
+
+    def test_variant_class(self):
+        """Test that the variant is a cached subclass resolving back to DateTime."""
+        model = DateTime.variant(tz="utc")
+        assert model is DateTime.variant(tz="utc")
+        assert issubclass(model, DateTime)
+        assert model.variant() is DateTime
+        assert DateTime.variant() is DateTime
+
+    def test_invalid_tz(self):
+        """Test that unknown options are rejected."""
+        with pytest.raises(ValueError, match="tz must be"):
+            DateTime.variant(tz="Asia/Tokyo")
+
+
 class TestDateTimeValidateCall:
     """Test DateTime with validate_call decorator."""
 
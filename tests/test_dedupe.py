@@ -0,0 +1,129 @@
+"""Test suite for deduplicating id collections at validation time."""
+import json
+import uuid
+import pytest
+from pydantic import ValidationError
+from tektome import AttributeDefinitions, Projects, Resources
+from tektome import ids as ids_module
+from tektome.ids import LazyUUIDs, UUIDArray, dedupe
+
+
+@pytest.fixture(params=["list", "compact", "lazy"])
+def storage(request):
+    """Return an id storage backend."""
+    return request.param
+
+
+@pytest.fixture
+def ids():
+    """Return ids with repeats, as (input, first-occurrence order, sorted order)."""
+    a, b, c = (uuid.uuid4() for _ in range(3))
+    given = [c, a, c, b, a, a]
+    return given, [c, a, b], sorted([a, b, c], key=lambda value: value.int)
+
+
+class TestDedupeVariants:
+    """Test the dedupe option of IdCollection.variant."""
+
+    def test_first(self, storage, ids):
+        """Test keeping the first occurrence of each id."""
+        given, first, _ = ids
+        resources = Resources.variant(storage=storage, dedupe="first")(ids=given, kind="resource[]")
+        assert list(resources.ids) == first
+        assert resources.duplicates_dropped == 3
+
+    def test_sorted(self, storage, ids):
+        """Test the canonical sorted order."""
+        given, _, ordered = ids
+        projects = Projects.variant(storage=storage, dedupe="sorted")(ids=given, kind="project[]")
+        assert list(projects.ids) == ordered
+        assert projects.duplicates_dropped == 3
+
+    def test_json(self, storage, ids):
+        """Test deduplicating while validating JSON."""
+        given, first, _ = ids
+        raw = json.dumps({"ids": [str(uid) for uid in given], "kind": "attribute_definition[]"})
+        model = AttributeDefinitions.variant(storage=storage, dedupe="first")
+        definitions = model.model_validate_json(raw)
+        assert list(definitions.ids) == first
+        assert definitions.duplicates_dropped == 3
+        assert json.loads(definitions.model_dump_json())["ids"] == [str(uid) for uid in first]
+
+    def test_spellings_of_one_id_merged(self, storage, sample_uuid):
+        """Test that different string forms of an id count as duplicates."""
+        given = [str(sample_uuid), str(sample_uuid).upper(), f"{{{sample_uuid}}}", sample_uuid]
+        resources = Resources.variant(storage=storage, dedupe="first")(ids=given, kind="resource[]")
+        assert list(resources.ids) == [sample_uuid]
+        assert resources.duplicates_dropped == 3
+
+    def test_no_duplicates(self, storage, sample_uuid_list):
+        """Test that unique ids are kept as given."""
+        resources = Resources.variant(storage=storage, dedupe="first")(ids=sample_uuid_list, kind="resource[]")
+        assert list(resources.ids) == sample_uuid_list
+        assert resources.duplicates_dropped == 0
+
+    def test_error_locations_follow_input(self, storage, sample_uuid):
+        """Test that errors point at the original index despite deduplication."""
+        model = Resources.variant(storage=storage, dedupe="first")
+        with pytest.raises(ValidationError) as exc_info:
+            model(ids=[sample_uuid, sample_uuid, sample_uuid, "not-a-uuid"], kind="resource[]")
+        assert exc_info.value.errors()[0]["loc"] == ("ids", 3)
+
+    def test_container_inputs(self, storage, ids):
+        """Test that UUIDArray and LazyUUIDs inputs are deduplicated too."""
+        given, first, _ = ids
+        for container in (UUIDArray.from_uuids(given), LazyUUIDs([str(value) for value in given])):
+            resources = Resources.variant(storage=storage, dedupe="first")(ids=container, kind="resource[]")
+            assert list(resources.ids) == first
+            assert resources.duplicates_dropped == 3
+
+    def test_kind_still_checked(self, sample_uuid):
+        """Test that the kind check is unchanged."""
+        with pytest.raises(ValidationError, match="kind must be 'resource\\[\\]'"):
+            Resources.variant(dedupe="first")(ids=[sample_uuid, sample_uuid], kind="project[]")
+
+    def test_variant_classes(self):
+        """Test that dedupe variants are cached subclasses and resolve back to the base."""
+        model = Resources.variant(storage="compact", dedupe="sorted")
+        assert model is Resources.variant(storage="compact", dedupe="sorted")
+        assert issubclass(model, Resources)
+        assert model.ids_dedupe == "sorted"
+        assert model.variant() is Resources
+        assert Resources.variant(dedupe="first").variant(storage="lazy").ids_dedupe is None
+
+    def test_invalid_dedupe(self):
+        """Test that unknown dedupe orders are rejected."""
+        with pytest.raises(ValueError, match="dedupe must be"):
+            Resources.variant(dedupe="last")
+
+    def test_plain_model_keeps_duplicates(self, ids):
+        """Test that deduplication is opt-in."""
+        given, _, _ = ids
+        resources = Resources(ids=given, kind="resource[]")
+        assert resources.ids == given
+        assert resources.duplicates_dropped == 0
+
+
+@pytest.mark.parametrize("backend", ["numpy", "python"])
+class TestDedupeFunction:
+    """Test tektome.ids.dedupe for each container."""
+
+    @pytest.fixture(autouse=True)
+    def _backend(self, backend, monkeypatch):
+        if backend == "numpy":
+            pytest.importorskip("numpy")
+        else:
+            monkeypatch.setattr(ids_module, "np", None)
+
+    @pytest.mark.parametrize("container", [list, UUIDArray.from_uuids, LazyUUIDs])
+    def test_orders(self, backend, container, ids):
+        """Test first-occurrence and sorted orders."""
+        given, first, ordered = ids
+        assert list(dedupe(container(given))) == first
+        assert list(dedupe(container(given), "sorted")) == ordered
+        assert type(dedupe(container(given))) is type(container(given))
+
+    def test_invalid_order(self, backend, ids):
+        """Test that unknown orders are rejected."""
+        with pytest.raises(ValueError):
+            dedupe(ids[0], "last")
@@ -0,0 +1,258 @@
+"""Test suite for the persistent disk cache."""
+import sqlite3
+import threading
+import uuid
+import pytest
+from tektome import Context, Resource
+from tektome import disk_cache
+from tektome.cache import default_cache
+from tektome.client import default_pool
+from tektome.disk_cache import DiskCache, Stored
+from tektome.fetch import cache_key, principal
+
+httpx = pytest.importorskip("httpx")
+
+
+def _key():
+    return ("https://example.com/", principal("secret"), "resource", uuid.uuid4())
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    """Return a disk cache in a temporary directory."""
+    cache = DiskCache(tmp_path, clock=clock)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def context(api_server, sample_uuid, tmp_path):
+    """Return a Context pointing at the local API server, with the disk cache enabled."""
+    disk_cache.enable(tmp_path)
+    yield Context(user_api_key="secret", base_url=api_server.url, execution_id=sample_uuid)
+    disk_cache.disable()
+    default_pool.close()
+    default_cache.clear()
+
+
+class TestDiskCache:
+    """Test DiskCache."""
+
+    def test_get_and_set(self, cache):
+        """Test that stored bodies are returned with their ETag."""
+        key = _key()
+        assert cache.get(key) is None
+        cache.set(key, b'{"a": 1}', etag='"abc"')
+        assert cache.get(key) == Stored(b'{"a": 1}', '"abc"', True)
+        assert len(cache) == 1
+
+    def test_persists_across_instances(self, cache, tmp_path):
+        """Test that a new cache on the same directory sees the entries."""
+        key = _key()
+        cache.set(key, b"1")
+        reopened = DiskCache(tmp_path)
+        assert reopened.get(key).body == b"1"
+        reopened.close()
+
+    def test_key_includes_base_url_principal_and_kind(self, cache):
+        """Test that entries are keyed by (base_url, principal, kind, id)."""
+        base_url, owner, kind, id = _key()
+        cache.set((base_url, owner, kind, id), b"1")
+        assert cache.get(("https://other.com/", owner, kind, id)) is None
+        assert cache.get((base_url, principal("other"), kind, id)) is None
+        assert cache.get((base_url, owner, "project", id)) is None
+        cache.touch((base_url, principal("other"), kind, id))
+        cache.invalidate((base_url, principal("other"), kind, id))
+        assert cache.get((base_url, owner, kind, id)).body == b"1"
+
+    def test_overwrite(self, cache):
+        """Test that setting a key again replaces its body and size."""
+        key = _key()
+        cache.set(key, b"12345")
+        cache.set(key, b"1")
+        assert cache.get(key).body == b"1"
+        assert cache.stats().bytes == 1
+        assert cache.stats().entries == 1
+
+    def test_lru_by_count(self, cache, clock):
+        """Test that the least recently used entry is evicted first."""
+        cache.configure(max_entries=2)
+        keys = [_key() for _ in range(3)]
+        cache.set(keys[0], b"1")
+        clock.now += 1
+        cache.set(keys[1], b"2")
+        clock.now += 1
+        cache.get(keys[0])
+        clock.now += 1
+        cache.set(keys[2], b"3")
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.stats().evictions == 1
+
+    def test_reads_do_not_write(self, cache):
+        """Test that a read succeeds while another connection holds the write lock."""
+        key = _key()
+        cache.set(key, b"1")
+        cache._connect().execute("PRAGMA busy_timeout = 100")
+        writer = sqlite3.connect(cache.path, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            assert cache.get(key).body == b"1"
+        finally:
+            writer.execute("ROLLBACK")
+            writer.close()
+
+    def test_access_times_written_in_batches(self, cache, clock, monkeypatch):
+        """Test that access times are buffered until a batch is full or the cache is closed."""
+        monkeypatch.setattr(disk_cache, "ACCESS_BATCH", 2)
+        keys = [_key() for _ in range(3)]
+        for key in keys:
+            cache.set(key, b"1")
+
+        def accessed():
+            with sqlite3.connect(cache.path) as connection:
+                return sorted(row[0] for row in connection.execute("SELECT accessed FROM entries"))
+
+        clock.now += 10
+        cache.get(keys[0])
+        assert accessed() == [clock.now - 10] * 3
+        cache.get(keys[1])
+        assert accessed() == [clock.now - 10, clock.now, clock.now]
+        cache.get(keys[2])
+        cache.close()
+        assert accessed() == [clock.now] * 3
+
+    def test_lru_by_bytes(self, cache, clock):
+        """Test that entries are evicted to respect max_bytes."""
+        cache.configure(max_bytes=10)
+        keys = [_key() for _ in range(3)]
+        for key in keys:
+            cache.set(key, b"12345")
+            clock.now += 1
+        assert cache.get(keys[0]) is None
+        assert cache.stats().bytes == 10
+
+    def test_oversized_body_not_stored(self, cache):
+        """Test that a body larger than max_bytes is skipped."""
+        cache.configure(max_bytes=4)
+        key = _key()
+        cache.set(key, b"12345")
+        assert cache.get(key) is None
+
+    def test_stale_after_ttl(self, cache, clock):
+        """Test that old entries are kept but reported stale until touched."""
+        key = _key()
+        cache.set(key, b"1", etag='"e"')
+        clock.now += cache.ttl
+        assert cache.get(key) == Stored(b"1", '"e"', False)
+        cache.touch(key)
+        assert cache.get(key).fresh
+        assert cache.stats().expirations == 1
+
+    def test_invalidate_and_clear(self, cache):
+        """Test dropping entries."""
+        keys = [_key() for _ in range(2)]
+        for key in keys:
+            cache.set(key, b"1")
+        cache.invalidate(keys[0])
+        assert cache.get(keys[0]) is None and cache.get(keys[1]) is not None
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats().bytes == 0
+
+    def test_format_version_mismatch_resets(self, cache, tmp_path):
+        """Test that a database written by another layout version is discarded."""
+        cache.set(_key(), b"1")
+        with sqlite3.connect(cache.path) as connection:
+            connection.execute("PRAGMA user_version = 999")
+        reopened = DiskCache(tmp_path)
+        assert len(reopened) == 0
+        reopened.close()
+
+    def test_threads(self, cache):
+        """Test concurrent writers from several threads."""
+        keys = [_key() for _ in range(50)]
+
+        def write(chunk):
+            for key in chunk:
+                cache.set(key, b"x" * 10)
+
+        threads = [threading.Thread(target=write, args=(keys[i::5],)) for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert cache.stats().entries == 50
+        assert cache.stats().bytes == 500
+
+
+class TestDefaultDiskCache:
+    """Test enabling the process-wide disk cache."""
+
+    def test_disabled_by_default(self, monkeypatch):
+        """Test that no disk cache is used unless configured."""
+        monkeypatch.delenv(disk_cache.ENV_DIRECTORY, raising=False)
+        monkeypatch.setattr(disk_cache, "_initialized", False)
+        assert disk_cache.default_disk_cache() is None
+
+    def test_environment(self, monkeypatch, tmp_path):
+        """Test that TEKTOME_CACHE_DIR enables the disk cache."""
+        monkeypatch.setenv(disk_cache.ENV_DIRECTORY, str(tmp_path))
+        monkeypatch.setattr(disk_cache, "_initialized", False)
+        try:
+            assert disk_cache.default_disk_cache().path.parent == tmp_path
+        finally:
+            disk_cache.disable()
+
+
+class TestFetchThroughDisk:
+    """Test that Context-based fetches use the disk cache."""
+
+    def test_cold_start_served_from_disk(self, context, api_server, sample_uuid):
+        """Test that a warm key makes no request after the memory cache is lost."""
+        resource = Resource(id=sample_uuid, kind="resource")
+        first = resource.fetch(context)
+        default_cache.clear()
+        assert resource.fetch(context) == first
+        assert len(api_server.requests) == 1
+        assert context.disk_cache().get(cache_key(context, "resource", sample_uuid)).etag
+
+    def test_stale_entry_revalidated(self, context, api_server, sample_uuid):
+        """Test that a stale entry is revalidated with its ETag."""
+        resource = Resource(id=sample_uuid, kind="resource")
+        first = resource.fetch(context)
+        etag = context.disk_cache().get(cache_key(context, "resource", sample_uuid)).etag
+        default_cache.clear()
+        context.disk_cache().configure(ttl=0)
+        assert resource.fetch(context) == first
+        assert len(api_server.requests) == 2
+        assert api_server.requests[1]["headers"]["If-None-Match"] == etag
+
+    def test_changed_entry_replaced(self, context, api_server, sample_uuid):
+        """Test that a stale entry whose ETag changed is downloaded again."""
+        resource = Resource(id=sample_uuid, kind="resource")
+        resource.fetch(context)
+        default_cache.clear()
+        context.disk_cache().configure(ttl=0)
+        api_server.routes[f"/api/resources/{sample_uuid}"] = (200, {"changed": True})
+        assert resource.fetch(context) == {"changed": True}
+
+    @pytest.mark.parametrize("ttl", [300, 0], ids=["fresh", "stale"])
+    def test_entries_scoped_to_api_key(self, context, api_server, sample_uuid, ttl):
+        """Test that another API key is neither served nor revalidated against an entry."""
+
+        def authorize(handler):
+            if handler.headers["Authorization"] != "Bearer secret":
+                return 403, {"detail": "forbidden"}
+            return None
+
+        api_server.routes["*"] = authorize
+        resource = Resource(id=sample_uuid, kind="resource")
+        resource.fetch(context)
+        default_cache.clear()
+        context.disk_cache().configure(ttl=ttl)
+        other = Context(user_api_key="other", base_url=str(context.base_url), execution_id=sample_uuid)
+        with pytest.raises(httpx.HTTPStatusError) as exc_info:
+            resource.fetch(other)
+        assert exc_info.value.response.status_code == 403
+        assert "If-None-Match" not in api_server.requests[1]["headers"]
@@ -0,0 +1,184 @@
+"""Test suite for concurrent fetching of collection ids."""
+import asyncio
+import threading
+import time
+import uuid
+import pytest
+from tektome import Context, Fetched, Projects, Resources
+from tektome.cache import default_cache
+from tektome.client import default_pool
+from tektome import fetch as fetch_module
+from tektome.fetch import endpoint, register_endpoint
+
+httpx = pytest.importorskip("httpx")
+
+
+@pytest.fixture
+def context(api_server, sample_uuid):
+    """Return a Context pointing at the local API server."""
+    yield Context(user_api_key="secret", base_url=api_server.url, execution_id=sample_uuid)
+    default_pool.close()
+    default_cache.clear()
+
+
+def _run(coroutine):
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await default_pool.aclose()
+
+    return asyncio.run(main())
+
+
+class TestFetchAll:
+    """Test IdCollection.fetch_all."""
+
+    def test_results_in_input_order(self, context, api_server):
+        """Test that results follow the order of ids."""
+        ids = [uuid.uuid4() for _ in range(20)]
+        results = _run(Resources(ids=ids, kind="resource[]").fetch_all(context, concurrency=4))
+        assert [result.id for result in results] == ids
+        assert all(result.ok for result in results)
+        assert results[3].data == {"path": f"/api/resources/{ids[3]}", "authorization": "Bearer secret"}
+
+    def test_endpoint_follows_kind(self, context, sample_uuid):
+        """Test that projects are fetched from the project endpoint."""
+        results = _run(Projects(ids=[sample_uuid], kind="project[]").fetch_all(context))
+        assert results[0].data["path"] == f"/api/projects/{sample_uuid}"
+
+    def test_failures_reported_per_id(self, context, api_server):
+        """Test that failed requests do not cancel the batch."""
+        ids = [uuid.uuid4() for _ in range(5)]
+        api_server.routes[f"/api/resources/{ids[1]}"] = (404, {"detail": "not found"})
+        api_server.routes[f"/api/resources/{ids[3]}"] = (500, {"detail": "boom"})
+        results = _run(Resources(ids=ids, kind="resource[]").fetch_all(context, concurrency=2))
+        assert [result.ok for result in results] == [True, False, True, False, True]
+        assert isinstance(results[1].error, httpx.HTTPStatusError)
+        assert results[1].error.response.status_code == 404
+        assert results[1].data is None
+        assert len(api_server.requests) == 5
+
+    def test_concurrency_is_bounded(self, context, api_server):
+        """Test that no more than `concurrency` requests are in flight."""
+        lock = threading.Lock()
+        state = {"in_flight": 0, "max": 0}
+
+        def slow(handler):
+            with lock:
+                state["in_flight"] += 1
+                state["max"] = max(state["max"], state["in_flight"])
+            time.sleep(0.02)
+            with lock:
+                state["in_flight"] -= 1
+            return 200, {}
+
+        api_server.routes["*"] = slow
+        ids = [uuid.uuid4() for _ in range(24)]
+        _run(Resources(ids=ids, kind="resource[]").fetch_all(context, concurrency=3))
+        assert state["max"] == 3
+
+    def test_completion_order(self, context, api_server):
+        """Test that unordered results come back as requests complete."""
+        ids = [uuid.uuid4() for _ in range(3)]
+
+        def delayed(handler):
+            time.sleep(0.2 if handler.path.endswith(str(ids[0])) else 0)
+            return 200, {}
+
+        api_server.routes["*"] = delayed
+        results = _run(Resources(ids=ids, kind="resource[]").fetch_all(context, ordered=False))
+        assert sorted(r.id for r in results) == sorted(ids)
+        assert results[-1].id == ids[0]
+
+    def test_other_caller_cancelled(self, context, api_server):
+        """Test that cancelling another caller's fetch of the same ids does not fail this batch."""
+        ids = [uuid.uuid4() for _ in range(4)]
+
+        def slow(handler):
+            time.sleep(0.05)
+            return 200, {}
+
+        api_server.routes["*"] = slow
+        resources = Resources(ids=ids, kind="resource[]")
+
+        async def main():
+            other = asyncio.ensure_future(resources.fetch_all(context))
+            await asyncio.sleep(0.02)
+            batch = asyncio.ensure_future(resources.fetch_all(context))
+            await asyncio.sleep(0.01)
+            other.cancel()
+            return await batch
+
+        results = _run(main())
+        assert all(result.ok for result in results)
+
+    def test_iter_fetch(self, context):
+        """Test streaming results with iter_fetch."""
+        ids = [uuid.uuid4() for _ in range(10)]
+        resources = Resources(ids=ids, kind="resource[]")
+
+        async def collect():
+            return [fetched async for fetched in resources.iter_fetch(context, concurrency=4)]
+
+        results = _run(collect())
+        assert sorted(r.id for r in results) == sorted(ids)
+        assert all(isinstance(r, Fetched) for r in results)
+
+    def test_empty_collection(self, context):
+        """Test fetching an empty collection."""
+        assert _run(Resources(ids=[], kind="resource[]").fetch_all(context)) == []
+
+    def test_invalid_concurrency(self, context, sample_uuid_list):
+        """Test that concurrency must be positive."""
+        with pytest.raises(ValueError):
+            _run(Resources(ids=sample_uuid_list, kind="resource[]").fetch_all(context, concurrency=0))
+
+
+class TestAsyncClient:
+    """Test Context.async_client."""
+
+    def test_shared_within_loop(self, context):
+        """Test that one async client is shared per loop and key."""
+
+        async def clients():
+            return context.async_client(), context.async_client()
+
+        first, second = _run(clients())
+        assert first is second
+        assert isinstance(first, httpx.AsyncClient)
+        assert first.is_closed
+
+    def test_new_client_per_loop(self, context):
+        """Test that each event loop gets its own client."""
+
+        async def client():
+            return context.async_client()
+
+        assert _run(client()) is not _run(client())
+
+
+class TestEndpoint:
+    """Test endpoint lookup."""
+
+    def test_item_and_collection_kinds(self, monkeypatch):
+        """Test that item and collection kinds share an endpoint."""
+        monkeypatch.setattr(fetch_module, "ENDPOINTS", {})
+        register_endpoint("resource[]", "v2/resources/{id}")
+        assert endpoint("resource") == endpoint("resource[]") == "v2/resources/{id}"
+
+    def test_none_registered_by_default(self, monkeypatch):
+        """Test that fetching needs the deployment's endpoints to be registered first."""
+        monkeypatch.setattr(fetch_module, "ENDPOINTS", {})
+        with pytest.raises(ValueError, match="register_endpoint"):
+            endpoint("resource")
+
+    def test_unknown_kind(self, api_server):
+        """Test that unknown kinds are rejected."""
+        with pytest.raises(ValueError):
+            endpoint("date")
+
+    def test_template_needs_id(self):
+        """Test that templates must place the id."""
+        with pytest.raises(ValueError, match="{id}"):
+            register_endpoint("resource", "api/resources")
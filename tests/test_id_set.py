@@ -0,0 +1,170 @@
+"""Test suite for IdSet and set operations on id collections."""
+import pickle
+import random
+import uuid
+import pytest
+from tektome import AttributeDefinitions, IdSet, Projects, Resources
+from tektome import ids as ids_module
+from tektome.ids import LazyUUIDs, UUIDArray
+
+
+@pytest.fixture(params=["numpy", "python"], autouse=True)
+def backend(request, monkeypatch):
+    """Run each test with the numpy and the pure Python implementation."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(ids_module, "np", None)
+    return request.param
+
+
+def _sorted(values):
+    return sorted(set(values), key=lambda value: value.int)
+
+
+class TestIdSet:
+    """Test IdSet."""
+
+    def test_sorted_and_unique(self, sample_uuid_list):
+        """Test that ids are deduplicated and ordered as 128-bit integers."""
+        id_set = IdSet(sample_uuid_list + sample_uuid_list[::-1])
+        assert len(id_set) == 3
+        assert list(id_set) == _sorted(sample_uuid_list)
+        assert id_set.buffer.nbytes == 48
+
+    def test_from_strings_and_array(self, sample_uuid_list):
+        """Test building from UUID strings and from a UUIDArray."""
+        expected = IdSet(sample_uuid_list)
+        assert IdSet(str(uid) for uid in sample_uuid_list) == expected
+        assert IdSet(UUIDArray.from_uuids(sample_uuid_list)) == expected
+        assert expected == set(sample_uuid_list)
+
+    def test_contains(self, sample_uuid_list):
+        """Test binary-search membership."""
+        id_set = IdSet(sample_uuid_list)
+        assert all(uid in id_set for uid in sample_uuid_list)
+        assert uuid.uuid4() not in id_set
+        assert str(sample_uuid_list[0]) not in id_set
+        assert uuid.uuid4() not in IdSet()
+
+    def test_contains_bounds(self):
+        """Test membership of the smallest and largest possible ids."""
+        low, high = uuid.UUID(int=0), uuid.UUID(int=2**128 - 1)
+        id_set = IdSet([low, high, uuid.UUID(int=5)])
+        assert low in id_set and high in id_set
+        assert uuid.UUID(int=4) not in id_set
+
+    def test_operations_match_builtin_sets(self):
+        """Test union, intersection and difference against Python sets."""
+        rng = random.Random(0)
+        pool = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(40)]
+        for _ in range(50):
+            a = rng.choices(pool, k=rng.randint(0, 30))
+            b = rng.choices(pool, k=rng.randint(0, 30))
+            left, right = IdSet(a), IdSet(b)
+            assert list(left | right) == _sorted(set(a) | set(b))
+            assert list(left & right) == _sorted(set(a) & set(b))
+            assert list(left - right) == _sorted(set(a) - set(b))
+
+    def test_shared_high_half(self):
+        """Test ids that differ only in their low 64 bits."""
+        rng = random.Random(1)
+        pool = [uuid.UUID(int=(hi << 64) | rng.getrandbits(64)) for hi in (1, 2) for _ in range(10)]
+        for _ in range(20):
+            a = rng.sample(pool, rng.randint(0, 15))
+            b = rng.sample(pool, rng.randint(0, 15))
+            left, right = IdSet(a + a), IdSet(b)
+            assert list(left) == _sorted(a)
+            assert list(left | right) == _sorted(set(a) | set(b))
+            assert list(left & right) == _sorted(set(a) & set(b))
+            assert list(left - right) == _sorted(set(a) - set(b))
+
+    def test_many_ids_share_high_half(self):
+        """Test that large sets differing only in their low 64 bits combine without quadratic work."""
+        a = [uuid.UUID(int=i) for i in range(0, 200_000, 2)]
+        b = [uuid.UUID(int=i) for i in range(0, 200_000, 3)] + [uuid.UUID(int=(1 << 64) - 1)]
+        left, right = IdSet(a), IdSet(b)
+        assert [value.int for value in left & right] == list(range(0, 200_000, 6))
+        assert len(left - right) == len(a) - len(range(0, 200_000, 6))
+        assert len(left | right) == len(set(a) | set(b))
+
+    def test_operations_accept_iterables(self, sample_uuid_list):
+        """Test that the other operand may be any iterable of UUIDs."""
+        id_set = IdSet(sample_uuid_list[:2])
+        assert id_set.union(sample_uuid_list[2:]) == set(sample_uuid_list)
+        assert id_set.intersection(iter(sample_uuid_list[1:])) == {sample_uuid_list[1]}
+
+    def test_to_array_shares_buffer(self, sample_uuid_list):
+        """Test the UUIDArray view of a set."""
+        id_set = IdSet(sample_uuid_list)
+        assert list(id_set.to_array()) == list(id_set)
+        assert id_set.to_array().buffer.obj is id_set.buffer.obj
+
+    def test_pickle(self, sample_uuid_list):
+        """Test pickling round trip."""
+        id_set = IdSet(sample_uuid_list)
+        assert pickle.loads(pickle.dumps(id_set)) == id_set
+
+    def test_cached_on_read_only_storage(self, sample_uuid_list):
+        """Test that compact and lazy containers build their set once."""
+        for container in (UUIDArray.from_uuids(sample_uuid_list), LazyUUIDs(sample_uuid_list)):
+            assert container.id_set() is container.id_set()
+            assert container.id_set() == set(sample_uuid_list)
+
+
+@pytest.fixture(params=["list", "compact", "lazy"])
+def storage(request):
+    """Return an id storage backend."""
+    return request.param
+
+
+class TestCollectionSetOperations:
+    """Test set operations on IdCollection models."""
+
+    def test_operations(self, storage, sample_uuid_list):
+        """Test union, intersection and difference of collections."""
+        model = Resources.variant(storage=storage)
+        extra = uuid.uuid4()
+        left = model(ids=sample_uuid_list[:2] + sample_uuid_list[:1], kind="resource[]")
+        right = model(ids=sample_uuid_list[1:] + [extra], kind="resource[]")
+        assert list((left | right).ids) == _sorted(sample_uuid_list + [extra])
+        assert list((left & right).ids) == [sample_uuid_list[1]]
+        assert list((left - right).ids) == [sample_uuid_list[0]]
+
+    def test_result_is_valid_model(self, storage, sample_uuid_list):
+        """Test that results keep the class, kind and storage of the collection."""
+        model = Projects.variant(storage=storage)
+        result = model(ids=sample_uuid_list, kind="project[]").union([])
+        assert type(result) is model
+        assert isinstance(result, Projects)
+        assert result.kind == "project[]"
+        assert Projects.model_validate_json(result.model_dump_json()).ids == _sorted(sample_uuid_list)
+
+    def test_mixed_storages(self, sample_uuid_list):
+        """Test combining collections with different storages."""
+        left = Resources(ids=sample_uuid_list[:2], kind="resource[]")
+        right = Resources.variant(storage="compact")(ids=sample_uuid_list[1:], kind="resource[]")
+        assert isinstance(left.union(right).ids, list)
+        assert isinstance(right.union(left).ids, UUIDArray)
+        assert set(left.union(right).ids) == set(sample_uuid_list)
+
+    def test_kind_mismatch(self, sample_uuid_list):
+        """Test that collections of different kinds cannot be combined."""
+        resources = Resources(ids=sample_uuid_list, kind="resource[]")
+        projects = Projects(ids=sample_uuid_list, kind="project[]")
+        with pytest.raises(ValueError, match="cannot combine"):
+            resources.intersection(projects)
+
+    def test_contains(self, storage, sample_uuid_list):
+        """Test membership on collections."""
+        model = AttributeDefinitions.variant(storage=storage)
+        collection = model(ids=sample_uuid_list, kind="attribute_definition[]")
+        assert sample_uuid_list[2] in collection
+        assert uuid.uuid4() not in collection
+
+    def test_id_set(self, storage, sample_uuid_list):
+        """Test the IdSet view of a collection."""
+        collection = Resources.variant(storage=storage)(ids=sample_uuid_list, kind="resource[]")
+        assert collection.id_set() == set(sample_uuid_list)
+        if storage != "list":
+            assert collection.id_set() is collection.id_set()
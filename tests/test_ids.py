@@ -0,0 +1,390 @@
+"""Test suite for UUIDArray and compact id storage."""
+import json
+import pickle
+import tracemalloc
+import uuid
+import pytest
+from pydantic import ValidationError
+from tektome import AttributeDefinitions, Projects, Resources
+from tektome.ids import LazyUUIDs, UUIDArray
+
+
+class TestUUIDArray:
+    """Test UUIDArray sequence behaviour."""
+
+    def test_from_uuids(self, sample_uuid_list):
+        """Test packing UUID objects."""
+        array = UUIDArray.from_uuids(sample_uuid_list)
+        assert len(array) == 3
+        assert list(array) == sample_uuid_list
+        assert array.buffer.nbytes == 48
+
+    def test_from_strings(self, sample_uuid_list):
+        """Test packing UUID strings."""
+        array = UUIDArray.from_uuids(str(uid) for uid in sample_uuid_list)
+        assert list(array) == sample_uuid_list
+
+    def test_indexing(self, sample_uuid_list):
+        """Test positive and negative indexing."""
+        array = UUIDArray.from_uuids(sample_uuid_list)
+        assert array[0] == sample_uuid_list[0]
+        assert array[-1] == sample_uuid_list[-1]
+        assert isinstance(array[1], uuid.UUID)
+        with pytest.raises(IndexError):
+            array[3]
+        with pytest.raises(IndexError):
+            array[-4]
+
+    def test_slicing(self, sample_uuid_list):
+        """Test that slices return UUIDArrays."""
+        array = UUIDArray.from_uuids(sample_uuid_list)
+        assert isinstance(array[1:], UUIDArray)
+        assert array[1:] == sample_uuid_list[1:]
+        assert array[::-1] == sample_uuid_list[::-1]
+        assert array[::2] == sample_uuid_list[::2]
+        assert len(array[5:]) == 0
+
+    def test_contains(self, sample_uuid_list, sample_uuid):
+        """Test membership checks."""
+        array = UUIDArray.from_uuids(sample_uuid_list)
+        assert sample_uuid_list[2] in array
+        assert sample_uuid not in array
+        assert str(sample_uuid_list[0]) not in array
+
+    def test_contains_ignores_unaligned_matches(self):
+        """Test that membership only matches whole entries."""
+        a = uuid.UUID(bytes=bytes(range(16)))
+        b = uuid.UUID(bytes=bytes(range(16, 32)))
+        array = UUIDArray.from_uuids([a, b])
+        assert uuid.UUID(bytes=bytes(range(8, 24))) not in array
+
+    def test_contains_after_unaligned_match(self):
+        """Test that an id is found after an unaligned occurrence of its bytes."""
+        needle = uuid.UUID(bytes=b".*[" + bytes(range(13)))  # regex metacharacters are matched literally
+        raw = bytes(8) + needle.bytes + bytes(8) + needle.bytes
+        array = UUIDArray(raw)
+        assert needle in array
+        assert needle in array[2:]
+        assert needle not in array[:2]
+
+    def test_no_copy_of_the_buffer(self):
+        """Test that membership and iteration do not copy the whole buffer."""
+        array = UUIDArray(uuid.uuid4().bytes * 100_000)
+        tracemalloc.start()
+        assert uuid.uuid4() not in array
+        next(iter(array))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert peak < array.buffer.nbytes // 4
+
+    def test_iteration_across_chunks(self):
+        """Test that iteration yields every id when the buffer spans several chunks."""
+        ids = [uuid.uuid4() for _ in range(10_000)]
+        assert list(UUIDArray.from_uuids(ids)) == ids
+
+    def test_equality(self, sample_uuid_list):
+        """Test equality with arrays, lists and tuples."""
+        array = UUIDArray.from_uuids(sample_uuid_list)
+        assert array == UUIDArray.from_uuids(sample_uuid_list)
+        assert array == sample_uuid_list
+        assert array == tuple(sample_uuid_list)
+        assert array != sample_uuid_list[:2]
+        assert array != sample_uuid_list[::-1]
+
+    def test_read_only(self, sample_uuid_list):
+        """Test that the array cannot be modified."""
+        array = UUIDArray.from_uuids(sample_uuid_list)
+        with pytest.raises(TypeError):
+            array[0] = sample_uuid_list[1]
+        with pytest.raises(TypeError):
+            array.buffer[0] = 0
+
+    def test_invalid_buffer_size(self):
+        """Test that the buffer must hold whole ids."""
+        with pytest.raises(ValueError):
+            UUIDArray(b"\x00" * 17)
+
+    def test_pickle(self, sample_uuid_list):
+        """Test pickling round trip."""
+        array = UUIDArray.from_uuids(sample_uuid_list)
+        assert pickle.loads(pickle.dumps(array)) == array
+
+
+class TestCompactVariant:
+    """Test compact storage on the collection models."""
+
+    @pytest.mark.parametrize(
+        "model, kind",
+        [
+            (Resources, "resource[]"),
+            (Projects, "project[]"),
+            (AttributeDefinitions, "attribute_definition[]"),
+        ],
+    )
+    def test_round_trip(self, model, kind, sample_uuid_list):
+        """Test that dumps are identical to the list-backed model."""
+        compact_model = model.variant(storage="compact")
+        plain = model(ids=sample_uuid_list, kind=kind)
+        compact = compact_model(ids=sample_uuid_list, kind=kind)
+        assert isinstance(compact, model)
+        assert isinstance(compact.ids, UUIDArray)
+        assert compact.model_dump() == plain.model_dump()
+        assert compact.model_dump_json() == plain.model_dump_json()
+        assert compact.model_dump(mode="json") == plain.model_dump(mode="json")
+        assert compact_model.model_validate_json(plain.model_dump_json()) == compact
+
+    def test_sequence_access(self, sample_uuid_list):
+        """Test that ids read like a list of UUIDs."""
+        resources = Resources.variant(storage="compact")(ids=sample_uuid_list, kind="resource[]")
+        assert len(resources.ids) == 3
+        assert resources.ids[0] == sample_uuid_list[0]
+        assert list(resources.ids) == sample_uuid_list
+
+    def test_validation_unchanged(self, sample_uuid_list):
+        """Test that ids and kind are still validated."""
+        model = Resources.variant(storage="compact")
+        with pytest.raises(ValidationError):
+            model(ids=["not-a-uuid"], kind="resource[]")
+        with pytest.raises(ValidationError) as exc_info:
+            model(ids=sample_uuid_list, kind="project[]")
+        assert "kind must be 'resource[]'" in str(exc_info.value)
+        with pytest.raises(ValidationError):
+            model(ids=sample_uuid_list, kind="resource[]", extra=1)
+
+    def test_accepts_uuid_array(self, sample_uuid_list):
+        """Test that an existing UUIDArray is accepted as is."""
+        array = UUIDArray.from_uuids(sample_uuid_list)
+        resources = Resources.variant(storage="compact")(ids=array, kind="resource[]")
+        assert resources.ids is array
+
+    def test_variant_is_cached(self):
+        """Test that variants are built once and can be switched back."""
+        compact = Resources.variant(storage="compact")
+        assert Resources.variant(storage="compact") is compact
+        assert compact.variant(storage="compact") is compact
+        assert compact.variant(storage="list") is Resources
+        assert Resources.variant() is Resources
+        assert compact.ids_storage == "compact"
+        assert compact.__name__ == "Resources"
+
+    def test_unknown_storage(self):
+        """Test that an unknown storage is rejected."""
+        with pytest.raises(ValueError):
+            Resources.variant(storage="numpy")
+
+    def test_json_schema_unchanged(self):
+        """Test that the JSON schema matches the list-backed model."""
+        assert (
+            Projects.variant(storage="compact").model_json_schema()
+            == Projects.model_json_schema()
+        )
+
+    def test_memory_reduction(self):
+        """Test that compact ids hold far less memory than a list of UUIDs."""
+        raw = json.dumps({"ids": [str(uuid.uuid4()) for _ in range(20_000)], "kind": "resource[]"})
+        held = {}
+        for storage in ("list", "compact"):
+            model = Resources.variant(storage=storage)
+            tracemalloc.start()
+            resources = model.model_validate_json(raw)
+            held[storage] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del resources
+        assert held["compact"] * 4 < held["list"]
+
+
+class TestLazyVariant:
+    """Test lazy storage on the collection models."""
+
+    @pytest.mark.parametrize(
+        "model, kind",
+        [
+            (Resources, "resource[]"),
+            (Projects, "project[]"),
+            (AttributeDefinitions, "attribute_definition[]"),
+        ],
+    )
+    def test_round_trip(self, model, kind, sample_uuid_list):
+        """Test that dumps are identical to the list-backed model."""
+        lazy_model = model.variant(storage="lazy")
+        raw = json.dumps({"ids": [str(uid) for uid in sample_uuid_list], "kind": kind})
+        plain = model.model_validate_json(raw)
+        lazy = lazy_model.model_validate_json(raw)
+        assert isinstance(lazy, model)
+        assert isinstance(lazy.ids, LazyUUIDs)
+        assert lazy.model_dump() == plain.model_dump()
+        assert lazy.model_dump_json() == plain.model_dump_json()
+        assert lazy_model.model_validate_json(lazy.model_dump_json()) == lazy
+
+    def test_non_canonical_strings_are_normalized(self):
+        """Test that dumps normalize every accepted UUID form."""
+        uid = uuid.uuid4()
+        forms = [str(uid).upper(), uid.hex, f"{{{uid}}}", uid.urn, f"{{{str(uid).upper()}}}"]
+        lazy = Resources.variant(storage="lazy")(ids=forms, kind="resource[]")
+        assert list(lazy.ids) == [uid] * 5
+        assert lazy.model_dump(mode="json")["ids"] == [str(uid)] * 5
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "12345678-1234-1234-1234-1234567890ab",
+            "12345678-1234-1234-1234-1234567890AB",
+            "123456781234123412341234567890ab",
+            "{12345678-1234-1234-1234-1234567890ab}",
+            "urn:uuid:12345678-1234-1234-1234-1234567890ab",
+            "12345678-12341234-1234-1234567890ab",
+            "1234567812341234-1234-1234567890ab",
+            "12345678-1234-1234-1234567890abcdef}",
+            "{12345678-1234-1234-1234-1234567890ab",
+            "12345678-1234-1234-1234-1234567890ab}",
+            "{123456781234123412341234567890ab}",
+            "urn:uuid:123456781234123412341234567890ab",
+            "urn:uuid:{12345678-1234-1234-1234-1234567890ab}",
+            "URN:UUID:12345678-1234-1234-1234-1234567890ab",
+        ],
+    )
+    def test_same_strings_accepted_as_list_storage(self, value):
+        """Test that lazy storage accepts exactly the strings list storage does, dumping them alike."""
+        payload = json.dumps({"ids": [value], "kind": "resource[]"})
+        try:
+            expected = Resources.model_validate_json(payload)
+        except ValidationError:
+            with pytest.raises(ValidationError):
+                Resources.variant(storage="lazy").model_validate_json(payload)
+            with pytest.raises(ValidationError):
+                Resources.variant(storage="lazy")(ids=[value], kind="resource[]")
+            return
+        lazy = Resources.variant(storage="lazy").model_validate_json(payload)
+        assert lazy.model_dump_json() == expected.model_dump_json()
+
+    def test_ids_decoded_on_access(self, sample_uuid_list):
+        """Test that strings are kept and decoded per element."""
+        strings = [str(uid) for uid in sample_uuid_list]
+        lazy = Resources.variant(storage="lazy")(ids=strings, kind="resource[]")
+        assert len(lazy.ids) == 3
+        assert lazy.ids[1] == sample_uuid_list[1]
+        assert isinstance(lazy.ids[1], uuid.UUID)
+        assert lazy.ids._raw == strings
+        assert lazy.ids[1:] == sample_uuid_list[1:]
+        assert sample_uuid_list[2] in lazy.ids
+
+    def test_accepts_uuid_objects(self, sample_uuid_list):
+        """Test that UUID objects are accepted in Python mode."""
+        lazy = Resources.variant(storage="lazy")(ids=sample_uuid_list, kind="resource[]")
+        assert lazy.ids == sample_uuid_list
+
+    def test_invalid_strings_rejected(self, sample_uuid):
+        """Test that malformed ids fail validation with their index."""
+        model = Projects.variant(storage="lazy")
+        with pytest.raises(ValidationError) as exc_info:
+            model(ids=[str(sample_uuid), "not-a-uuid"], kind="project[]")
+        error = exc_info.value.errors()[0]
+        assert error["loc"] == ("ids", 1)
+        assert error["type"] == "uuid_format"
+        with pytest.raises(ValidationError):
+            model.model_validate_json(b'{"ids": [42], "kind": "project[]"}')
+
+    def test_kind_still_validated(self, sample_uuid_list):
+        """Test that kind is still checked."""
+        with pytest.raises(ValidationError) as exc_info:
+            Resources.variant(storage="lazy")(ids=sample_uuid_list, kind="project[]")
+        assert "kind must be 'resource[]'" in str(exc_info.value)
+
+    def test_json_schema_unchanged(self):
+        """Test that the JSON schema matches the list-backed model."""
+        assert (
+            Resources.variant(storage="lazy").model_json_schema()
+            == Resources.model_json_schema()
+        )
+
+    def test_pickle(self, sample_uuid_list):
+        """Test pickling round trip."""
+        lazy = LazyUUIDs(str(uid) for uid in sample_uuid_list)
+        assert pickle.loads(pickle.dumps(lazy)) == lazy
+
+
+class TestColumnarExport:
+    """Test numpy and Arrow export of id collections."""
+
+    @pytest.fixture(params=["list", "compact", "lazy"])
+    def resources(self, request, sample_uuid_list):
+        """Return a Resources model for each storage backend."""
+        return Resources.variant(storage=request.param)(ids=sample_uuid_list, kind="resource[]")
+
+    def test_to_numpy(self, resources, sample_uuid_list):
+        """Test the (n, 16) uint8 export."""
+        np = pytest.importorskip("numpy")
+        array = resources.to_numpy()
+        assert array.shape == (len(sample_uuid_list), 16)
+        assert array.dtype == np.uint8
+        assert [bytes(row) for row in array] == [value.bytes for value in sample_uuid_list]
+        assert not array.flags.writeable
+
+    def test_to_numpy_structured(self, resources, sample_uuid_list):
+        """Test the export as 64-bit halves."""
+        pytest.importorskip("numpy")
+        array = resources.to_numpy(structured=True)
+        assert [(int(hi) << 64) | int(lo) for hi, lo in array] == [value.int for value in sample_uuid_list]
+
+    def test_numpy_shares_compact_buffer(self, sample_uuid_list):
+        """Test that the compact storage is exported without a copy."""
+        np = pytest.importorskip("numpy")
+        ids = UUIDArray.from_uuids(sample_uuid_list)
+        resources = Resources.variant(storage="compact")(ids=ids, kind="resource[]")
+        assert np.shares_memory(resources.to_numpy(), np.frombuffer(ids.buffer, dtype=np.uint8))
+
+    def test_to_arrow(self, resources, sample_uuid_list):
+        """Test the fixed_size_binary(16) export."""
+        pa = pytest.importorskip("pyarrow")
+        array = resources.to_arrow()
+        assert array.type == pa.binary(16)
+        assert array.to_pylist() == [value.bytes for value in sample_uuid_list]
+
+    @pytest.mark.parametrize("model", [Resources, Projects, AttributeDefinitions])
+    def test_from_arrow(self, model, sample_uuid_list):
+        """Test building each collection from an Arrow array."""
+        pa = pytest.importorskip("pyarrow")
+        array = pa.array([value.bytes for value in sample_uuid_list], pa.binary(16))
+        for storage in ("list", "compact", "lazy"):
+            collection = model.variant(storage=storage).from_arrow(array)
+            assert list(collection.ids) == sample_uuid_list
+        assert model.from_arrow(array.slice(1, 2)).ids == sample_uuid_list[1:3]
+
+    def test_arrow_round_trip_shares_buffer(self, sample_uuid_list):
+        """Test that compact collections and Arrow arrays share one buffer."""
+        pytest.importorskip("pyarrow")
+        Compact = Resources.variant(storage="compact")
+        array = Compact(ids=sample_uuid_list, kind="resource[]").to_arrow()
+        ids = Compact.from_arrow(array).ids
+        assert ids == sample_uuid_list
+        assert ids.buffer.obj is not None and bytes(ids.buffer.obj) == array.buffers()[1].to_pybytes()
+
+    def test_from_arrow_chunked_and_dedupe(self, sample_uuid_list):
+        """Test chunked arrays and dedupe variants."""
+        pa = pytest.importorskip("pyarrow")
+        array = UUIDArray.from_uuids(sample_uuid_list).to_arrow()
+        chunked = pa.chunked_array([array, array])
+        assert UUIDArray.from_arrow(chunked) == sample_uuid_list * 2
+        deduped = Resources.variant(storage="compact", dedupe="first").from_arrow(chunked)
+        assert deduped.ids == sample_uuid_list
+        assert deduped.duplicates_dropped == len(sample_uuid_list)
+
+    def test_from_arrow_rejects_invalid_arrays(self):
+        """Test that other types and nulls are rejected."""
+        pa = pytest.importorskip("pyarrow")
+        with pytest.raises(TypeError):
+            UUIDArray.from_arrow(pa.array([b"abc"]))
+        with pytest.raises(ValueError):
+            UUIDArray.from_arrow(pa.array([bytes(16), None], pa.binary(16)))
+
+    def test_missing_dependencies(self, monkeypatch, sample_uuid_list):
+        """Test the error raised without the optional extras."""
+        from tektome import ids as ids_module
+
+        resources = Resources(ids=sample_uuid_list, kind="resource[]")
+        monkeypatch.setattr(ids_module, "np", None)
+        monkeypatch.setattr(ids_module, "pa", None)
+        with pytest.raises(ImportError, match="tektome\\[numpy\\]"):
+            resources.to_numpy()
+        with pytest.raises(ImportError, match="tektome\\[arrow\\]"):
+            resources.to_arrow()
@@ -0,0 +1,67 @@
+"""Test suite for lazy imports of the tektome package."""
+import subprocess
+import sys
+import pytest
+import tektome
+
+HEAVY_MODULES = ("numpy._core", "numpy.core", "asyncio", "httpx", "tektome.fetch", "tektome.stream")
+
+PYDANTIC_MODEL = (
+    "from pydantic import BaseModel\n"
+    "class Model(BaseModel):\n"
+    "    value: int\n"
+    "Model(value=1)"
+)
+"""A plain pydantic model, whose imports tektome cannot avoid (some pydantic-core versions load asyncio)."""
+
+
+def _imported_after(statement):
+    """Return the heavy modules imported by running ``statement`` in a fresh interpreter."""
+    modules = HEAVY_MODULES + ("tektome.schema",)
+    code = f"import sys\n{statement}\nprint(' '.join(m for m in {modules!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+class TestLazyImports:
+    """Test that importing tektome only loads what is used."""
+
+    def test_import_package(self):
+        """Test that importing the package loads no submodule."""
+        assert _imported_after("import tektome") == []
+
+    def test_import_models(self):
+        """Test that the schema classes load no heavy module beyond those of pydantic itself."""
+        statement = (
+            "from tektome import Resource, Context\n"
+            "Resource(id='123e4567-e89b-12d3-a456-426614174000', kind='resource')"
+        )
+        pydantic_modules = set(_imported_after(PYDANTIC_MODEL))
+        assert set(_imported_after(statement)) - pydantic_modules == {"tektome.schema"}
+
+    def test_attributes(self):
+        """Test that every public name resolves to its defining module."""
+        from tektome import schema
+
+        assert tektome.Resource is schema.Resource
+        for name in tektome.__all__:
+            assert getattr(tektome, name) is not None
+        assert set(tektome.__all__) <= set(dir(tektome))
+
+    def test_unknown_attribute(self):
+        """Test that unknown names raise AttributeError."""
+        with pytest.raises(AttributeError, match="no attribute 'Nothing'"):
+            tektome.Nothing
+        with pytest.raises(ImportError):
+            exec("from tektome import Nothing", {})
+
+    def test_models_built_on_first_use(self):
+        """Test that model validators are built when first needed."""
+        code = (
+            "from tektome import Projects\n"
+            "print(Projects.__pydantic_complete__)\n"
+            "Projects(ids=[], kind='project[]')\n"
+            "print(Projects.__pydantic_complete__)"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.split() == ["False", "True"]
@@ -0,0 +1,153 @@
+"""Test suite for load_inputs and StepInputs."""
+import inspect
+import json
+import uuid
+from typing import Optional
+import pytest
+from pydantic import ValidationError
+from tektome import Context, Resource, Resources, StepInputs, load_inputs, step_inputs
+
+
+def step(ctx: Context, r: Resource, limit: int = 10):
+    return ctx, r, limit
+
+
+@pytest.fixture
+def raw_inputs(sample_uuid, sample_uuid_str):
+    """Return raw JSON arguments for `step`."""
+    return json.dumps(
+        {
+            "ctx": {
+                "user_api_key": "key",
+                "base_url": "https://example.tektome.com",
+                "execution_id": sample_uuid_str,
+            },
+            "r": {"id": str(sample_uuid), "kind": "resource"},
+        }
+    ).encode()
+
+
+class TestLoadInputs:
+    """Test load_inputs."""
+
+    def test_returns_keyword_arguments(self, raw_inputs, sample_uuid):
+        """Test that validated arguments are returned by parameter name."""
+        kwargs = load_inputs(raw_inputs, step)
+        assert set(kwargs) == {"ctx", "r", "limit"}
+        assert isinstance(kwargs["ctx"], Context)
+        assert kwargs["r"] == Resource(id=sample_uuid, kind="resource")
+        assert kwargs["limit"] == 10
+        ctx, r, limit = step(**kwargs)
+        assert r.id == sample_uuid
+
+    def test_accepts_str(self, raw_inputs):
+        """Test that JSON text is accepted."""
+        assert load_inputs(raw_inputs.decode(), step)["r"].kind == "resource"
+
+    def test_defaults_can_be_overridden(self, raw_inputs):
+        """Test that parameters with defaults are validated when given."""
+        data = json.loads(raw_inputs)
+        data["limit"] = "5"
+        assert load_inputs(json.dumps(data), step)["limit"] == 5
+
+    def test_missing_argument(self, raw_inputs):
+        """Test that required parameters must be present."""
+        data = json.loads(raw_inputs)
+        del data["ctx"]
+        with pytest.raises(ValidationError) as exc_info:
+            load_inputs(json.dumps(data), step)
+        assert "ctx" in str(exc_info.value)
+
+    def test_unexpected_argument(self, raw_inputs):
+        """Test that unknown arguments are rejected."""
+        data = json.loads(raw_inputs)
+        data["other"] = 1
+        with pytest.raises(ValidationError) as exc_info:
+            load_inputs(json.dumps(data), step)
+        assert "other" in str(exc_info.value)
+
+    def test_nested_validation(self, raw_inputs):
+        """Test that nested schemas are validated."""
+        data = json.loads(raw_inputs)
+        data["r"]["kind"] = "project"
+        with pytest.raises(ValidationError) as exc_info:
+            load_inputs(json.dumps(data), step)
+        assert "kind must be 'resource'" in str(exc_info.value)
+
+    def test_with_signature(self, sample_uuid_list):
+        """Test passing an inspect.Signature instead of a function."""
+
+        def collect(resources: Resources, note: Optional[str] = None):
+            pass
+
+        raw = json.dumps({"resources": {"ids": [str(u) for u in sample_uuid_list], "kind": "resource[]"}})
+        kwargs = load_inputs(raw, inspect.signature(collect))
+        assert kwargs["resources"].ids == sample_uuid_list
+        assert kwargs["note"] is None
+
+    def test_string_annotations(self, sample_uuid):
+        """Test that postponed annotations are resolved."""
+
+        def postponed(r: "Resource"):
+            pass
+
+        kwargs = load_inputs(json.dumps({"r": {"id": str(sample_uuid), "kind": "resource"}}), postponed)
+        assert isinstance(kwargs["r"], Resource)
+
+    def test_unannotated_parameters(self):
+        """Test that unannotated parameters accept any value."""
+
+        def untyped(a, b=2):
+            pass
+
+        assert load_inputs(b'{"a": [1, "x"]}', untyped) == {"a": [1, "x"], "b": 2}
+
+    def test_names_clashing_with_model_attributes(self):
+        """Test parameters named like BaseModel attributes."""
+
+        def clashing(json: str, copy: int, _private: bool = False):
+            pass
+
+        kwargs = load_inputs(b'{"json": "x", "copy": 1, "_private": true}', clashing)
+        assert kwargs == {"json": "x", "copy": 1, "_private": True}
+
+    def test_var_arguments_not_supported(self):
+        """Test that *args and **kwargs are rejected."""
+
+        def variadic(*args, **kwargs):
+            pass
+
+        with pytest.raises(TypeError):
+            load_inputs(b"{}", variadic)
+
+
+class TestStepInputs:
+    """Test the cached StepInputs validator."""
+
+    def test_cached_per_function(self):
+        """Test that the validator is built once per function."""
+        assert step_inputs(step) is step_inputs(step)
+        assert isinstance(step_inputs(step), StepInputs)
+
+    def test_cached_per_signature(self):
+        """Test that equal signatures share a validator."""
+        assert step_inputs(inspect.signature(step)) is step_inputs(inspect.signature(step))
+
+    def test_validate_python(self, raw_inputs):
+        """Test validating already-decoded arguments."""
+        kwargs = step_inputs(step).validate_python(json.loads(raw_inputs))
+        assert isinstance(kwargs["r"], Resource)
+
+    def test_model_name(self):
+        """Test that the generated model is named after the function."""
+        assert step_inputs(step).model.__name__ == "stepInputs"
+
+    def test_unique_ids_are_converted(self, sample_uuid_str):
+        """Test that UUID strings become UUID objects."""
+        kwargs = step_inputs(step).validate_python(
+            {
+                "ctx": {"user_api_key": "k", "base_url": "http://localhost:8000", "execution_id": sample_uuid_str},
+                "r": {"id": sample_uuid_str, "kind": "resource"},
+            }
+        )
+        assert kwargs["r"].id == uuid.UUID(sample_uuid_str)
@@ -0,0 +1,154 @@
+"""Test suite for tektome.instrumentation."""
+import json
+import uuid
+import pytest
+from pydantic import ValidationError
+from tektome import Context, Date, Project, Resource, Resources, parse_value, schema
+from tektome import instrumentation
+from tektome.instrumentation import Aggregator, execution, register_hook, unregister_hook
+
+
+@pytest.fixture
+def events():
+    """Collect the events reported while the test runs."""
+    collected = []
+    unregister = register_hook(collected.append)
+    yield collected
+    unregister()
+
+
+class TestHooks:
+    """Test which validations are reported."""
+
+    def test_no_wrappers_without_hooks(self):
+        """Test that nothing is patched while no hook is registered."""
+        for name in ("__init__", "model_validate", "model_validate_json", "model_validate_strings"):
+            assert name not in schema.BaseSchema.__dict__
+        unregister = register_hook(lambda event: None)
+        assert "model_validate" in schema.BaseSchema.__dict__
+        unregister()
+        assert "model_validate" not in schema.BaseSchema.__dict__
+        assert schema._value_adapter() is schema._value_adapter()
+
+    def test_init(self, events, sample_uuid):
+        """Test that constructing a model is reported once."""
+        Resource(id=sample_uuid, kind="resource")
+        assert len(events) == 1
+        event = events[0]
+        assert (event.model, event.operation, event.count, event.input_bytes) == ("Resource", "init", 1, None)
+        assert event.ok and event.seconds >= 0
+
+    def test_validate(self, events, sample_uuid):
+        """Test that model_validate is reported without a separate init event."""
+        Project.model_validate({"id": sample_uuid, "kind": "project"})
+        assert [(e.model, e.operation) for e in events] == [("Project", "validate")]
+
+    def test_validate_json(self, events, sample_uuid):
+        """Test that model_validate_json reports the input size."""
+        raw = json.dumps({"ids": [str(sample_uuid)], "kind": "resource[]"})
+        Resources.model_validate_json(raw)
+        assert [(e.model, e.operation, e.input_bytes) for e in events] == [("Resources", "validate_json", len(raw))]
+
+    def test_variant(self, events, sample_uuid):
+        """Test that variants created while hooks are registered report under their own name."""
+        Compact = Resources.variant(storage="compact", dedupe="first")
+        Compact.model_validate({"ids": [sample_uuid, sample_uuid], "kind": "resource[]"})
+        assert [(e.model, e.operation) for e in events] == [("Resources", "validate")]
+        assert not Compact.__pydantic_custom_init__
+
+    def test_failure_reasons(self, events):
+        """Test that failed validations report their error types."""
+        with pytest.raises(ValidationError):
+            Resource.model_validate({"id": "not-a-uuid", "kind": "project"})
+        event = events[0]
+        assert not event.ok
+        assert event.errors == ("uuid_parsing", "kind_mismatch")
+
+    def test_validate_many(self, events, sample_uuid_list):
+        """Test that a batch is reported once with its size."""
+        payloads = [{"id": uid, "kind": "resource"} for uid in sample_uuid_list]
+        result = Resource.validate_many(payloads + [{"id": "x", "kind": "resource"}], errors="collect")
+        assert [(e.operation, e.count, e.errors) for e in events] == [
+            ("validate_many", len(payloads) + 1, ("uuid_parsing",))
+        ]
+        assert [r.id for r in result.values[:-1]] == sample_uuid_list
+
+    def test_parse_value(self, events):
+        """Test that parse_value reports the class it picked."""
+        assert isinstance(parse_value('{"kind": "date", "value": "2025-01-01"}'), Date)
+        with pytest.raises(ValidationError):
+            parse_value({"kind": "unknown"})
+        assert [(e.model, e.operation, e.ok) for e in events] == [
+            ("Date", "parse_value", True),
+            ("TektomeValue", "parse_value", False),
+        ]
+
+    def test_failing_hook_warns(self, events, sample_uuid):
+        """Test that an exception in a hook does not break validation."""
+
+        def broken(event):
+            raise RuntimeError("boom")
+
+        register_hook(broken)
+        try:
+            with pytest.warns(RuntimeWarning, match="boom"):
+                Resource(id=sample_uuid, kind="resource")
+        finally:
+            unregister_hook(broken)
+        assert len(events) == 1
+
+    def test_execution_scope(self, sample_uuid):
+        """Test that events inside execution() carry its id."""
+        ctx = Context(user_api_key="secret", base_url="https://example.com", execution_id=uuid.uuid4())
+        events = []
+        unregister = register_hook(events.append)
+        with execution(ctx):
+            Resource(id=sample_uuid, kind="resource")
+        Resource(id=sample_uuid, kind="resource")
+        unregister()
+        assert [e.execution_id for e in events] == [ctx.execution_id, None]
+
+
+class TestAggregator:
+    """Test the in-memory aggregator."""
+
+    def test_stats_per_execution(self, sample_uuid):
+        """Test counts, failures and errors keyed by execution id."""
+        aggregator = Aggregator()
+        execution_id = uuid.uuid4()
+        unregister = register_hook(aggregator)
+        try:
+            with execution(execution_id):
+                Resource(id=sample_uuid, kind="resource")
+                Resource.validate_many([{"id": sample_uuid, "kind": "resource"}] * 3)
+                with pytest.raises(ValidationError):
+                    Resource.model_validate_json('{"id": "x", "kind": "resource"}')
+            Project(id=sample_uuid, kind="project")
+        finally:
+            unregister()
+
+        dumped = json.loads(aggregator.dump_json(execution_id))
+        assert dumped["execution_id"] == str(execution_id)
+        stats = dumped["models"]["Resource"]
+        assert (stats["count"], stats["failures"]) == (5, 1)
+        assert stats["operations"] == {"init": 1, "validate_many": 1, "validate_json": 1}
+        assert stats["errors"] == {"uuid_parsing": 1}
+        assert stats["input_bytes"] == len('{"id": "x", "kind": "resource"}')
+        assert sum(stats["histogram"]["counts"]) == 3
+        assert len(stats["histogram"]["counts"]) == len(stats["histogram"]["buckets"]) + 1
+        assert set(aggregator.stats()["models"]) == {"Project"}
+        assert set(aggregator.executions()) == {execution_id, None}
+
+    def test_clear(self, sample_uuid):
+        """Test that dump_json(clear=True) drops the execution."""
+        aggregator = Aggregator()
+        unregister = register_hook(aggregator)
+        Resource(id=sample_uuid, kind="resource")
+        unregister()
+        assert json.loads(aggregator.dump_json(clear=True))["models"]["Resource"]["count"] == 1
+        assert aggregator.stats() == {"execution_id": None, "models": {}}
+
+    def test_default_aggregator(self):
+        """Test that the default aggregator is not registered until asked."""
+        assert isinstance(instrumentation.default_aggregator, Aggregator)
+        assert instrumentation._hooks == ()
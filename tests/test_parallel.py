@@ -0,0 +1,144 @@
+"""Test suite for parallel validation of id collections."""
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from pydantic import ValidationError
+from tektome import IdCollection, Projects, Resources
+from tektome.ids import UUIDArray
+
+Compact = Resources.variant(storage="compact")
+
+
+@pytest.fixture
+def id_strings():
+    """Return 1000 UUID strings."""
+    return [str(uuid.uuid4()) for _ in range(1000)]
+
+
+@pytest.fixture
+def invalid(id_strings):
+    """Return a payload with invalid ids in several chunks and a wrong kind."""
+    ids = list(id_strings)
+    ids[3], ids[700], ids[999] = "nope", 5, "x"
+    return {"ids": ids, "kind": "project[]"}
+
+
+def _errors(call):
+    with pytest.raises(ValidationError) as exc_info:
+        call()
+    return exc_info.value
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+@pytest.mark.filterwarnings("ignore:.*validated in this process:RuntimeWarning")
+class TestValidateParallel:
+    """Test that parallel validation gives the serial result."""
+
+    @pytest.mark.parametrize(
+        "model",
+        [Compact, Resources, Resources.variant(storage="compact", dedupe="first"), Resources.variant(storage="lazy")],
+    )
+    def test_same_result(self, executor, model, id_strings):
+        """Test the model, ids and duplicates against model_validate."""
+        data = {"ids": id_strings + id_strings[:5], "kind": "resource[]"}
+        result = model.validate_parallel(data, workers=2, executor=executor)
+        assert type(result) is model
+        assert result == model.model_validate(data)
+        assert result.duplicates_dropped == model.model_validate(data).duplicates_dropped
+
+    def test_compact_ids(self, executor, id_strings):
+        """Test that compact storage gets one UUIDArray."""
+        ids = Compact.validate_parallel({"ids": id_strings, "kind": "resource[]"}, workers=2, executor=executor).ids
+        assert isinstance(ids, UUIDArray)
+        assert [str(value) for value in ids] == id_strings
+
+    def test_json(self, executor, id_strings):
+        """Test JSON input."""
+        raw = json.dumps({"ids": id_strings, "kind": "resource[]"})
+        assert Compact.validate_parallel(raw, workers=2, executor=executor) == Compact.model_validate_json(raw)
+
+    @pytest.mark.parametrize("model", [Compact, Resources])
+    def test_errors(self, executor, model, invalid):
+        """Test that errors have their index in the whole array, with the other fields' errors."""
+        parallel = _errors(lambda: model.validate_parallel(invalid, workers=2, executor=executor, chunk_size=100))
+        serial = _errors(lambda: model.model_validate(invalid))
+        assert parallel.errors() == serial.errors()
+        assert [error["loc"] for error in parallel.errors()] == [("ids", 3), ("ids", 700), ("ids", 999), ("kind",)]
+        assert parallel.title == "Resources"
+
+    def test_extra_field(self, executor, invalid):
+        """Test that other errors are reported with invalid ids."""
+        data = {**invalid, "kind": "resource[]", "extra": 1}
+        parallel = _errors(lambda: Compact.validate_parallel(data, workers=2, executor=executor))
+        assert parallel.errors() == _errors(lambda: Compact.model_validate(data)).errors()
+
+
+class TestOptions:
+    """Test executors, fallbacks and the automatic threshold."""
+
+    def test_executor_instance(self, id_strings):
+        """Test reusing an executor."""
+        data = {"ids": id_strings, "kind": "resource[]"}
+        with ThreadPoolExecutor(2) as pool:
+            assert Resources.validate_parallel(data, workers=2, executor=pool).ids == Resources.model_validate(data).ids
+
+    def test_invalid_executor(self, id_strings):
+        """Test that unknown executors are rejected."""
+        with pytest.raises(ValueError, match="executor"):
+            Resources.validate_parallel({"ids": id_strings, "kind": "resource[]"}, executor="gpu")
+
+    @pytest.mark.parametrize("data", [{"ids": "no", "kind": "resource[]"}, [1], b"{bad"])
+    def test_not_a_payload(self, data):
+        """Test that other input is validated serially, with the usual errors."""
+        with pytest.raises(ValidationError):
+            Compact.validate_parallel(data, workers=2)
+
+    def test_serial_warns(self, id_strings):
+        """Test that an explicit call that cannot run in parallel warns and validates serially."""
+        data = {"ids": id_strings, "kind": "resource[]"}
+        with pytest.warns(RuntimeWarning, match="only speed up the 'compact' storage, not 'list'"):
+            assert len(Resources.validate_parallel(data, workers=2, executor="process").ids) == 1000
+        with pytest.warns(RuntimeWarning, match="'lazy' storage"):
+            Resources.variant(storage="lazy").validate_parallel(data, workers=2)
+        with pytest.warns(RuntimeWarning, match="single worker"):
+            Compact.validate_parallel(data, workers=1)
+
+    def test_threshold(self, monkeypatch, id_strings):
+        """Test that model_validate and model_validate_json switch to parallel validation."""
+        import tektome.parallel
+
+        calls = []
+        validate_parallel = tektome.parallel.validate_parallel
+
+        def counting(*args, **kwargs):
+            calls.append(args[0])
+            return validate_parallel(*args, **kwargs)
+
+        monkeypatch.setattr(tektome.parallel, "validate_parallel", counting)
+        monkeypatch.setattr(tektome.parallel.os, "cpu_count", lambda: 2)
+        monkeypatch.setattr(IdCollection, "parallel_threshold", 500)
+        model = Projects.variant(storage="compact")
+        data = {"ids": id_strings, "kind": "project[]"}
+        assert model.model_validate(data).ids == [uuid.UUID(value) for value in id_strings]
+        assert len(model.model_validate_json(json.dumps(data)).ids) == 1000
+        model.model_validate({"ids": id_strings[:10], "kind": "project[]"})
+        model.model_validate_json(json.dumps({"ids": id_strings[:10], "kind": "project[]"}))
+        assert calls == [model, model]
+        with pytest.raises(ValidationError, match="json_invalid"):
+            model.model_validate_json("{" + " " * 20_000)
+
+    def test_threshold_serial(self, monkeypatch, id_strings):
+        """Test that storages without a parallel speed-up stay serial."""
+        import tektome.parallel
+
+        monkeypatch.setattr(tektome.parallel, "validate_parallel", None)
+        monkeypatch.setattr(tektome.parallel.os, "cpu_count", lambda: 2)
+        monkeypatch.setattr(IdCollection, "parallel_threshold", 500)
+        data = {"ids": id_strings, "kind": "project[]"}
+        with pytest.warns(RuntimeWarning, match="'lazy' storage"):
+            assert len(Projects.variant(storage="lazy").model_validate(data).ids) == 1000
+        if not tektome.parallel.free_threaded():
+            with pytest.warns(RuntimeWarning, match="Projects ids are validated in this process") as record:
+                assert len(Projects.model_validate_json(json.dumps(data)).ids) == 1000
+            assert record[0].filename == __file__
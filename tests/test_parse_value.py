@@ -0,0 +1,139 @@
+"""Test suite for parse_value and TektomeValue."""
+import json
+import uuid
+from datetime import date, datetime
+import pytest
+from pydantic import BaseModel, ValidationError
+from tektome import (
+    AttributeDefinitions,
+    Date,
+    DateTime,
+    Project,
+    Projects,
+    Resource,
+    Resources,
+    TektomeValue,
+    parse_value,
+)
+from tektome.schema import _value_adapter
+
+
+class TestParseValueDispatch:
+    """Test parse_value dispatch on kind."""
+
+    @pytest.mark.parametrize(
+        "payload, expected_cls",
+        [
+            ({"id": str(uuid.uuid4()), "kind": "resource"}, Resource),
+            ({"ids": [str(uuid.uuid4())], "kind": "resource[]"}, Resources),
+            ({"id": str(uuid.uuid4()), "kind": "project"}, Project),
+            ({"ids": [str(uuid.uuid4())], "kind": "project[]"}, Projects),
+            ({"ids": [], "kind": "attribute_definition[]"}, AttributeDefinitions),
+            ({"value": "2025-11-17", "kind": "date"}, Date),
+            ({"value": "2025-11-17T14:30:00", "kind": "datetime"}, DateTime),
+        ],
+    )
+    def test_dispatches_to_matching_class(self, payload, expected_cls):
+        """Test that each kind is validated into its own class."""
+        value = parse_value(payload)
+        assert type(value) is expected_cls
+        assert value.kind == payload["kind"]
+
+    def test_parse_from_json_bytes(self, sample_uuid):
+        """Test parsing raw JSON bytes."""
+        raw = json.dumps({"id": str(sample_uuid), "kind": "project"}).encode()
+        value = parse_value(raw)
+        assert value == Project(id=sample_uuid, kind="project")
+
+    def test_parse_from_json_str(self, sample_date):
+        """Test parsing a raw JSON string."""
+        value = parse_value('{"value": "2025-11-17", "kind": "date"}')
+        assert value == Date(value=sample_date, kind="date")
+
+    def test_parse_existing_instance(self, sample_uuid):
+        """Test that schema instances are accepted."""
+        resource = Resource(id=sample_uuid, kind="resource")
+        assert parse_value(resource) == resource
+
+    def test_values_are_converted(self, sample_uuid, sample_datetime):
+        """Test that nested values are converted by the selected schema."""
+        value = parse_value({"value": sample_datetime.isoformat(), "kind": "datetime"})
+        assert value.value == sample_datetime
+        assert isinstance(value.value, datetime)
+        value = parse_value({"id": str(sample_uuid), "kind": "resource"})
+        assert value.id == sample_uuid
+
+
+class TestParseValueValidation:
+    """Test parse_value validation errors."""
+
+    def test_unknown_kind(self, sample_uuid):
+        """Test that an unknown kind is rejected."""
+        with pytest.raises(ValidationError) as exc_info:
+            parse_value({"id": str(sample_uuid), "kind": "folder"})
+        assert "kind must be one of" in str(exc_info.value)
+        assert exc_info.value.errors()[0]["type"] == "kind_unknown"
+
+    def test_missing_kind(self, sample_uuid):
+        """Test that a payload without kind is rejected."""
+        with pytest.raises(ValidationError):
+            parse_value({"id": str(sample_uuid)})
+
+    def test_payload_not_matching_selected_kind(self, sample_uuid):
+        """Test that the payload is validated against the selected schema."""
+        with pytest.raises(ValidationError) as exc_info:
+            parse_value({"id": str(sample_uuid), "kind": "resource[]"})
+        assert "ids" in str(exc_info.value)
+
+    def test_invalid_uuid(self):
+        """Test that nested validation errors are reported."""
+        with pytest.raises(ValidationError):
+            parse_value({"id": "not-a-uuid", "kind": "resource"})
+
+    def test_extra_fields_forbidden(self, sample_uuid):
+        """Test that extra fields are still forbidden."""
+        with pytest.raises(ValidationError):
+            parse_value({"id": str(sample_uuid), "kind": "resource", "extra": 1})
+
+    def test_invalid_json(self):
+        """Test that malformed JSON is rejected."""
+        with pytest.raises(ValidationError):
+            parse_value(b"{not json")
+
+
+class TestTektomeValue:
+    """Test TektomeValue as a field annotation."""
+
+    def test_as_field_type(self, sample_uuid):
+        """Test using TektomeValue as a field type in another model."""
+
+        class Step(BaseModel):
+            value: TektomeValue
+
+        step = Step(value={"ids": [str(sample_uuid)], "kind": "project[]"})
+        assert isinstance(step.value, Projects)
+        assert step.value.ids == [sample_uuid]
+
+    def test_dispatch_is_tagged_union(self):
+        """Test that dispatch happens in pydantic-core without Python callbacks."""
+        schema = _value_adapter().core_schema
+        assert schema["type"] == "tagged-union"
+        # Only the array-backed kinds pack their values with a Python function.
+        plain = {tag: choice for tag, choice in schema["choices"].items() if tag not in ("date[]", "datetime[]")}
+        assert "'type': 'function" not in repr(plain)
+
+    def test_json_schema_has_discriminator(self):
+        """Test that the JSON schema advertises the kind discriminator."""
+        schema = _value_adapter().json_schema()
+        assert schema["discriminator"]["propertyName"] == "kind"
+        assert set(schema["discriminator"]["mapping"]) == {
+            "resource",
+            "resource[]",
+            "project",
+            "project[]",
+            "attribute_definition[]",
+            "date",
+            "datetime",
+            "date[]",
+            "datetime[]",
+        }
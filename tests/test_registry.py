@@ -0,0 +1,249 @@
+"""Test suite for the per-tenant context registry."""
+import asyncio
+import pytest
+from tektome import Context, ContextRegistry, Resource
+from tektome import disk_cache
+from tektome import registry as registry_module
+from tektome.cache import default_cache
+from tektome.client import default_pool
+from tektome.fetch import fetch_json
+
+httpx = pytest.importorskip("httpx")
+
+
+@pytest.fixture
+def registry(clock):
+    """Return a registry with small limits, closed after the test."""
+    registry = ContextRegistry(
+        max_tenants=3, idle_ttl=60.0, max_connections=4, connections_per_tenant=2, clock=clock
+    )
+    yield registry
+    registry.close()
+
+
+@pytest.fixture
+def enabled(clock):
+    """Enable a process-wide registry for the test."""
+    yield registry_module.enable(clock=clock)
+    registry_module.disable()
+    default_pool.close()
+    default_cache.clear()
+
+
+def _context(api_server, key, execution_id):
+    return Context(user_api_key=key, base_url=api_server.url, execution_id=execution_id)
+
+
+class TestTenants:
+    """Test interning and eviction of tenants."""
+
+    def test_tenant_shared_across_executions(self, registry, api_server, sample_uuid, sample_uuid_list):
+        """Test that contexts of one tenant get the same tenant, client and cache."""
+        ctx = _context(api_server, "a", sample_uuid)
+        other = _context(api_server, "a", sample_uuid_list[0])
+        assert registry.tenant(ctx) is registry.tenant(other)
+        assert registry.client(ctx) is registry.client(other)
+        assert registry.cache(ctx) is registry.cache(other)
+        assert len(registry) == 1
+        assert other in registry
+
+    def test_tenants_keyed_by_api_key(self, registry, api_server, sample_uuid):
+        """Test that another API key gets another client and cache."""
+        ctx, other = _context(api_server, "a", sample_uuid), _context(api_server, "b", sample_uuid)
+        assert registry.client(ctx) is not registry.client(other)
+        assert registry.cache(ctx) is not registry.cache(other)
+        assert registry.tenant(ctx).base_url == str(ctx.base_url)
+
+    def test_pool_limits(self, registry, api_server, sample_uuid):
+        """Test that tenant clients get the per-tenant connection limit."""
+        client = registry.client(_context(api_server, "a", sample_uuid))
+        assert client._transport._pool._max_connections == 2
+
+    def test_least_recently_used_evicted(self, registry, api_server, sample_uuid):
+        """Test that tenants beyond max_tenants are dropped, oldest use first."""
+        contexts = [_context(api_server, key, sample_uuid) for key in "abcd"]
+        clients = [registry.client(ctx) for ctx in contexts[:2]]
+        registry.tenant(contexts[2])
+        registry.tenant(contexts[0])
+        registry.tenant(contexts[3])
+        assert contexts[1] not in registry
+        assert clients[1].is_closed and not clients[0].is_closed
+        assert registry.stats().evictions == 1
+        assert len(registry) == 3
+
+    def test_idle_tenants_expire(self, registry, api_server, sample_uuid, clock):
+        """Test that tenants unused for idle_ttl seconds are dropped."""
+        ctx, other = _context(api_server, "a", sample_uuid), _context(api_server, "b", sample_uuid)
+        client = registry.client(ctx)
+        clock.now = 30.0
+        registry.tenant(other)
+        clock.now = 60.0
+        assert other in registry
+        registry.tenant(other)
+        assert ctx not in registry
+        assert client.is_closed
+        assert registry.stats().expirations == 1
+
+    def test_expired_tenant_recreated(self, registry, api_server, sample_uuid, clock):
+        """Test that a tenant used again after expiring starts afresh."""
+        ctx = _context(api_server, "a", sample_uuid)
+        cache = registry.cache(ctx)
+        clock.now = 100.0
+        assert registry.cache(ctx) is not cache
+
+    def test_evict(self, registry, api_server, sample_uuid):
+        """Test that evict drops one tenant and closes its client."""
+        ctx = _context(api_server, "a", sample_uuid)
+        client = registry.client(ctx)
+        registry.evict(ctx)
+        registry.evict(ctx)
+        assert client.is_closed
+        assert len(registry) == 0
+
+    def test_close(self, registry, api_server, sample_uuid):
+        """Test that close drops every tenant."""
+        clients = [registry.client(_context(api_server, key, sample_uuid)) for key in "ab"]
+        registry.close()
+        assert all(client.is_closed for client in clients)
+        assert registry.stats().tenants == registry.stats().connected == 0
+
+    def test_invalid_limits(self):
+        """Test that a tenant may not need more connections than the total."""
+        with pytest.raises(ValueError, match="connections_per_tenant"):
+            ContextRegistry(max_connections=2, connections_per_tenant=4)
+
+
+class TestConnectionCap:
+    """Test the cap on open connections across tenants."""
+
+    def test_least_recently_used_clients_closed(self, registry, api_server, sample_uuid):
+        """Test that clients are closed beyond max_connections, keeping tenants and caches."""
+        contexts = [_context(api_server, key, sample_uuid) for key in "abc"]
+        first, second = registry.client(contexts[0]), registry.client(contexts[1])
+        cache = registry.cache(contexts[0])
+        registry.client(contexts[1])
+        registry.client(contexts[2])
+        assert first.is_closed and not second.is_closed
+        assert contexts[0] in registry
+        assert registry.cache(contexts[0]) is cache
+        assert registry.stats() == registry_module.RegistryStats(
+            tenants=3, connected=2, clients=2, evictions=0, expirations=0, disconnections=1
+        )
+
+    def test_disconnected_tenant_reconnects(self, registry, api_server, sample_uuid):
+        """Test that a tenant whose client was closed gets a new one."""
+        contexts = [_context(api_server, key, sample_uuid) for key in "abc"]
+        first = registry.client(contexts[0])
+        registry.client(contexts[1])
+        registry.client(contexts[2])
+        client = registry.client(contexts[0])
+        assert client is not first and not client.is_closed
+        assert client.get("api/resources").json()["authorization"] == "Bearer a"
+
+    def test_cache_use_keeps_connections(self, registry, api_server, sample_uuid):
+        """Test that only tenants using clients count against the cap."""
+        for key in "abc":
+            registry.cache(_context(api_server, key, sample_uuid))
+        assert registry.stats().connected == 0
+
+    def test_async_clients_count(self, registry, api_server, sample_uuid):
+        """Test that asyncio clients go through the tenant pool and the cap, and are closed with it."""
+        contexts = [_context(api_server, key, sample_uuid) for key in "abc"]
+
+        async def main():
+            clients = [registry.async_client(ctx) for ctx in contexts]
+            assert registry.async_client(contexts[2]) is clients[2]
+            response = await clients[2].get("api/resources")
+            await asyncio.sleep(0.05)  # lets the loop close the disconnected clients
+            closed = [client.is_closed for client in clients]
+            registry.close()
+            await asyncio.sleep(0.05)
+            return response.json(), closed, clients[2].is_closed
+
+        data, closed, last_closed = asyncio.run(main())
+        assert data["authorization"] == "Bearer c"
+        assert closed == [True, False, False]
+        assert last_closed
+        assert registry.stats().disconnections == 1
+
+    def test_every_client_counts(self, registry, api_server, sample_uuid):
+        """Test that a tenant's sync and async clients each count against the cap."""
+        ctx, other = _context(api_server, "a", sample_uuid), _context(api_server, "b", sample_uuid)
+        client = registry.client(ctx)
+
+        async def main():
+            async_client = registry.async_client(ctx)
+            assert registry.stats().clients == 2
+            registry.client(other)
+            await asyncio.sleep(0.05)
+            return async_client.is_closed
+
+        assert asyncio.run(main())
+        assert client.is_closed
+        assert registry.stats().clients == 1
+        assert ctx in registry
+
+
+class TestDefaultRegistry:
+    """Test routing of Context through the process-wide registry."""
+
+    def test_disabled_by_default(self, api_server, sample_uuid):
+        """Test that contexts use the process-wide pool and cache without a registry."""
+        ctx = _context(api_server, "a", sample_uuid)
+        assert registry_module.default_registry() is None
+        assert ctx.cache() is default_cache
+        assert ctx.client() is default_pool.get(str(ctx.base_url), "a")
+        default_pool.close()
+
+    def test_context_routed(self, enabled, api_server, sample_uuid):
+        """Test that Context methods use the tenant's client and cache."""
+        ctx = _context(api_server, "a", sample_uuid)
+        assert registry_module.default_registry() is enabled
+        assert ctx.client() is enabled.client(ctx)
+        assert ctx.cache() is enabled.cache(ctx)
+        assert len(default_pool) == 0
+
+    def test_fetch_caches_isolated(self, enabled, api_server, sample_uuid):
+        """Test that tenants do not see each other's cached payloads."""
+        first = fetch_json(_context(api_server, "a", sample_uuid), "resource", sample_uuid)
+        second = fetch_json(_context(api_server, "b", sample_uuid), "resource", sample_uuid)
+        assert first["authorization"] == "Bearer a"
+        assert second["authorization"] == "Bearer b"
+        assert len(api_server.requests) == 2
+        assert len(default_cache) == 0
+
+    @pytest.mark.parametrize("ttl", [300, 0], ids=["fresh", "stale"])
+    def test_disk_cache_isolated(self, enabled, api_server, sample_uuid, tmp_path, ttl):
+        """Test that a tenant refused by the server is not served another tenant's payload from disk."""
+
+        def authorize(handler):
+            if handler.headers["Authorization"] != "Bearer a":
+                return 403, {"detail": "forbidden"}
+            return None
+
+        api_server.routes["*"] = authorize
+        resource = Resource(id=sample_uuid, kind="resource")
+        disk_cache.enable(tmp_path, ttl=ttl)
+        try:
+            assert resource.fetch(_context(api_server, "a", sample_uuid))["authorization"] == "Bearer a"
+            with pytest.raises(httpx.HTTPStatusError) as exc_info:
+                resource.fetch(_context(api_server, "b", sample_uuid))
+        finally:
+            disk_cache.disable()
+        assert exc_info.value.response.status_code == 403
+        assert "If-None-Match" not in api_server.requests[1]["headers"]
+
+    def test_enable_replaces_registry(self, enabled, api_server, sample_uuid):
+        """Test that enabling again closes the previous registry."""
+        client = _context(api_server, "a", sample_uuid).client()
+        registry = registry_module.enable()
+        assert registry_module.default_registry() is registry is not enabled
+        assert client.is_closed
+
+    def test_disable(self, enabled, api_server, sample_uuid):
+        """Test that disable closes the registry and restores the defaults."""
+        ctx = _context(api_server, "a", sample_uuid)
+        client = ctx.client()
+        registry_module.disable()
+        assert client.is_closed
+        assert ctx.cache() is default_cache
@@ -0,0 +1,152 @@
+"""Test suite for shared memory hand-off and pickling of collections."""
+import gc
+import multiprocessing
+import pickle
+import uuid
+import pytest
+from tektome import DateTimes, Projects, Resources, SharedIds
+from tektome.ids import UUIDArray
+from tektome.shared import MAGIC
+
+
+def _attached_ids(name):
+    """Return the ids of a segment as strings, from a worker process."""
+    return [str(value) for value in Resources.attach_shared_memory(name).ids]
+
+
+@pytest.fixture
+def resources(sample_uuid_list):
+    """Return a Resources with a few ids."""
+    return Resources(ids=sample_uuid_list, kind="resource[]")
+
+
+class TestSharedMemory:
+    """Test publishing and attaching id collections."""
+
+    def test_round_trip(self, resources):
+        """Test attaching in the same process."""
+        with resources.to_shared_memory() as shared:
+            attached = Resources.attach_shared_memory(shared.name)
+            assert isinstance(shared, SharedIds)
+            assert len(shared) == 3
+            assert attached.ids == resources.ids
+            assert type(attached) is Resources.variant(storage="compact")
+            assert attached.kind == "resource[]"
+
+    @pytest.mark.parametrize("storage", ["list", "compact", "lazy"])
+    def test_storages(self, storage, sample_uuid_list):
+        """Test publishing from every storage."""
+        model = Resources.variant(storage=storage)
+        with model(ids=sample_uuid_list, kind="resource[]").to_shared_memory() as shared:
+            assert Resources.attach_shared_memory(shared.name).ids == sample_uuid_list
+
+    def test_other_collections(self, sample_uuid_list):
+        """Test that attaching keeps the class and its dedupe option."""
+        projects = Projects(ids=sample_uuid_list * 2, kind="project[]")
+        with projects.to_shared_memory() as shared:
+            attached = Projects.variant(dedupe="first").attach_shared_memory(shared.name)
+        assert attached.kind == "project[]"
+        assert attached.ids == sample_uuid_list
+        assert attached.duplicates_dropped == 3
+
+    def test_empty(self):
+        """Test an empty collection."""
+        with Resources(ids=[], kind="resource[]").to_shared_memory() as shared:
+            assert len(Resources.attach_shared_memory(shared.name).ids) == 0
+
+    def test_read_only(self, resources):
+        """Test that attached ids cannot be modified."""
+        with resources.to_shared_memory() as shared:
+            ids = Resources.attach_shared_memory(shared.name).ids
+            with pytest.raises(TypeError):
+                ids.buffer[0] = 0
+
+    def test_views_outlive_collection(self, resources):
+        """Test that views of the ids stay readable after the collection and the segment are gone."""
+        with resources.to_shared_memory() as shared:
+            attached = Resources.attach_shared_memory(shared.name)
+            tail = attached.ids[1:]
+        del attached
+        gc.collect()
+        assert list(tail) == resources.ids[1:]
+
+    def test_unlinked(self, resources):
+        """Test that attaching fails after the owner unlinked the segment."""
+        with resources.to_shared_memory() as shared:
+            pass
+        with pytest.raises(FileNotFoundError):
+            Resources.attach_shared_memory(shared.name)
+
+    def test_not_ids(self):
+        """Test that other segments are rejected."""
+        from multiprocessing.shared_memory import SharedMemory
+
+        segment = SharedMemory(create=True, size=32)
+        try:
+            with pytest.raises(ValueError, match="does not hold ids"):
+                Resources.attach_shared_memory(segment.name)
+            segment.buf[:4] = MAGIC
+            segment.buf[8] = 5  # more ids than the segment holds
+            with pytest.raises(ValueError, match="does not hold ids"):
+                Resources.attach_shared_memory(segment.name)
+        finally:
+            segment.close()
+            segment.unlink()
+
+    @pytest.mark.parametrize("method", multiprocessing.get_all_start_methods())
+    def test_worker_processes(self, method, resources):
+        """Test attaching from pool workers."""
+        with resources.to_shared_memory() as shared:
+            with multiprocessing.get_context(method).Pool(2) as pool:
+                results = pool.map(_attached_ids, [shared.name] * 2)
+        assert results == [[str(value) for value in resources.ids]] * 2
+
+
+class TestPickle:
+    """Test pickling collections and their variants."""
+
+    @pytest.mark.parametrize("protocol", [2, 4, 5])
+    @pytest.mark.parametrize(
+        "options", [{}, {"storage": "compact"}, {"storage": "lazy"}, {"storage": "compact", "dedupe": "sorted"}]
+    )
+    def test_variants(self, protocol, options, sample_uuid_list):
+        """Test that variants pickle as themselves."""
+        model = Resources.variant(**options)
+        resources = model(ids=sample_uuid_list * 2, kind="resource[]")
+        restored = pickle.loads(pickle.dumps(resources, protocol))
+        assert type(restored) is model
+        assert restored == resources
+        assert restored.duplicates_dropped == resources.duplicates_dropped
+
+    def test_timezone_variant(self, sample_datetime):
+        """Test that timezone variants pickle as themselves."""
+        model = DateTimes.variant(tz="utc")
+        values = model(values=[sample_datetime], kind="datetime[]")
+        assert type(pickle.loads(pickle.dumps(values))) is model
+
+    def test_list_storage_packed(self, resources):
+        """Test that list storage pickles one buffer and restores UUID objects."""
+        data = pickle.dumps(resources, 5)
+        assert b"".join(value.bytes for value in resources.ids) in data
+        restored = pickle.loads(data)
+        assert type(restored.ids) is list
+        assert all(type(value) is uuid.UUID for value in restored.ids)
+        assert restored.ids == resources.ids
+
+    def test_out_of_band(self, sample_uuid_list):
+        """Test that protocol 5 sends compact ids out-of-band and wraps them without a copy."""
+        resources = Resources.variant(storage="compact")(ids=sample_uuid_list, kind="resource[]")
+        buffers = []
+        data = pickle.dumps(resources, 5, buffer_callback=buffers.append)
+        assert len(buffers) == 1
+        received = bytearray(buffers[0].raw())
+        restored = pickle.loads(data, buffers=[received])
+        assert restored.ids.buffer.obj is received
+        assert restored == resources
+
+    def test_array_out_of_band(self, sample_uuid_list):
+        """Test out-of-band pickling of a bare UUIDArray."""
+        array = UUIDArray.from_uuids(sample_uuid_list)
+        buffers = []
+        data = pickle.dumps(array, 5, buffer_callback=buffers.append)
+        assert pickle.loads(data, buffers=buffers) == array
@@ -0,0 +1,154 @@
+"""Test suite for the step decorator."""
+import asyncio
+import inspect
+import json
+import uuid
+import pytest
+from pydantic import ValidationError
+from tektome import Context, Resource, StepTimings, instrumentation, step, step_inputs
+
+
+def main_step(ctx: Context, r: Resource, limit: int = 10):
+    return ctx, r, limit
+
+
+@pytest.fixture
+def raw_inputs(sample_uuid, sample_uuid_str):
+    """Return raw JSON arguments for `main_step`."""
+    return json.dumps(
+        {
+            "ctx": {
+                "user_api_key": "key",
+                "base_url": "https://example.tektome.com",
+                "execution_id": sample_uuid_str,
+            },
+            "r": {"id": str(sample_uuid), "kind": "resource"},
+        }
+    ).encode()
+
+
+@pytest.fixture
+def ctx(sample_uuid):
+    """Return a validated context."""
+    return Context(user_api_key="key", base_url="https://example.tektome.com", execution_id=sample_uuid)
+
+
+class TestStep:
+    """Test the step decorator."""
+
+    def test_instances_pass_through(self, ctx, sample_uuid, monkeypatch):
+        """Test that model instances are not validated again."""
+        decorated = step(main_step)
+        r = Resource(id=sample_uuid, kind="resource")
+        monkeypatch.setattr(decorated.inputs, "validate_python", None)
+        assert decorated(ctx, r) == (ctx, r, 10)
+
+    def test_validates_other_arguments(self, ctx, sample_uuid):
+        """Test that dicts, strings and keyword arguments are validated."""
+        decorated = step(main_step)
+        got_ctx, r, limit = decorated(ctx.model_dump(), r={"id": str(sample_uuid), "kind": "resource"}, limit="5")
+        assert got_ctx == ctx
+        assert r == Resource(id=sample_uuid, kind="resource")
+        assert limit == 5
+        assert decorated(ctx, Resource(id=sample_uuid, kind="resource"))[2] == 10
+
+    def test_invalid_arguments(self, ctx):
+        """Test that invalid or unexpected arguments are rejected."""
+        decorated = step(main_step)
+        with pytest.raises(ValidationError):
+            decorated(ctx, {"id": "x", "kind": "resource"})
+        with pytest.raises(ValidationError):
+            decorated(ctx=ctx)
+        with pytest.raises(TypeError):
+            decorated(ctx, ctx, 1, 2)
+        with pytest.raises(TypeError):
+            decorated(ctx, ctx=ctx)
+
+    def test_raw_inputs(self, raw_inputs, sample_uuid):
+        """Test calling with raw JSON or a decoded mapping."""
+        decorated = step(main_step)
+        assert decorated.call_json(raw_inputs)[1].id == sample_uuid
+        assert decorated.call_python(json.loads(raw_inputs))[1].id == sample_uuid
+        assert decorated.inputs is step_inputs(main_step)
+
+    def test_strict(self, ctx, sample_uuid):
+        """Test that strict mode rejects coercion."""
+        decorated = step(strict=True)(main_step)
+        r = Resource(id=sample_uuid, kind="resource")
+        assert decorated(ctx, r, 3)[2] == 3
+        with pytest.raises(ValidationError):
+            decorated(ctx, r, "3")
+
+    def test_json_output(self, ctx, sample_uuid):
+        """Test that the result is dumped with the return annotation."""
+
+        @step(output="json")
+        def first(ctx: Context, r: Resource) -> Resource:
+            return r
+
+        r = Resource(id=sample_uuid, kind="resource")
+        assert first(ctx, r) == r.model_dump_json().encode()
+
+    def test_timings(self, raw_inputs, ctx, sample_uuid):
+        """Test that the timings of each phase are reported."""
+        timings = []
+        decorated = step(timings=timings.append)(main_step)
+        decorated.call_json(raw_inputs)
+        decorated(ctx, Resource(id=sample_uuid, kind="resource"))
+        assert len(timings) == 2
+        assert all(isinstance(t, StepTimings) for t in timings)
+        assert timings[0].function == "main_step"
+        assert timings[0].execution_id == uuid.UUID(json.loads(raw_inputs)["ctx"]["execution_id"])
+        assert min(t.validate for t in timings) >= 0 and timings[0].serialize >= 0
+
+    def test_execution_scope(self, ctx, sample_uuid):
+        """Test that validations inside the step carry the context's execution id."""
+        events = []
+
+        @step
+        def build(ctx: Context):
+            return Resource(id=sample_uuid, kind="resource")
+
+        unregister = instrumentation.register_hook(events.append)
+        try:
+            build(ctx)
+        finally:
+            unregister()
+        assert [(e.model, e.execution_id) for e in events] == [("Resource", ctx.execution_id)]
+
+    def test_async(self, raw_inputs, ctx, sample_uuid):
+        """Test that coroutine functions are supported."""
+        timings = []
+
+        @step(timings=timings.append)
+        async def fetch(ctx: Context, r: Resource, limit: int = 10):
+            await asyncio.sleep(0)
+            return r.id, limit
+
+        r = Resource(id=sample_uuid, kind="resource")
+        assert inspect.iscoroutinefunction(fetch)
+        assert asyncio.run(fetch(ctx, r)) == (sample_uuid, 10)
+        assert asyncio.run(fetch.call_json(raw_inputs)) == (sample_uuid, 10)
+        assert len(timings) == 2
+
+    def test_unsupported_signatures(self):
+        """Test that positional-only and variadic parameters are rejected."""
+
+        def positional(a, /):
+            pass
+
+        def variadic(*args):
+            pass
+
+        with pytest.raises(TypeError):
+            step(positional)
+        with pytest.raises(TypeError):
+            step(variadic)
+        with pytest.raises(ValueError):
+            step(output="xml")(main_step)
+
+    def test_wraps(self):
+        """Test that the wrapper keeps the function's metadata."""
+        decorated = step(main_step)
+        assert decorated.__name__ == "main_step"
+        assert decorated.__wrapped__ is main_step
@@ -0,0 +1,241 @@
+"""Test suite for streaming id collections."""
+import io
+import json
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from pydantic import ValidationError
+from tektome import AttributeDefinitions, Dates, DateTimes, Projects, Resources
+
+
+class _GeneratedPayload(io.RawIOBase):
+    """Binary stream producing a large `resource[]` payload without holding it."""
+
+    def __init__(self, count):
+        self._parts = self._generate(count)
+        self._pending = b""
+
+    @staticmethod
+    def _generate(count):
+        yield b'{"kind": "resource[]", "ids": ['
+        for i in range(count):
+            yield (b", " if i else b"") + f'"{uuid.UUID(int=i)}"'.encode()
+        yield b"]}"
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while len(self._pending) < len(buffer):
+            part = next(self._parts, None)
+            if part is None:
+                break
+            self._pending += part
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def _stream(payload, binary=True):
+    raw = json.dumps(payload) if not isinstance(payload, str) else payload
+    return io.BytesIO(raw.encode()) if binary else io.StringIO(raw)
+
+
+class TestIterFromStream:
+    """Test IdCollection.iter_from_stream."""
+
+    def test_yields_chunks_in_order(self):
+        """Test that ids are yielded in payload order and chunk sizes."""
+        ids = [uuid.uuid4() for _ in range(25)]
+        raw = Resources(ids=ids, kind="resource[]").model_dump_json()
+        chunks = list(Resources.iter_from_stream(_stream(raw), chunk_size=10))
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        assert [uid for chunk in chunks for uid in chunk] == ids
+        assert all(isinstance(uid, uuid.UUID) for uid in chunks[0])
+
+    @pytest.mark.parametrize("read_size", [1, 3, 7, 64, 1 << 16])
+    @pytest.mark.parametrize("binary", [True, False])
+    def test_read_sizes(self, read_size, binary, sample_uuid_list):
+        """Test that results do not depend on how the input is split."""
+        payload = {"kind": "project[]", "ids": [str(uid) for uid in sample_uuid_list]}
+        chunks = list(Projects.iter_from_stream(_stream(payload, binary), chunk_size=2, read_size=read_size))
+        assert [uid for chunk in chunks for uid in chunk] == sample_uuid_list
+
+    def test_whitespace_and_non_canonical_ids(self):
+        """Test pretty-printed payloads and other UUID forms."""
+        uid = uuid.uuid4()
+        raw = '{\n  "ids" : [\n    "%s" ,\n    "%s"\n  ] ,\n  "kind" : "attribute_definition[]"\n}\n' % (uid.hex, str(uid).upper())
+        chunks = list(AttributeDefinitions.iter_from_stream(_stream(raw), read_size=5))
+        assert chunks == [[uid, uid]]
+
+    def test_escaped_strings(self):
+        """Test that escaped characters are decoded."""
+        uid = uuid.uuid4()
+        raw = '{"ids": ["%s"], "kind": "resource\\u005b]"}' % str(uid).replace("-", "\\u002d")
+        assert list(Resources.iter_from_stream(_stream(raw))) == [[uid]]
+
+    def test_unicode_split_across_reads(self):
+        """Test multi-byte characters split between reads."""
+        raw = '{"ids": [], "kind": "résource[]"}'
+        with pytest.raises(ValidationError) as exc_info:
+            list(Resources.iter_from_stream(_stream(raw), read_size=1))
+        assert exc_info.value.errors()[0]["input"] == "résource[]"
+
+    def test_empty_ids(self):
+        """Test an empty id list."""
+        assert list(Resources.iter_from_stream(_stream({"ids": [], "kind": "resource[]"}))) == []
+
+    def test_wrong_kind_reported_first(self):
+        """Test that a leading wrong kind fails before any ids are read."""
+        stream = _stream({"kind": "project[]", "ids": [str(uuid.uuid4())]})
+        chunks = Resources.iter_from_stream(stream)
+        with pytest.raises(ValidationError) as exc_info:
+            next(chunks)
+        assert "kind must be 'resource[]'" in str(exc_info.value)
+
+    def test_wrong_kind_after_ids(self, sample_uuid_list):
+        """Test that a trailing wrong kind fails once it is read."""
+        stream = _stream({"ids": [str(uid) for uid in sample_uuid_list], "kind": "resource"})
+        chunks = Resources.iter_from_stream(stream)
+        assert next(chunks) == sample_uuid_list
+        with pytest.raises(ValidationError) as exc_info:
+            next(chunks)
+        assert exc_info.value.errors()[0]["loc"] == ("kind",)
+
+    def test_invalid_id_has_global_index(self):
+        """Test that id errors carry their index in the whole payload."""
+        ids = [str(uuid.uuid4()) for _ in range(7)]
+        ids[5] = "bad"
+        chunks = Resources.iter_from_stream(_stream({"kind": "resource[]", "ids": ids}), chunk_size=2)
+        with pytest.raises(ValidationError) as exc_info:
+            list(chunks)
+        assert exc_info.value.errors()[0]["loc"] == ("ids", 5)
+        assert exc_info.value.errors()[0]["type"] == "uuid_parsing"
+
+    def test_non_string_id(self):
+        """Test that non-string elements are rejected."""
+        with pytest.raises(ValidationError) as exc_info:
+            list(Resources.iter_from_stream(_stream('{"kind": "resource[]", "ids": [12345]}'), read_size=2))
+        assert exc_info.value.errors()[0]["loc"] == ("ids", 0)
+
+    @pytest.mark.parametrize(
+        "payload, error_type, loc",
+        [
+            ('{"ids": []}', "missing", ("kind",)),
+            ('{"kind": "resource[]"}', "missing", ("ids",)),
+            ('{"ids": [], "kind": "resource[]", "extra": 1}', "extra_forbidden", ("extra",)),
+            ('{"ids": "abc", "kind": "resource[]"}', "list_type", ("ids",)),
+            ('{"ids": [], "ids": [], "kind": "resource[]"}', "json_invalid", ()),
+            ('{"ids": ["a" "b"], "kind": "resource[]"}', "json_invalid", ()),
+            ('{"ids": [], "kind": "resource[]"', "json_invalid", ()),
+            ('{"ids": [], "kind": "resource[]"} []', "json_invalid", ()),
+            ("[]", "json_invalid", ()),
+            ("", "json_invalid", ()),
+        ],
+    )
+    def test_invalid_payloads(self, payload, error_type, loc):
+        """Test errors matching model_validate_json."""
+        with pytest.raises(ValidationError) as exc_info:
+            list(Resources.iter_from_stream(_stream(payload), read_size=4))
+        error = exc_info.value.errors()[0]
+        assert error["type"] == error_type
+        assert error["loc"] == loc
+
+    def test_invalid_chunk_size(self):
+        """Test that chunk_size must be positive."""
+        with pytest.raises(ValueError):
+            list(Resources.iter_from_stream(_stream({"ids": [], "kind": "resource[]"}), chunk_size=0))
+
+    def test_memory_is_bounded(self):
+        """Test that memory does not grow with the number of ids."""
+        tracemalloc.start()
+        count = 0
+        for chunk in Resources.iter_from_stream(io.BufferedReader(_GeneratedPayload(50_000)), chunk_size=1000):
+            count += len(chunk)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert count == 50_000
+        assert peak < 2**20
+
+
+class _CountingSink(io.RawIOBase):
+    """Binary stream discarding what is written, keeping its length."""
+
+    def __init__(self):
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.size += len(data)
+        return len(data)
+
+
+class TestDumpJsonTo:
+    """Test writing collections to a stream."""
+
+    @pytest.mark.parametrize("storage", ["list", "compact", "lazy"])
+    @pytest.mark.parametrize("chunk_size", [1, 3, 10, 10_000])
+    def test_identical_to_model_dump_json(self, sample_uuid_list, storage, chunk_size):
+        """Test that the output matches model_dump_json byte for byte."""
+        model = Resources.variant(storage=storage)(ids=sample_uuid_list, kind="resource[]")
+        fp = io.BytesIO()
+        written = model.dump_json_to(fp, chunk_size=chunk_size)
+        assert fp.getvalue() == model.model_dump_json().encode()
+        assert written == len(fp.getvalue())
+
+    def test_text_stream(self, sample_uuid_list):
+        """Test writing to a text stream."""
+        model = Projects(ids=sample_uuid_list, kind="project[]")
+        fp = io.StringIO()
+        model.dump_json_to(fp, chunk_size=2)
+        assert fp.getvalue() == model.model_dump_json()
+
+    def test_empty(self):
+        """Test an empty collection."""
+        fp = io.BytesIO()
+        AttributeDefinitions(ids=[], kind="attribute_definition[]").dump_json_to(fp)
+        assert fp.getvalue() == b'{"ids":[],"kind":"attribute_definition[]"}'
+
+    def test_temporal_collections(self):
+        """Test that dates and datetimes are written in chunks too."""
+        tz = timezone(timedelta(hours=9))
+        models = [
+            Dates(values=[date(2025, 1, 1) + timedelta(days=i) for i in range(7)], kind="date[]"),
+            DateTimes(
+                values=[datetime(2025, 1, 1, tzinfo=tz) + timedelta(seconds=i * 1.5) for i in range(7)],
+                kind="datetime[]",
+            ),
+        ]
+        for model in models:
+            fp = io.BytesIO()
+            model.dump_json_to(fp, chunk_size=2)
+            assert fp.getvalue() == model.model_dump_json().encode()
+
+    def test_round_trip(self, sample_uuid_list):
+        """Test that the output streams back to the same ids."""
+        fp = io.BytesIO()
+        Resources(ids=sample_uuid_list, kind="resource[]").dump_json_to(fp, chunk_size=2)
+        fp.seek(0)
+        assert [uid for chunk in Resources.iter_from_stream(fp) for uid in chunk] == sample_uuid_list
+
+    def test_invalid_chunk_size(self, sample_uuid_list):
+        """Test that chunk_size must be positive."""
+        with pytest.raises(ValueError):
+            Resources(ids=sample_uuid_list, kind="resource[]").dump_json_to(io.BytesIO(), chunk_size=0)
+
+    def test_memory_is_bounded(self):
+        """Test that memory does not grow with the number of ids."""
+        model = Resources.variant(storage="compact")(
+            ids=[uuid.UUID(int=i) for i in range(50_000)], kind="resource[]"
+        )
+        sink = _CountingSink()
+        tracemalloc.start()
+        model.dump_json_to(sink, chunk_size=1000)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert sink.size == len(model.model_dump_json())
+        assert peak < 2**20
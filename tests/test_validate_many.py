@@ -0,0 +1,116 @@
+"""Test suite for BaseSchema.validate_many."""
+import uuid
+import pytest
+from pydantic import ValidationError
+from tektome import BatchResult, Date, DateTime, Project, Resource
+
+
+class TestValidateManyRaise:
+    """Test validate_many in raise mode."""
+
+    def test_validates_list_of_dicts(self, sample_uuid_list):
+        """Test validating a list of dictionaries."""
+        payloads = [{"id": str(uid), "kind": "resource"} for uid in sample_uuid_list]
+        resources = Resource.validate_many(payloads)
+        assert [r.id for r in resources] == sample_uuid_list
+        assert all(isinstance(r, Resource) for r in resources)
+
+    def test_accepts_generator(self, sample_uuid_list):
+        """Test that any iterable is accepted."""
+        projects = Project.validate_many(
+            {"id": uid, "kind": "project"} for uid in sample_uuid_list
+        )
+        assert [p.id for p in projects] == sample_uuid_list
+
+    def test_accepts_instances(self, sample_uuid):
+        """Test that existing instances pass through."""
+        resource = Resource(id=sample_uuid, kind="resource")
+        assert Resource.validate_many([resource]) == [resource]
+
+    def test_empty_batch(self):
+        """Test validating an empty batch."""
+        assert Date.validate_many([]) == []
+
+    def test_date_and_datetime(self, sample_date, sample_datetime):
+        """Test validate_many on Date and DateTime."""
+        dates = Date.validate_many([{"value": "2025-11-17", "kind": "date"}])
+        assert dates[0].value == sample_date
+        datetimes = DateTime.validate_many(
+            [{"value": sample_datetime.isoformat(), "kind": "datetime"}]
+        )
+        assert datetimes[0].value == sample_datetime
+
+    def test_raises_on_first_error(self, sample_uuid):
+        """Test that only the first invalid item is reported."""
+        payloads = [
+            {"id": str(sample_uuid), "kind": "resource"},
+            {"id": "not-a-uuid", "kind": "resource"},
+            {"id": str(sample_uuid), "kind": "project"},
+        ]
+        with pytest.raises(ValidationError) as exc_info:
+            Resource.validate_many(payloads)
+        errors = exc_info.value.errors()
+        assert len(errors) == 1
+        assert errors[0]["loc"] == (1, "id")
+
+    def test_wrong_kind_rejected(self, sample_uuid):
+        """Test that kind is validated for every item."""
+        with pytest.raises(ValidationError) as exc_info:
+            Resource.validate_many([{"id": str(sample_uuid), "kind": "project"}])
+        assert "kind must be 'resource'" in str(exc_info.value)
+
+    def test_invalid_errors_mode(self):
+        """Test that an unknown errors mode is rejected."""
+        with pytest.raises(ValueError):
+            Resource.validate_many([], errors="ignore")
+
+
+class TestValidateManyCollect:
+    """Test validate_many in collect mode."""
+
+    def test_all_valid(self, sample_uuid_list):
+        """Test collect mode when every item is valid."""
+        result = Resource.validate_many(
+            [{"id": uid, "kind": "resource"} for uid in sample_uuid_list],
+            errors="collect",
+        )
+        assert isinstance(result, BatchResult)
+        assert result.ok
+        assert result.errors == {}
+        assert [r.id for r in result.values] == sample_uuid_list
+
+    def test_errors_keyed_by_index(self, sample_uuid):
+        """Test that errors are reported per input index."""
+        payloads = [
+            {"id": str(sample_uuid), "kind": "project"},
+            {"id": "bad", "kind": "project"},
+            {"id": str(sample_uuid), "kind": "project"},
+            {"id": str(sample_uuid), "kind": "resource"},
+            "not-a-dict",
+        ]
+        result = Project.validate_many(payloads, errors="collect")
+        assert not result.ok
+        assert set(result.errors) == {1, 3, 4}
+        assert result.errors[1][0]["loc"] == ("id",)
+        assert result.errors[3][0]["loc"] == ("kind",)
+        assert result.errors[4][0]["loc"] == ()
+        assert result.values[0] == Project(id=sample_uuid, kind="project")
+        assert result.values[1] is None
+        assert result.values[2] == Project(id=sample_uuid, kind="project")
+        assert result.values[3] is None
+        assert result.values[4] is None
+
+    def test_multiple_errors_for_one_item(self):
+        """Test that every error of an item is kept."""
+        result = DateTime.validate_many(
+            [{"value": "not-a-datetime", "kind": "date"}], errors="collect"
+        )
+        assert {e["loc"] for e in result.errors[0]} == {("value",), ("kind",)}
+
+    def test_large_batch(self):
+        """Test collect mode on a larger batch."""
+        payloads = [{"id": str(uuid.uuid4()), "kind": "resource"} for _ in range(1000)]
+        payloads[500]["id"] = "bad"
+        result = Resource.validate_many(payloads, errors="collect")
+        assert list(result.errors) == [500]
+        assert sum(v is not None for v in result.values) == 999